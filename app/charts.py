@@ -0,0 +1,220 @@
+from __future__ import annotations
+import base64
+import heapq
+import io
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import DEFAULT_GRADE_SCALE
+from .grading import compute_grade
+from .metrics import CACHE_REQUESTS
+from .models import Student
+
+FIGURE_SIZE = (10, 9)
+FIGURE_DPI = 100
+MIN_PIXELS = (400, 300)
+MAX_CACHED_SIZES = 4
+
+Size = Tuple[int, int]
+GRADE_COLORS = ['#27ae60', '#3498db', '#f39c12', '#e67e22', '#e74c3c']
+
+
+def roster_statistics(students: Sequence[Student], n: int = 3) -> Dict[str, Any]:
+    """Same shape as ``StudentManager.statistics()``, computed in one pass over a roster snapshot."""
+    grade_counts: Dict[str, int] = {}
+    subject_totals: Dict[str, float] = {}
+    subject_counts: Dict[str, int] = {}
+    averages: List[Tuple[float, str, str]] = []
+    passed = 0
+    for s in students:
+        avg = s.average()
+        averages.append((avg, s.student_id, s.name))
+        grade = compute_grade(avg, DEFAULT_GRADE_SCALE)
+        grade_counts[grade] = grade_counts.get(grade, 0) + 1
+        if grade != 'F':
+            passed += 1
+        for subject, mark in s.marks_by_subject.items():
+            subject_totals[subject] = subject_totals.get(subject, 0.0) + mark
+            subject_counts[subject] = subject_counts.get(subject, 0) + 1
+    total = len(students)
+    top = heapq.nlargest(n, averages, key=lambda item: (item[0], item[1]))
+    bottom = heapq.nsmallest(n, averages, key=lambda item: (item[0], item[1]))
+    return {
+        "total_students": total,
+        "class_average": sum(avg for avg, _, _ in averages) / total if total else 0.0,
+        "pass_rate": passed / total * 100 if total else 0.0,
+        "students_by_grade": grade_counts,
+        "subject_averages": {subject: subject_totals[subject] / subject_counts[subject] for subject in subject_totals},
+        "top_performers": [(name, avg) for avg, _, name in top],
+        "bottom_performers": [(name, avg) for avg, _, name in bottom],
+    }
+
+
+class StatisticsChart:
+    """The statistics figure, rasterized with Agg and updated in place when the data changes.
+
+    Panels whose data is unchanged are left alone. A subject or performer panel
+    whose layout is unchanged keeps its artists and only gets new bar widths and
+    labels. Images are cached per pixel size for the current version, so resizing
+    back and forth does not redraw. ``render`` may run on any thread; calls for
+    one chart are serialized.
+    """
+
+    def __init__(self) -> None:
+        self.figure = None
+        self.version: Optional[int] = None
+        self.stats: Optional[Dict[str, Any]] = None
+        self._images: Dict[Size, str] = {}
+        self._pixels: Optional[Size] = None
+        self._subject_artists: Optional[Tuple[List[str], Any, List[Any]]] = None
+        self._performer_artists: Optional[Tuple[Tuple[int, int], Any, List[Any]]] = None
+        self._lock = threading.Lock()
+
+    def cached(self, version: int, size: Optional[Size] = None) -> Optional[Tuple[Dict[str, Any], str]]:
+        """The ``render`` result for ``version`` at ``size`` if it is already cached."""
+        size = _clamp(size)
+        with self._lock:
+            image = self._images.get(size) if self.version == version else None
+            return None if image is None else (self.stats, image)
+
+    def render(self, students: Sequence[Student], version: int,
+               size: Optional[Size] = None) -> Tuple[Dict[str, Any], str]:
+        """Return ``(stats, base64 PNG)`` for a roster snapshot, ``size`` pixels wide and high.
+
+        The figure is only redrawn when ``version`` changes and only re-laid out when ``size`` does.
+        """
+        size = _clamp(size)
+        with self._lock:
+            if self.version == version and size in self._images:
+                CACHE_REQUESTS.inc(cache="statistics_chart", result="hit")
+                return self.stats, self._images[size]
+            CACHE_REQUESTS.inc(cache="statistics_chart", result="miss")
+            if self.figure is None:
+                self._create_figure()
+            relayout = self.stats is None
+            if self.version != version:
+                stats = roster_statistics(students)
+                previous = self.stats or {}
+                if stats["students_by_grade"] != previous.get("students_by_grade"):
+                    self._draw_grades(stats["students_by_grade"])
+                if stats["subject_averages"] != previous.get("subject_averages"):
+                    self._draw_subjects(stats["subject_averages"])
+                performers = (stats["top_performers"], stats["bottom_performers"])
+                if performers != (previous.get("top_performers"), previous.get("bottom_performers")):
+                    self._draw_performers(*performers)
+                self.stats = stats
+                self.version = version
+                self._images.clear()
+            if size != self._pixels:
+                self.figure.set_size_inches(size[0] / FIGURE_DPI, size[1] / FIGURE_DPI)
+                self._pixels = size
+                relayout = True
+            if relayout:
+                self.figure.tight_layout(pad=2.5)
+            buffer = io.BytesIO()
+            self.figure.savefig(buffer, format="png", dpi=FIGURE_DPI, facecolor=self.figure.get_facecolor())
+            image = base64.b64encode(buffer.getvalue()).decode("ascii")
+            while len(self._images) >= MAX_CACHED_SIZES:
+                self._images.pop(next(iter(self._images)))
+            self._images[size] = image
+            return self.stats, image
+
+    def _create_figure(self) -> None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        self.figure = Figure(figsize=FIGURE_SIZE, dpi=FIGURE_DPI, facecolor='#f0f0f0')
+        FigureCanvasAgg(self.figure)
+        self.ax_grades = self.figure.add_subplot(2, 2, (1, 2))
+        self.ax_subjects = self.figure.add_subplot(2, 2, 3)
+        self.ax_performers = self.figure.add_subplot(2, 2, 4)
+
+    def _draw_grades(self, grade_counts: Dict[str, int]) -> None:
+        ax = self.ax_grades
+        ax.clear()
+        if not grade_counts:
+            return
+        _, texts, autotexts = ax.pie(list(grade_counts.values()), labels=list(grade_counts.keys()),
+                                     autopct='%1.1f%%', startangle=90, colors=GRADE_COLORS,
+                                     textprops={'fontsize': 13})
+        for autotext in autotexts:
+            autotext.set_color('white')
+            autotext.set_fontsize(12)
+            autotext.set_fontweight('bold')
+        for text in texts:
+            text.set_fontsize(14)
+            text.set_fontweight('bold')
+        ax.set_title('Grade Distribution', fontsize=14, fontweight='bold', pad=15)
+
+    def _draw_subjects(self, subject_avgs: Dict[str, float]) -> None:
+        ax = self.ax_subjects
+        subjects = list(subject_avgs.keys())
+        averages = list(subject_avgs.values())
+        if self._subject_artists is not None and self._subject_artists[0] == subjects:
+            _, bars, labels = self._subject_artists
+            for bar, label, avg in zip(bars, labels, averages):
+                bar.set_width(avg)
+                label.set_x(avg + 1)
+                label.set_text(f'{avg:.1f}%')
+            return
+        ax.clear()
+        self._subject_artists = None
+        if not subjects:
+            return
+        bars = ax.barh(subjects, averages, color='#3498db')
+        ax.set_xlabel('Average (%)', fontsize=11)
+        ax.set_title('Subject Averages', fontsize=13, fontweight='bold', pad=10)
+        ax.set_xlim(0, 100)
+        ax.tick_params(axis='both', labelsize=10)
+        labels = [ax.text(avg + 1, bar.get_y() + bar.get_height() / 2, f'{avg:.1f}%',
+                          va='center', fontsize=10, fontweight='bold')
+                  for bar, avg in zip(bars, averages)]
+        self._subject_artists = (subjects, bars, labels)
+
+    def _draw_performers(self, top: List[Tuple[str, float]], bottom: List[Tuple[str, float]]) -> None:
+        ax = self.ax_performers
+        performers = [f"{name} (Top)" for name, _ in top[:5]] + [f"{name} (Low)" for name, _ in bottom[:5]]
+        scores = [avg for _, avg in top[:5]] + [avg for _, avg in bottom[:5]]
+        shape = (len(top[:5]), len(bottom[:5]))
+        if self._performer_artists is not None and self._performer_artists[0] == shape:
+            _, bars, labels = self._performer_artists
+            for bar, label, score in zip(bars, labels, scores):
+                bar.set_width(score)
+                label.set_x(score + 1)
+                label.set_text(f'{score:.1f}%')
+            ax.set_yticklabels(performers, fontsize=9)
+            return
+        ax.clear()
+        self._performer_artists = None
+        if not performers:
+            return
+        colors = ['#27ae60'] * len(top[:5]) + ['#e74c3c'] * len(bottom[:5])
+        y_pos = range(len(performers))
+        bars = ax.barh(y_pos, scores, color=colors)
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels(performers, fontsize=9)
+        ax.set_xlabel('Average (%)', fontsize=11)
+        ax.set_title('Top & Bottom Performers', fontsize=13, fontweight='bold', pad=10)
+        ax.set_xlim(0, 100)
+        ax.tick_params(axis='y', labelsize=9)
+        labels = [ax.text(score + 1, bar.get_y() + bar.get_height() / 2, f'{score:.1f}%',
+                          va='center', fontsize=9, fontweight='bold')
+                  for bar, score in zip(bars, scores)]
+        self._performer_artists = (shape, bars, labels)
+
+
+def _clamp(size: Optional[Size]) -> Size:
+    if size is None:
+        return (FIGURE_SIZE[0] * FIGURE_DPI, FIGURE_SIZE[1] * FIGURE_DPI)
+    return (max(MIN_PIXELS[0], int(size[0])), max(MIN_PIXELS[1], int(size[1])))
+
+
+_charts: "weakref.WeakKeyDictionary[Any, StatisticsChart]" = weakref.WeakKeyDictionary()
+
+
+def chart_for(manager) -> StatisticsChart:
+    """The cached chart for a ``StudentManager``, created on first use."""
+    chart = _charts.get(manager)
+    if chart is None:
+        chart = _charts[manager] = StatisticsChart()
+    return chart
@@ -0,0 +1,202 @@
+from __future__ import annotations
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from . import DEFAULT_GRADE_SCALE, DEFAULT_SUBJECTS
+from .grading import compute_grade
+from .models import Student
+
+BATCH_SIZE = 65536
+DEFAULT_COMPRESSION = "zstd"
+PROFILE_FIELDS = [
+    "student_id", "photo_path", "date_of_birth", "gender", "blood_group", "religion", "nationality", "address",
+    "phone", "email", "session", "department", "semester", "previous_cgpa", "father_name", "father_occupation",
+    "father_phone", "mother_name", "mother_occupation", "mother_phone", "emergency_contact",
+]
+
+StudentRow = Union[Student, Dict[str, Any]]
+Filters = Sequence[Tuple[str, str, Any]]
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Arrow/Parquet support requires pyarrow: pip install pyarrow") from e
+    return pa, pq, ds
+
+
+def _as_student(row: StudentRow) -> Student:
+    return row if isinstance(row, Student) else Student.from_dict(row)
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def roster_schema(subjects: Sequence[str] = DEFAULT_SUBJECTS):
+    pa, _, _ = _pyarrow()
+    return pa.schema(
+        [("student_id", pa.string()), ("name", pa.string()), ("total", pa.float64()),
+         ("average", pa.float64()), ("grade", pa.string())]
+        + [(subject, pa.float64()) for subject in subjects]
+    )
+
+
+def long_marks_schema():
+    pa, _, _ = _pyarrow()
+    return pa.schema([("student_id", pa.string()), ("subject", pa.string()), ("marks", pa.float64())])
+
+
+def profiles_schema():
+    pa, _, _ = _pyarrow()
+    return pa.schema([(f, pa.float64() if f == "previous_cgpa" else pa.string()) for f in PROFILE_FIELDS])
+
+
+def iter_roster_batches(students: Iterable[StudentRow], subjects: Sequence[str] = DEFAULT_SUBJECTS,
+                        batch_size: int = BATCH_SIZE) -> Iterator[Any]:
+    """Yield wide ``RecordBatch``es from ``Student`` objects or ``db`` row dicts."""
+    pa, _, _ = _pyarrow()
+    schema = roster_schema(subjects)
+    for chunk in _chunks(students, batch_size):
+        chunk = [_as_student(s) for s in chunk]
+        averages = [s.average() for s in chunk]
+        columns = [
+            [s.student_id for s in chunk],
+            [s.name for s in chunk],
+            [s.total() for s in chunk],
+            averages,
+            [compute_grade(avg, DEFAULT_GRADE_SCALE) for avg in averages],
+        ]
+        columns.extend([s.marks_by_subject.get(subject) for s in chunk] for subject in subjects)
+        yield pa.RecordBatch.from_arrays([pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                                         schema=schema)
+
+
+def iter_long_batches(students: Iterable[StudentRow], batch_size: int = BATCH_SIZE) -> Iterator[Any]:
+    pa, _, _ = _pyarrow()
+    schema = long_marks_schema()
+    rows = ((s.student_id, subject, float(mark))
+            for s in map(_as_student, students) for subject, mark in s.marks_by_subject.items())
+    for chunk in _chunks(rows, batch_size):
+        ids, subjects, marks = zip(*chunk)
+        yield pa.RecordBatch.from_arrays([pa.array(ids, pa.string()), pa.array(subjects, pa.string()),
+                                          pa.array(marks, pa.float64())], schema=schema)
+
+
+def iter_profile_batches(profiles: Iterable[Dict[str, Any]], batch_size: int = BATCH_SIZE) -> Iterator[Any]:
+    pa, _, _ = _pyarrow()
+    schema = profiles_schema()
+    for chunk in _chunks(profiles, batch_size):
+        arrays = []
+        for field in schema:
+            values = [p.get(field.name) for p in chunk]
+            if field.name == "previous_cgpa":
+                values = [None if v is None else float(v) for v in values]
+            else:
+                values = [None if v is None else str(v) for v in values]
+            arrays.append(pa.array(values, type=field.type))
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _BatchWriter:
+    def __init__(self, path: str, schema, fmt: str, compression: Optional[str]) -> None:
+        pa, pq, _ = _pyarrow()
+        self.rows = 0
+        self._sink = None
+        if fmt == "parquet":
+            self._writer = pq.ParquetWriter(path, schema, compression=compression or "none")
+        elif fmt == "arrow":
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema,
+                                           options=pa.ipc.IpcWriteOptions(compression=compression))
+        else:
+            raise ValueError(f"Unsupported columnar format: {fmt}")
+
+    def write(self, batch) -> None:
+        self._writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def close(self) -> None:
+        self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+
+
+def export_roster(students: Iterable[StudentRow], path: str, subjects: Sequence[str] = DEFAULT_SUBJECTS,
+                  fmt: str = "parquet", compression: Optional[str] = DEFAULT_COMPRESSION,
+                  batch_size: int = BATCH_SIZE, long_path: Optional[str] = None,
+                  profiles: Optional[Iterable[Dict[str, Any]]] = None,
+                  profiles_path: Optional[str] = None) -> Dict[str, int]:
+    """Write the wide roster and, optionally, long-format marks and profiles as Parquet or Arrow IPC files.
+
+    ``students`` may be a manager iterator or a ``db`` generator; it is consumed in a single pass.
+    """
+    writer = _BatchWriter(path, roster_schema(subjects), fmt, compression)
+    long_writer = _BatchWriter(long_path, long_marks_schema(), fmt, compression) if long_path else None
+    try:
+        for chunk in _chunks(map(_as_student, students), batch_size):
+            for batch in iter_roster_batches(chunk, subjects, batch_size):
+                writer.write(batch)
+            if long_writer is not None:
+                for batch in iter_long_batches(chunk, batch_size):
+                    long_writer.write(batch)
+    finally:
+        writer.close()
+        if long_writer is not None:
+            long_writer.close()
+    counts = {"students": writer.rows, "marks": long_writer.rows if long_writer else 0, "profiles": 0}
+    if profiles is not None and profiles_path is not None:
+        profile_writer = _BatchWriter(profiles_path, profiles_schema(), fmt, compression)
+        try:
+            for batch in iter_profile_batches(profiles, batch_size):
+                profile_writer.write(batch)
+        finally:
+            profile_writer.close()
+        counts["profiles"] = profile_writer.rows
+    return counts
+
+
+def _dataset(path: str, fmt: str):
+    _, _, ds = _pyarrow()
+    return ds.dataset(path, format="ipc" if fmt == "arrow" else fmt)
+
+
+def scan(path: str, columns: Optional[Sequence[str]] = None, filters: Optional[Filters] = None,
+         fmt: str = "parquet", batch_size: int = BATCH_SIZE) -> Iterator[Any]:
+    """Stream record batches with column pruning and predicate pushdown, e.g. ``[("average", ">=", 60)]``."""
+    _, pq, _ = _pyarrow()
+    dataset = _dataset(path, fmt)
+    expression = pq.filters_to_expression(list(filters)) if filters else None
+    return iter(dataset.to_batches(columns=list(columns) if columns else None, filter=expression,
+                                   batch_size=batch_size))
+
+
+def read_table(path: str, columns: Optional[Sequence[str]] = None, filters: Optional[Filters] = None,
+               fmt: str = "parquet"):
+    _, pq, _ = _pyarrow()
+    dataset = _dataset(path, fmt)
+    expression = pq.filters_to_expression(list(filters)) if filters else None
+    return dataset.to_table(columns=list(columns) if columns else None, filter=expression)
+
+
+def import_roster(path: str, filters: Optional[Filters] = None, subjects: Optional[Sequence[str]] = None,
+                  fmt: str = "parquet", batch_size: int = BATCH_SIZE) -> Iterator[Student]:
+    """Rebuild ``Student`` objects from a wide roster export, reading only the needed columns."""
+    dataset = _dataset(path, fmt)
+    derived = {"student_id", "name", "total", "average", "grade"}
+    available = [name for name in dataset.schema.names if name not in derived]
+    wanted = [s for s in subjects if s in available] if subjects is not None else available
+    for batch in scan(path, ["student_id", "name", *wanted], filters, fmt, batch_size):
+        data = batch.to_pydict()
+        mark_columns = [(subject, data[subject]) for subject in wanted]
+        for i, (sid, name) in enumerate(zip(data["student_id"], data["name"])):
+            marks = {subject: values[i] for subject, values in mark_columns if values[i] is not None}
+            yield Student(student_id=sid, name=name, marks_by_subject=marks)
@@ -12,3 +12,4 @@ DB_CONFIG = {
 STUDENTS_TABLE = "students"
 MARKS_TABLE = "student_marks"
 PROFILES_TABLE = "student_profiles"
+SUMMARY_TABLE = "student_summary"
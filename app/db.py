@@ -1,15 +1,101 @@
 from __future__ import annotations
 import mysql.connector
 from mysql.connector import Error
-from typing import Optional, List, Dict, Any
+import csv
+import uuid
+from typing import Optional, List, Dict, Any, Callable, Iterator, Sequence, Set, Tuple
+import re
+import time
 from contextlib import contextmanager
-from .config import DB_CONFIG, STUDENTS_TABLE, MARKS_TABLE, PROFILES_TABLE
+from . import DEFAULT_GRADE_SCALE, DEFAULT_SUBJECTS, metrics
+from .config import DB_CONFIG, STUDENTS_TABLE, MARKS_TABLE, PROFILES_TABLE, SUMMARY_TABLE
+from .query import search_tokens
+
+CALL_SECONDS = metrics.histogram("sgm_db_call_seconds", "Duration of db module calls, by function")
+CONNECT_SECONDS = metrics.histogram("sgm_db_connect_seconds", "Time to open a MySQL connection")
+QUERY_SECONDS = metrics.histogram("sgm_db_query_seconds", "Time to execute one SQL statement, by statement type")
+QUERIES = metrics.counter("sgm_db_queries_total", "SQL statements executed, by statement type")
+ROWS_READ = metrics.counter("sgm_db_rows_read_total", "Rows fetched from result sets")
+ROWS_WRITTEN = metrics.counter("sgm_db_rows_written_total", "Rows affected by write statements, as reported by MySQL")
+ERRORS = metrics.counter("sgm_db_errors_total", "Failed connections and statements")
+_STATEMENT_TYPES = {"select": "select", "with": "select", "insert": "insert", "replace": "insert",
+                    "update": "update", "delete": "delete", "load": "load"}
+timed = metrics.timed(CALL_SECONDS)
+
+
+class _InstrumentedCursor:
+    """Cursor proxy that counts statements and rows; everything else goes to the real cursor."""
+
+    def __init__(self, cursor) -> None:
+        self._cursor = cursor
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def _run(self, operation: str, call: Callable[[], Any]) -> Any:
+        words = operation.split(None, 1)
+        kind = _STATEMENT_TYPES.get(words[0].lower(), "other") if words else "other"
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Error:
+            ERRORS.inc(stage="query")
+            raise
+        QUERY_SECONDS.observe(time.perf_counter() - start, statement=kind)
+        QUERIES.inc(statement=kind)
+        if kind != "select" and self._cursor.rowcount > 0:
+            ROWS_WRITTEN.inc(self._cursor.rowcount)
+        return result
+
+    def execute(self, operation: str, params: Any = None, *args: Any, **kwargs: Any) -> Any:
+        return self._run(operation, lambda: self._cursor.execute(operation, params, *args, **kwargs))
+
+    def executemany(self, operation: str, seq_params: Any) -> Any:
+        return self._run(operation, lambda: self._cursor.executemany(operation, seq_params))
+
+    def fetchone(self) -> Any:
+        row = self._cursor.fetchone()
+        if row is not None:
+            ROWS_READ.inc()
+        return row
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        rows = self._cursor.fetchmany(size)
+        ROWS_READ.inc(len(rows))
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        rows = self._cursor.fetchall()
+        ROWS_READ.inc(len(rows))
+        return rows
+
+
+class _InstrumentedConnection:
+    def __init__(self, connection) -> None:
+        self._connection = connection
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def cursor(self, *args: Any, **kwargs: Any) -> _InstrumentedCursor:
+        return _InstrumentedCursor(self._connection.cursor(*args, **kwargs))
+
+
+def _connect(**config) -> _InstrumentedConnection:
+    start = time.perf_counter()
+    try:
+        connection = mysql.connector.connect(**config)
+    except Error:
+        ERRORS.inc(stage="connect")
+        raise
+    CONNECT_SECONDS.observe(time.perf_counter() - start)
+    return _InstrumentedConnection(connection)
 
 @contextmanager
-def get_db_connection():
+def get_db_connection(**options):
     connection = None
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
+        connection = _connect(**{**DB_CONFIG, **options})
         yield connection
     except Error as e:
         print(f"Database connection error: {e}")
@@ -18,11 +104,52 @@ def get_db_connection():
         if connection and connection.is_connected():
             connection.close()
 
+def _ensure_index(cursor, db_name: str, table: str, index: str, definition: str) -> None:
+    """Add an index to an existing table unless one with that name is already there."""
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s
+    """, (db_name, table, index))
+    if not cursor.fetchone()[0]:
+        cursor.execute(f"ALTER TABLE {table} ADD {definition}")
+
+def _grade_case(column: str) -> str:
+    """SQL ``CASE`` expression matching ``compute_grade`` with the default grade scale."""
+    whens = " ".join(f"WHEN {column} >= {float(threshold)} THEN '{grade}'" for threshold, grade in DEFAULT_GRADE_SCALE)
+    return f"CASE {whens} ELSE '{DEFAULT_GRADE_SCALE[-1][1]}' END"
+
+def _refresh_summary(cursor, join: str = "", where: str = "", params: Sequence[Any] = ()) -> None:
+    """Recompute ``student_summary`` rows for the students selected by ``join``/``where`` (all when both are empty)."""
+    cursor.execute(f"""
+        INSERT INTO {SUMMARY_TABLE} (student_id, total, average, grade, mark_count)
+        SELECT t.student_id, t.total, t.average, {_grade_case('t.average')}, t.mark_count FROM (
+            SELECT s.student_id,
+                   COALESCE(SUM(m.marks), 0) AS total,
+                   COALESCE(AVG(m.marks), 0) AS average,
+                   COUNT(m.marks) AS mark_count
+            FROM {STUDENTS_TABLE} s
+            {join}
+            LEFT JOIN {MARKS_TABLE} m ON m.student_id = s.student_id
+            {where}
+            GROUP BY s.student_id
+        ) AS t
+        ON DUPLICATE KEY UPDATE total = VALUES(total), average = VALUES(average),
+                                grade = VALUES(grade), mark_count = VALUES(mark_count)
+    """, list(params))
+
+def _refresh_summary_for(cursor, student_ids: Sequence[str], batch_size: int = 1000) -> None:
+    ids = list(dict.fromkeys(student_ids))
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        placeholders = ", ".join(["%s"] * len(batch))
+        _refresh_summary(cursor, where=f"WHERE s.student_id IN ({placeholders})", params=batch)
+
+@timed
 def init_database() -> None:
     try:
         config_without_db = DB_CONFIG.copy()
         db_name = config_without_db.pop("database")
-        connection = mysql.connector.connect(**config_without_db)
+        connection = _connect(**config_without_db)
         cursor = connection.cursor()
         cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name}")
         cursor.execute(f"USE {db_name}")
@@ -31,12 +158,23 @@ def init_database() -> None:
                 id INT AUTO_INCREMENT PRIMARY KEY,
                 student_id VARCHAR(50) UNIQUE NOT NULL,
                 name VARCHAR(255) NOT NULL,
+                content_hash CHAR(40) NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 INDEX idx_student_id (student_id),
                 INDEX idx_name (name)
             )
         """)
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = 'content_hash'
+        """, (db_name, STUDENTS_TABLE))
+        if not cursor.fetchone()[0]:
+            cursor.execute(f"ALTER TABLE {STUDENTS_TABLE} ADD COLUMN content_hash CHAR(40) NULL AFTER name")
+        # Keyset pages in name order seek on (name, student_id).
+        _ensure_index(cursor, db_name, STUDENTS_TABLE, "idx_name_student_id",
+                      "INDEX idx_name_student_id (name, student_id)")
+        _ensure_index(cursor, db_name, STUDENTS_TABLE, "ft_name", "FULLTEXT INDEX ft_name (name)")
         cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS {MARKS_TABLE} (
                 id INT AUTO_INCREMENT PRIMARY KEY,
@@ -49,6 +187,27 @@ def init_database() -> None:
                 INDEX idx_subject (subject)
             )
         """)
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        """, (db_name, SUMMARY_TABLE))
+        summary_exists = bool(cursor.fetchone()[0])
+        # Per-student aggregates, kept in step with the marks by every write path below.
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} (
+                student_id VARCHAR(50) PRIMARY KEY,
+                total DECIMAL(10, 2) NOT NULL DEFAULT 0,
+                average DECIMAL(7, 4) NOT NULL DEFAULT 0,
+                grade CHAR(2) NOT NULL,
+                mark_count INT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                FOREIGN KEY (student_id) REFERENCES {STUDENTS_TABLE}(student_id) ON DELETE CASCADE,
+                INDEX idx_average (average, student_id),
+                INDEX idx_total (total, student_id),
+                INDEX idx_grade (grade)
+            )
+        """)
+        if not summary_exists:
+            _refresh_summary(cursor)
         cursor.execute(f"""
             CREATE TABLE IF NOT EXISTS {PROFILES_TABLE} (
                 id INT AUTO_INCREMENT PRIMARY KEY,
@@ -87,27 +246,139 @@ def init_database() -> None:
             cursor.close()
             connection.close()
 
-def insert_student(student_id: str, name: str, marks_by_subject: Dict[str, float]) -> bool:
+@timed
+def insert_student(student_id: str, name: str, marks_by_subject: Dict[str, float],
+                   content_hash: Optional[str] = None) -> bool:
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor()
             cursor.execute(f"""
-                INSERT INTO {STUDENTS_TABLE} (student_id, name)
-                VALUES (%s, %s)
-                ON DUPLICATE KEY UPDATE name = %s
-            """, (student_id, name, name))
+                INSERT INTO {STUDENTS_TABLE} (student_id, name, content_hash)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE name = VALUES(name), content_hash = VALUES(content_hash)
+            """, (student_id, name, content_hash))
             cursor.execute(f"DELETE FROM {MARKS_TABLE} WHERE student_id = %s", (student_id,))
             for subject, marks in marks_by_subject.items():
                 cursor.execute(f"""
                     INSERT INTO {MARKS_TABLE} (student_id, subject, marks)
                     VALUES (%s, %s, %s)
                 """, (student_id, subject, marks))
+            _refresh_summary_for(cursor, [student_id])
             connection.commit()
             return True
     except Error as e:
         print(f"Error inserting student: {e}")
         return False
 
+@timed
+def upsert_students(rows: Sequence[Tuple[str, str, Dict[str, float], Optional[str]]],
+                    batch_size: int = 1000) -> int:
+    """Write ``(student_id, name, marks, content_hash)`` rows in batches over one connection."""
+    written = 0
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                cursor.executemany(f"""
+                    INSERT INTO {STUDENTS_TABLE} (student_id, name, content_hash)
+                    VALUES (%s, %s, %s)
+                    ON DUPLICATE KEY UPDATE name = VALUES(name), content_hash = VALUES(content_hash)
+                """, [(sid, name, digest) for sid, name, _, digest in batch])
+                ids = [sid for sid, _, _, _ in batch]
+                cursor.execute(f"DELETE FROM {MARKS_TABLE} WHERE student_id IN ({', '.join(['%s'] * len(ids))})", ids)
+                marks = [(sid, subject, mark) for sid, _, marks_by_subject, _ in batch
+                         for subject, mark in marks_by_subject.items()]
+                if marks:
+                    cursor.executemany(f"""
+                        INSERT INTO {MARKS_TABLE} (student_id, subject, marks)
+                        VALUES (%s, %s, %s)
+                    """, marks)
+                _refresh_summary_for(cursor, ids)
+                connection.commit()
+                written += len(batch)
+            return written
+    except Error as e:
+        print(f"Error saving students: {e}")
+        raise
+
+@timed
+def get_content_hashes() -> Dict[str, Optional[str]]:
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT student_id, content_hash FROM {STUDENTS_TABLE}")
+            return dict(cursor.fetchall())
+    except Error as e:
+        print(f"Error retrieving content hashes: {e}")
+        raise
+
+@timed
+def get_existing_ids(student_ids: Sequence[str], batch_size: int = 1000) -> Set[str]:
+    found: Set[str] = set()
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            ids = list(student_ids)
+            for start in range(0, len(ids), batch_size):
+                batch = ids[start:start + batch_size]
+                cursor.execute(f"SELECT student_id FROM {STUDENTS_TABLE} "
+                               f"WHERE student_id IN ({', '.join(['%s'] * len(batch))})", batch)
+                found.update(row[0] for row in cursor.fetchall())
+            return found
+    except Error as e:
+        print(f"Error checking student IDs: {e}")
+        raise
+
+@timed
+def delete_students(student_ids: Sequence[str], batch_size: int = 1000) -> int:
+    deleted = 0
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            ids = list(student_ids)
+            for start in range(0, len(ids), batch_size):
+                batch = ids[start:start + batch_size]
+                cursor.execute(f"DELETE FROM {STUDENTS_TABLE} WHERE student_id IN ({', '.join(['%s'] * len(batch))})",
+                               batch)
+                deleted += cursor.rowcount
+            connection.commit()
+            return deleted
+    except Error as e:
+        print(f"Error deleting students: {e}")
+        raise
+
+@timed
+def insert_long_marks(rows: List[Tuple[str, str, str, float]]) -> int:
+    """Upsert ``(student_id, name, subject, marks)`` rows; returns the number of students written.
+
+    An empty name keeps the stored one, so callers must reject rows for unknown IDs without a name.
+    """
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            names: Dict[str, str] = {}
+            for sid, name, _, _ in rows:
+                if name or sid not in names:
+                    names[sid] = name or names.get(sid, "")
+            cursor.executemany(f"""
+                INSERT INTO {STUDENTS_TABLE} (student_id, name)
+                VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE name = IF(VALUES(name) = '', name, VALUES(name)), content_hash = NULL
+            """, list(names.items()))
+            cursor.executemany(f"""
+                INSERT INTO {MARKS_TABLE} (student_id, subject, marks)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE marks = VALUES(marks)
+            """, [(sid, subject, marks) for sid, _, subject, marks in rows])
+            _refresh_summary_for(cursor, list(names))
+            connection.commit()
+            return len(names)
+    except Error as e:
+        print(f"Error inserting marks batch: {e}")
+        raise
+
+@timed
 def get_student(student_id: str) -> Optional[Dict[str, Any]]:
     try:
         with get_db_connection() as connection:
@@ -124,6 +395,7 @@ def get_student(student_id: str) -> Optional[Dict[str, Any]]:
         print(f"Error retrieving student: {e}")
         return None
 
+@timed
 def get_all_students() -> List[Dict[str, Any]]:
     try:
         with get_db_connection() as connection:
@@ -146,6 +418,172 @@ def get_all_students() -> List[Dict[str, Any]]:
         print(f"Error retrieving all students: {e}")
         return []
 
+SEARCH_LIMIT = 50
+
+def _like_prefix(text: str) -> str:
+    return re.sub(r"([\\%_])", r"\\\1", text) + "%"
+
+def _fulltext_query(text: str) -> Optional[str]:
+    """Boolean-mode query requiring every word as a prefix; None when no word is long enough to be indexed."""
+    tokens = search_tokens(text)
+    return " ".join(f"+{t}*" for t in tokens) or None
+
+def search_condition(id_column: str, name_column: str, text: str) -> Tuple[str, List[Any]]:
+    """SQL condition matching an ID or name prefix, or every word of ``text`` through the FULLTEXT index."""
+    text = text.strip()
+    clause = f"({id_column} LIKE %s OR {name_column} LIKE %s"
+    params: List[Any] = [_like_prefix(text), _like_prefix(text)]
+    fulltext = _fulltext_query(text)
+    if fulltext:
+        clause += (f" OR {id_column} IN (SELECT student_id FROM {STUDENTS_TABLE}"
+                   f" WHERE MATCH(name) AGAINST (%s IN BOOLEAN MODE))")
+        params.append(fulltext)
+    return clause + ")", params
+
+@timed
+def search_students(text: str, limit: int = SEARCH_LIMIT) -> List[Dict[str, Any]]:
+    """Ranked name/ID search that never scans the table.
+
+    Exact ID matches come first, then ID prefixes (unique index), name prefixes
+    (``idx_name``) and finally FULLTEXT word-prefix matches by relevance. Each
+    tier is limited on its own, so the cost is bounded by ``limit``.
+    """
+    text = text.strip()
+    if not text:
+        return []
+    prefix = _like_prefix(text)
+    branches = [
+        f"SELECT student_id, 0 AS tier, 0 AS score FROM {STUDENTS_TABLE} WHERE student_id = %s",
+        f"(SELECT student_id, 1, 0 FROM {STUDENTS_TABLE} WHERE student_id LIKE %s ORDER BY student_id LIMIT %s)",
+        f"(SELECT student_id, 2, 0 FROM {STUDENTS_TABLE} WHERE name LIKE %s ORDER BY name, student_id LIMIT %s)",
+    ]
+    params: List[Any] = [text, prefix, limit, prefix, limit]
+    fulltext = _fulltext_query(text)
+    if fulltext:
+        branches.append(f"""(SELECT student_id, 3, MATCH(name) AGAINST (%s IN BOOLEAN MODE) FROM {STUDENTS_TABLE}
+                             WHERE MATCH(name) AGAINST (%s IN BOOLEAN MODE) ORDER BY 3 DESC LIMIT %s)""")
+        params.extend([fulltext, fulltext, limit])
+    sql = f"""
+        SELECT r.student_id, s.name, MIN(r.tier) AS tier, MAX(r.score) AS score
+        FROM ({" UNION ALL ".join(branches)}) AS r
+        JOIN {STUDENTS_TABLE} s ON s.student_id = r.student_id
+        GROUP BY r.student_id, s.name
+        ORDER BY tier, score DESC, s.name, r.student_id
+        LIMIT %s
+    """
+    params.append(limit)
+    return fetch_students_query(sql, params)
+
+@timed
+def fetch_students_query(sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(sql, params)
+            students = cursor.fetchall()
+            if not students:
+                return []
+            ids = [s['student_id'] for s in students]
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(f"SELECT student_id, subject, marks FROM {MARKS_TABLE} WHERE student_id IN ({placeholders})", ids)
+            marks_dict: Dict[str, Dict[str, float]] = {}
+            for mark in cursor.fetchall():
+                marks_dict.setdefault(mark['student_id'], {})[mark['subject']] = float(mark['marks'])
+            for student in students:
+                student['marks_by_subject'] = marks_dict.get(student['student_id'], {})
+            return students
+    except Error as e:
+        print(f"Error running student query: {e}")
+        return []
+
+@timed
+def count_students_query(sql: str, params: List[Any]) -> int:
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+            return int(row[0]) if row else 0
+    except Error as e:
+        print(f"Error counting students: {e}")
+        return 0
+
+@timed
+def class_average() -> float:
+    """Mean of the per-student averages, counting students without marks as 0 like ``StudentManager``."""
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT COALESCE(AVG(average), 0) FROM {SUMMARY_TABLE}")
+            row = cursor.fetchone()
+            return float(row[0]) if row else 0.0
+    except Error as e:
+        print(f"Error computing class average: {e}")
+        return 0.0
+
+@timed
+def grade_counts() -> Dict[str, int]:
+    """Number of students per grade, read from the ``student_summary`` grade index."""
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT grade, COUNT(*) FROM {SUMMARY_TABLE} GROUP BY grade")
+            return {grade: int(count) for grade, count in cursor.fetchall()}
+    except Error as e:
+        print(f"Error counting grades: {e}")
+        return {}
+
+@timed
+def rebuild_summary() -> int:
+    """Recompute every ``student_summary`` row, e.g. after marks were edited outside the app."""
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            _refresh_summary(cursor)
+            connection.commit()
+            cursor.execute(f"SELECT COUNT(*) FROM {SUMMARY_TABLE}")
+            return int(cursor.fetchone()[0])
+    except Error as e:
+        print(f"Error rebuilding student summary: {e}")
+        raise
+
+@timed
+def iter_students(batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+    """Stream every student with marks in ``student_id`` order using keyset pages."""
+    last_id: Optional[str] = None
+    while True:
+        try:
+            with get_db_connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                if last_id is None:
+                    cursor.execute(f"SELECT student_id, name FROM {STUDENTS_TABLE} ORDER BY student_id LIMIT %s",
+                                   (batch_size,))
+                else:
+                    cursor.execute(f"""
+                        SELECT student_id, name FROM {STUDENTS_TABLE}
+                        WHERE student_id > %s ORDER BY student_id LIMIT %s
+                    """, (last_id, batch_size))
+                students = cursor.fetchall()
+                if not students:
+                    return
+                first_id, last_id = students[0]['student_id'], students[-1]['student_id']
+                cursor.execute(f"""
+                    SELECT student_id, subject, marks FROM {MARKS_TABLE}
+                    WHERE student_id BETWEEN %s AND %s
+                """, (first_id, last_id))
+                marks_dict: Dict[str, Dict[str, float]] = {}
+                for mark in cursor.fetchall():
+                    marks_dict.setdefault(mark['student_id'], {})[mark['subject']] = float(mark['marks'])
+        except Error as e:
+            print(f"Error streaming students: {e}")
+            raise
+        for student in students:
+            student['marks_by_subject'] = marks_dict.get(student['student_id'], {})
+            yield student
+        if len(students) < batch_size:
+            return
+
+@timed
 def delete_student(student_id: str) -> bool:
     try:
         with get_db_connection() as connection:
@@ -157,6 +595,7 @@ def delete_student(student_id: str) -> bool:
         print(f"Error deleting student: {e}")
         return False
 
+@timed
 def clear_all_data() -> bool:
     try:
         with get_db_connection() as connection:
@@ -170,6 +609,7 @@ def clear_all_data() -> bool:
         print(f"Error clearing all data: {e}")
         return False
 
+@timed
 def insert_profile(student_id: str, photo_path: Optional[str] = None, date_of_birth: Optional[str] = None,
                    gender: Optional[str] = None, blood_group: Optional[str] = None, religion: Optional[str] = None,
                    nationality: Optional[str] = None, address: Optional[str] = None, phone: Optional[str] = None,
@@ -218,6 +658,7 @@ def insert_profile(student_id: str, photo_path: Optional[str] = None, date_of_bi
         print(f"Error inserting profile: {e}")
         return False
 
+@timed
 def get_profile(student_id: str) -> Optional[Dict[str, Any]]:
     try:
         with get_db_connection() as connection:
@@ -234,6 +675,45 @@ def get_profile(student_id: str) -> Optional[Dict[str, Any]]:
         print(f"Error retrieving profile: {e}")
         return None
 
+@timed
+def get_profiles(student_ids: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Fetch many profiles in one query, keyed by student ID (all profiles when ``student_ids`` is None)."""
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor(dictionary=True)
+            sql = f"""
+                SELECT student_id, photo_path, date_of_birth, gender, blood_group, religion, nationality,
+                       address, phone, email, session, department, semester, previous_cgpa,
+                       father_name, father_occupation, father_phone, mother_name, mother_occupation,
+                       mother_phone, emergency_contact
+                FROM {PROFILES_TABLE}
+            """
+            if student_ids is None:
+                cursor.execute(sql)
+                return {row["student_id"]: row for row in cursor.fetchall()}
+            profiles: Dict[str, Dict[str, Any]] = {}
+            ids = list(student_ids)
+            for start in range(0, len(ids), 1000):
+                batch = ids[start:start + 1000]
+                cursor.execute(sql + f" WHERE student_id IN ({', '.join(['%s'] * len(batch))})", batch)
+                profiles.update((row["student_id"], row) for row in cursor.fetchall())
+            return profiles
+    except Error as e:
+        print(f"Error retrieving profiles: {e}")
+        return {}
+
+@timed
+def get_profile_ids() -> Set[str]:
+    try:
+        with get_db_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT student_id FROM {PROFILES_TABLE}")
+            return {row[0] for row in cursor.fetchall()}
+    except Error as e:
+        print(f"Error retrieving profile IDs: {e}")
+        return set()
+
+@timed
 def update_profile(student_id: str, **kwargs) -> bool:
     try:
         with get_db_connection() as connection:
@@ -259,3 +739,169 @@ def update_profile(student_id: str, **kwargs) -> bool:
         print(f"Error updating profile: {e}")
         return False
 
+# SQL spelling of grading._NUMBER_PATTERN.
+MARK_PATTERN = "^[+-]?([0-9]+([.][0-9]*)?|[.][0-9]+)([eE][+-]?[0-9]+)?$"
+
+def _create_staging_table(cursor, table: str, subject_count: int) -> None:
+    mark_columns = ", ".join(f"m{i} VARCHAR(64)" for i in range(subject_count))
+    cursor.execute(f"""
+        CREATE TABLE {table} (
+            line_no INT AUTO_INCREMENT PRIMARY KEY,
+            student_id VARCHAR(255),
+            name VARCHAR(255),
+            {mark_columns},
+            content_hash CHAR(40) NULL,
+            error VARCHAR(100) NULL,
+            INDEX idx_staging_student (student_id)
+        ) ENGINE=InnoDB
+    """)
+
+def _fill_staging_local_infile(cursor, table: str, path: str, header: Sequence[str], subjects: Sequence[str]) -> None:
+    targets = {"ID": "student_id", "Name": "name", **{subj: f"m{i}" for i, subj in enumerate(subjects)}}
+    variables = [f"@c{i}" for i in range(len(header))]
+    assignments = [
+        f"{targets[col]} = TRIM(TRAILING '\\r' FROM {var})"
+        for col, var in zip(header, variables) if col in targets
+    ]
+    cursor.execute(f"""
+        LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+        CHARACTER SET utf8mb4
+        FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '"'
+        LINES TERMINATED BY '\\n'
+        IGNORE 1 LINES
+        ({", ".join(variables)})
+        SET {", ".join(assignments)}
+    """, (path,))
+
+def _fill_staging_batched(cursor, table: str, path: str, header: Sequence[str], subjects: Sequence[str],
+                          batch_size: int) -> None:
+    positions = [header.index(col) for col in ["ID", "Name", *subjects]]
+    columns = ["student_id", "name", *(f"m{i}" for i in range(len(subjects)))]
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    batch: List[Tuple[str, ...]] = []
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            if not row:
+                continue
+            batch.append(tuple(row[pos] if pos < len(row) else "" for pos in positions))
+            if len(batch) >= batch_size:
+                cursor.executemany(sql, batch)
+                batch = []
+    if batch:
+        cursor.executemany(sql, batch)
+
+@timed
+def bulk_load_csv(path: str, subjects: Sequence[str] = DEFAULT_SUBJECTS, use_local_infile: bool = True,
+                  batch_size: int = 5000, max_errors: int = 1000) -> Dict[str, Any]:
+    """Load a wide roster CSV through a staging table and merge it with set-based SQL in one transaction.
+
+    Rows are validated in SQL with the same rules as ``app.grading``. Later rows win for duplicate IDs,
+    and the marks of every merged student are replaced, as in ``insert_student``.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        header = [col.strip() for col in next(csv.reader(f), [])]
+    missing = [col for col in ["ID", "Name", *subjects] if col not in header]
+    if missing:
+        raise ValueError(f"Invalid CSV format. Missing columns: {', '.join(missing)}")
+
+    table = f"staging_students_{uuid.uuid4().hex[:12]}"
+    mark_cols = [f"m{i}" for i in range(len(subjects))]
+    options = {"allow_local_infile": True} if use_local_infile else {}
+    with get_db_connection(**options) as connection:
+        cursor = connection.cursor()
+        try:
+            _create_staging_table(cursor, table, len(subjects))
+            if use_local_infile:
+                _fill_staging_local_infile(cursor, table, path, header, subjects)
+            else:
+                _fill_staging_batched(cursor, table, path, header, subjects, batch_size)
+            connection.commit()
+
+            connection.start_transaction()
+            cursor.execute(f"UPDATE {table} SET student_id = TRIM(student_id), name = TRIM(name)")
+            checks = [
+                ("student_id IS NULL OR student_id = ''", "Student ID cannot be empty."),
+                ("CHAR_LENGTH(student_id) > 50", "Student ID cannot exceed 50 characters."),
+                ("name IS NULL OR name = ''", "Student name cannot be empty."),
+                ("CHAR_LENGTH(name) > 100", "Student name cannot exceed 100 characters."),
+                ("name NOT REGEXP '^[A-Za-z[:space:]''-]+$'",
+                 "Student name can only contain letters, spaces, hyphens, and apostrophes."),
+            ]
+            for condition, reason in checks:
+                cursor.execute(f"UPDATE {table} SET error = %s WHERE error IS NULL AND ({condition})", (reason,))
+            # Same number syntax and messages as grading._parse_mark, so both import paths log identical errors.
+            for i, subj in enumerate(subjects):
+                col = f"TRIM(COALESCE(m{i}, ''))"
+                cursor.execute(f"""
+                    UPDATE {table} SET error = CASE
+                        WHEN {col} NOT REGEXP '{MARK_PATTERN}' THEN %s
+                        WHEN {col} + 0 < 0 THEN %s
+                        WHEN {col} + 0 > 100 THEN %s
+                    END
+                    WHERE error IS NULL AND {col} <> ''
+                """, tuple(f"{subj} marks {reason}"[:100]
+                           for reason in ("must be a valid number.", "cannot be negative.", "cannot exceed 100.")))
+                # Write exponent forms out as plain decimals for the DECIMAL casts below.
+                cursor.execute(f"UPDATE {table} SET m{i} = CAST({col} + 0 AS DECIMAL(12, 4)) "
+                               f"WHERE error IS NULL AND m{i} REGEXP '[eE]'")
+
+            cursor.execute(f"""
+                DELETE older FROM {table} AS older
+                JOIN {table} AS newer
+                  ON newer.student_id = older.student_id AND newer.line_no > older.line_no
+                WHERE older.error IS NULL AND newer.error IS NULL
+            """)
+            # Same digest as Student.content_hash(): sorted "subject=marks" pairs with two decimals.
+            order = sorted(range(len(subjects)), key=lambda i: subjects[i])
+            digest_parts = ", ".join(
+                f"CONCAT(%s, '=', CAST(COALESCE(NULLIF(TRIM(m{i}), ''), '0') AS DECIMAL(5, 2)))" for i in order
+            )
+            cursor.execute(f"""
+                UPDATE {table} SET content_hash = SHA1(CONCAT_WS(CHAR(31), student_id, name{', ' if order else ''}{digest_parts}))
+                WHERE error IS NULL
+            """, [subjects[i] for i in order])
+            cursor.execute(f"""
+                DELETE st FROM {table} AS st
+                JOIN {STUDENTS_TABLE} AS s ON s.student_id = st.student_id AND s.content_hash = st.content_hash
+                WHERE st.error IS NULL
+            """)
+            unchanged = cursor.rowcount
+            cursor.execute(f"""
+                INSERT INTO {STUDENTS_TABLE} (student_id, name, content_hash)
+                SELECT student_id, name, content_hash FROM {table} WHERE error IS NULL
+                ON DUPLICATE KEY UPDATE name = VALUES(name), content_hash = VALUES(content_hash)
+            """)
+            cursor.execute(f"""
+                DELETE m FROM {MARKS_TABLE} AS m
+                JOIN {table} AS s ON s.student_id = m.student_id
+                WHERE s.error IS NULL
+            """)
+            selects = " UNION ALL ".join(
+                f"SELECT student_id, %s, CAST(COALESCE(NULLIF(TRIM({col}), ''), '0') AS DECIMAL(5, 2)) "
+                f"FROM {table} WHERE error IS NULL"
+                for col in mark_cols
+            )
+            if selects:
+                cursor.execute(f"INSERT INTO {MARKS_TABLE} (student_id, subject, marks) {selects}", list(subjects))
+            marks_written = cursor.rowcount
+            _refresh_summary(cursor, join=f"JOIN {table} AS st ON st.student_id = s.student_id AND st.error IS NULL")
+
+            cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE error IS NULL")
+            merged = int(cursor.fetchone()[0])
+            cursor.execute(f"SELECT line_no, error FROM {table} WHERE error IS NOT NULL ORDER BY line_no LIMIT %s",
+                           (max_errors,))
+            errors = [f"Row {line_no}: {reason}" for line_no, reason in cursor.fetchall()]
+            cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE error IS NOT NULL")
+            rejected = int(cursor.fetchone()[0])
+            connection.commit()
+            return {"students": merged, "unchanged": unchanged, "marks": marks_written, "rejected": rejected,
+                    "errors": errors}
+        except Error as e:
+            connection.rollback()
+            print(f"Error bulk loading CSV: {e}")
+            raise
+        finally:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.close()
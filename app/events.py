@@ -0,0 +1,37 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple, Union
+from .models import Student
+
+@dataclass(frozen=True)
+class StudentAdded:
+    student: Student
+
+@dataclass(frozen=True)
+class StudentUpdated:
+    old: Student
+    new: Student
+
+    @property
+    def old_marks(self) -> Dict[str, float]:
+        return self.old.marks_by_subject
+
+    @property
+    def new_marks(self) -> Dict[str, float]:
+        return self.new.marks_by_subject
+
+@dataclass(frozen=True)
+class StudentDeleted:
+    student: Student
+
+@dataclass(frozen=True)
+class StudentsImported:
+    added: List[Student] = field(default_factory=list)
+    updated: List[Tuple[Student, Student]] = field(default_factory=list)
+    unchanged: int = 0
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.updated)
+
+ChangeEvent = Union[StudentAdded, StudentUpdated, StudentDeleted, StudentsImported]
+Subscriber = Callable[[ChangeEvent], None]
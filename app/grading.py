@@ -1,6 +1,14 @@
 from __future__ import annotations
 import re
-from typing import Iterable, Sequence, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+MAX_ID_LENGTH = 50
+MAX_NAME_LENGTH = 100
+MAX_SUBJECT_LENGTH = 100
+_NAME_PATTERN = re.compile(r"^[a-zA-Z\s\-']+$")
+_NUMBER_PATTERN = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+_MISSING = object()
 
 def clamp_mark(value: float) -> float:
     if value < 0:
@@ -25,17 +33,17 @@ def validate_marks(marks: Iterable[float]) -> None:
 def validate_student_id(student_id: str) -> None:
     if not student_id or not student_id.strip():
         raise ValueError("Student ID cannot be empty.")
-    if len(student_id.strip()) > 50:
+    if len(student_id.strip()) > MAX_ID_LENGTH:
         raise ValueError("Student ID cannot exceed 50 characters.")
 
 def validate_student_name(name: str) -> None:
     if not name or not name.strip():
         raise ValueError("Student name cannot be empty.")
-    if len(name.strip()) > 100:
+    if len(name.strip()) > MAX_NAME_LENGTH:
         raise ValueError("Student name cannot exceed 100 characters.")
     if not name.strip():
         raise ValueError("Student name cannot be only whitespace.")
-    if not re.match(r"^[a-zA-Z\s\-']+$", name.strip()):
+    if not _NAME_PATTERN.match(name.strip()):
         raise ValueError("Student name can only contain letters, spaces, hyphens, and apostrophes.")
 
 def validate_float_input(value: str, field_name: str = "value") -> float:
@@ -51,3 +59,173 @@ def validate_float_input(value: str, field_name: str = "value") -> float:
     except ValueError as e:
         raise ValueError(f"{field_name} must be a valid number. {str(e)}")
 
+@dataclass(frozen=True)
+class ValidationIssue:
+    row: int
+    field: str
+    reason: str
+
+    def __str__(self) -> str:
+        return f"Row {self.row}: {self.reason}" if self.row > 0 else self.reason
+
+@dataclass
+class ValidationReport:
+    records: List[Tuple[int, str, str, Dict[str, float]]] = field(default_factory=list)
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def rejected_rows(self) -> int:
+        return len({issue.row for issue in self.issues})
+
+def _id_reason(value: object) -> Optional[str]:
+    if not isinstance(value, str) or not value:
+        return "Student ID cannot be empty."
+    if len(value) > MAX_ID_LENGTH:
+        return f"Student ID cannot exceed {MAX_ID_LENGTH} characters."
+    return None
+
+def _name_reason(value: object) -> Optional[str]:
+    if not isinstance(value, str) or not value:
+        return "Student name cannot be empty."
+    if len(value) > MAX_NAME_LENGTH:
+        return f"Student name cannot exceed {MAX_NAME_LENGTH} characters."
+    if not _NAME_PATTERN.match(value):
+        return "Student name can only contain letters, spaces, hyphens, and apostrophes."
+    return None
+
+def _parse_mark(value: object) -> Tuple[Optional[float], Optional[str]]:
+    if isinstance(value, bool):
+        return None, "must be a valid number."
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0.0, None
+        if not _NUMBER_PATTERN.match(text):
+            return None, "must be a valid number."
+        number = float(text)
+    else:
+        return None, "must be a valid number."
+    if number != number:
+        return None, "must be a valid number."
+    if number < 0:
+        return None, "cannot be negative."
+    if number > 100:
+        return None, "cannot exceed 100."
+    return number, None
+
+def validate_columns(ids: Sequence[object], names: Sequence[object], marks: Mapping[str, Sequence[object]],
+                     start_row: int = 1) -> ValidationReport:
+    """Validate a chunk column by column; missing marks are passed as ``None`` and skipped."""
+    report = ValidationReport()
+    bad = set()
+    clean_ids = [v.strip() if isinstance(v, str) else v for v in ids]
+    clean_names = [v.strip() if isinstance(v, str) else v for v in names]
+    for i, value in enumerate(clean_ids):
+        reason = _id_reason(value)
+        if reason:
+            bad.add(i)
+            report.issues.append(ValidationIssue(start_row + i, "student_id", reason))
+    for i, value in enumerate(clean_names):
+        reason = _name_reason(value)
+        if reason:
+            bad.add(i)
+            report.issues.append(ValidationIssue(start_row + i, "name", reason))
+    parsed: Dict[str, List[Optional[float]]] = {}
+    for subject, column in marks.items():
+        values: List[Optional[float]] = []
+        for i, raw in enumerate(column):
+            if raw is None or raw is _MISSING:
+                values.append(None)
+                continue
+            if raw.__class__ is str and raw.isascii() and raw.isdigit():
+                number = float(raw)
+                if number <= 100:
+                    values.append(number)
+                    continue
+            number, reason = _parse_mark(raw)
+            if reason:
+                bad.add(i)
+                report.issues.append(ValidationIssue(start_row + i, subject, f"{subject} marks {reason}"))
+            values.append(number)
+        parsed[subject] = values
+    subjects = list(parsed)
+    rows = zip(*parsed.values()) if parsed else ((),) * len(clean_ids)
+    for i, row_values in enumerate(rows):
+        if i in bad:
+            continue
+        if None in row_values:
+            row_marks = {subj: v for subj, v in zip(subjects, row_values) if v is not None}
+        else:
+            row_marks = dict(zip(subjects, row_values))
+        report.records.append((start_row + i, clean_ids[i], clean_names[i], row_marks))
+    report.issues.sort(key=lambda issue: issue.row)
+    return report
+
+def validate_long_columns(ids: Sequence[object], names: Sequence[object], subjects: Sequence[object],
+                          marks: Sequence[object], start_row: int = 1) -> ValidationReport:
+    """Validate long-format rows (one mark per row); names may be blank on all but one row per student."""
+    report = ValidationReport()
+    for i, (sid, name, subject, raw) in enumerate(zip(ids, names, subjects, marks)):
+        row = start_row + i
+        sid = sid.strip() if isinstance(sid, str) else sid
+        name = name.strip() if isinstance(name, str) else ""
+        subject = subject.strip() if isinstance(subject, str) else subject
+        reason = _id_reason(sid)
+        if reason:
+            report.issues.append(ValidationIssue(row, "student_id", reason))
+            continue
+        if name:
+            reason = _name_reason(name)
+            if reason:
+                report.issues.append(ValidationIssue(row, "name", reason))
+                continue
+        if not isinstance(subject, str) or not subject:
+            report.issues.append(ValidationIssue(row, "subject", "Subject cannot be empty."))
+            continue
+        if len(subject) > MAX_SUBJECT_LENGTH:
+            report.issues.append(ValidationIssue(row, "subject", f"Subject cannot exceed {MAX_SUBJECT_LENGTH} characters."))
+            continue
+        if raw is None or (isinstance(raw, str) and not raw.strip()):
+            report.issues.append(ValidationIssue(row, subject, f"{subject} marks cannot be empty."))
+            continue
+        number, reason = _parse_mark(raw)
+        if reason:
+            report.issues.append(ValidationIssue(row, subject, f"{subject} marks {reason}"))
+            continue
+        report.records.append((row, sid, name, {subject: number}))
+    return report
+
+def validate_records(records: Sequence[object], subjects: Optional[Sequence[str]] = None,
+                     start_row: int = 1) -> ValidationReport:
+    """Validate ``Student.to_dict``-shaped records by transposing them into columns."""
+    ids: List[object] = []
+    names: List[object] = []
+    mark_dicts: List[Mapping[str, object]] = []
+    structural: List[ValidationIssue] = []
+    for i, record in enumerate(records):
+        if not isinstance(record, Mapping):
+            structural.append(ValidationIssue(start_row + i, "record", "Record must be an object."))
+            record = {}
+        marks = record.get("marks_by_subject", {})
+        if not isinstance(marks, Mapping):
+            structural.append(ValidationIssue(start_row + i, "marks_by_subject", "Marks must be an object."))
+            marks = {}
+        sid = record.get("student_id", "")
+        ids.append(str(sid) if isinstance(sid, (int, float)) and not isinstance(sid, bool) else sid)
+        names.append(record.get("name", ""))
+        mark_dicts.append(marks)
+    columns = list(subjects) if subjects is not None else list(dict.fromkeys(k for m in mark_dicts for k in m))
+    marks_columns = {subject: [m.get(subject, _MISSING) for m in mark_dicts] for subject in columns}
+    if subjects is None:
+        for i, m in enumerate(mark_dicts):
+            for subject in m:
+                if not isinstance(subject, str):
+                    structural.append(ValidationIssue(start_row + i, "marks_by_subject", "Subject names must be text."))
+    report = validate_columns(ids, names, marks_columns, start_row)
+    if structural:
+        rejected = {issue.row for issue in structural}
+        report.records = [r for r in report.records if r[0] not in rejected]
+        report.issues = sorted(report.issues + structural, key=lambda issue: issue.row)
+    return report
@@ -2,20 +2,43 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 import csv
-import json
+import itertools
 import sys
+import time
 import ctypes
 import os
-from PIL import Image, ImageTk
+import threading
+from bisect import bisect_left
 
 from . import DEFAULT_GRADE_SCALE, DEFAULT_SUBJECTS
-from .grading import compute_grade, validate_marks, validate_student_id, validate_student_name, validate_float_input
+from .events import ChangeEvent, StudentAdded, StudentDeleted, StudentsImported, StudentUpdated
+from .grading import compute_grade, validate_float_input, validate_marks, validate_student_id, validate_student_name
 from .manager import StudentManager
 from .models import Student
-from .storage import load_students, save_students
-from .windows import StatisticsWindow, ProfileWindow
+from .query import StudentQuery, narrows, text_matcher
+from .storage import DEFAULT_DATA_DIR, save_students
+from .thumbnails import MAIN_PHOTO_SIZE, PhotoLoader
+from .widgets import VirtualTable
+
+if TYPE_CHECKING:
+    from .importers import ImportBatch
+
+
+IMPORT_POLL_MS = 50
+VIRTUAL_TABLE_THRESHOLD = 20000
+INCREMENTAL_REFRESH_LIMIT = 500
+REORDER_MOVE_LIMIT = 200
+SEARCH_DEBOUNCE_MS = 8
+SEARCH_CHUNK_ROWS = 20000
+PHOTO_PREFETCH_ROWS = 2
+ROSTER_BATCH_ROWS = 2000
+ROSTER_PENDING_BATCHES = 32
+ROSTER_POLL_MS = 50
+ROSTER_REFRESH_BACKOFF = 3
+PAGED_TABLE_THRESHOLD = 250000
+PAGED_SEARCH_DEBOUNCE_MS = 250
 
 
 if sys.platform == 'win32':
@@ -50,16 +73,37 @@ class GradeApp(tk.Tk):
         style.configure('Action.TButton', font=('Segoe UI', 9, 'bold'), padding=8)
         style.map('Action.TButton', background=[('active', '#3498db')], foreground=[('active', 'white')])
 
-        self.manager = StudentManager(load_students())
+        self.manager = StudentManager([])
+        self._unsubscribe = self.manager.subscribe(self._on_roster_change)
+        self._refresh_pending = None
+        self._pending_events: List[ChangeEvent] = []
+        self._table_rows: List[Student] = []
+        self._table_cells: Dict[str, Tuple[Sequence[str], Tuple[str, ...]]] = {}
+        self._table_view: Optional[StudentQuery] = None
+        self._sorted_cache: Optional[Tuple[Tuple[int, str], List[Student], Optional[List[str]]]] = None
+        self._search_results: Optional[Tuple[int, str, str, List[Student], List[str]]] = None
+        self._search_after = None
+        self._search_generation = 0
+        self._selected_sid = None
+        self._photo_sid = None
+        self.photo_loader = PhotoLoader(self)
+        self.profile_ids: Set[str] = set()
         self.profile_window = None
+        self.import_job = None
+        self.import_window = None
+        self.roster_job = None
+        self.roster_loaded = False
+        self.paged_rows = None
+        self._paged_stats_stale = True
         self.is_fullscreen = False
-        self.db_status = self._check_database_status()
+        self.db_status = "Connecting..."
         self._build_widgets()
         self._refresh_table()
         self.protocol("WM_DELETE_WINDOW", self._on_closing)
         self._setup_table_tags()
         self.bind('<F11>', self._toggle_fullscreen)
         self.bind('<Escape>', self._exit_fullscreen)
+        self.after_idle(self._start_roster_load)
 
     def _setup_table_tags(self) -> None:
         self.tree.tag_configure("grade_A", background="#d4edda", foreground="#155724")
@@ -78,6 +122,121 @@ class GradeApp(tk.Tk):
         except Exception:
             pass
         return "JSON"
+
+    def _start_roster_load(self, notify: bool = False) -> None:
+        """Stream the roster in on a worker thread so the window is usable while it loads."""
+        from .importers import ImportJob
+        backend: Dict[str, object] = {}
+        log_path = os.path.join(DEFAULT_DATA_DIR, "logs", "roster_load.log")
+        job = ImportJob(self._iter_roster(backend), 1, log_path, max_pending=ROSTER_PENDING_BATCHES)
+        self.roster_job = job
+        self.roster_loaded = False
+        self._update_stats()
+        job.start()
+        self.after(ROSTER_POLL_MS, self._poll_roster_load, job, backend, notify)
+
+    def _iter_roster(self, backend: Dict[str, object]) -> Iterator[ImportBatch]:
+        """Runs on the loader thread: yield the roster in batches, probing the backend once the first page is in.
+
+        A database roster above ``PAGED_TABLE_THRESHOLD`` is not loaded at all; the table pages through it instead.
+        """
+        from .importers import ImportBatch
+        from .storage import iter_student_batches
+        batches = iter_student_batches(batch_size=ROSTER_BATCH_ROWS)
+        first = next(batches, [])
+        self._probe_backend(backend)
+        if backend.get("paged"):
+            batches.close()
+            return
+        loaded = 0
+        for students in itertools.chain([first], batches):
+            if students:
+                loaded += len(students)
+                yield ImportBatch(students, [], len(students), loaded)
+
+    def _probe_backend(self, backend: Dict[str, object]) -> None:
+        """Cache which students have a profile so table rows need no per-row lookup."""
+        status = self._check_database_status()
+        from . import storage
+        if status == "MySQL":
+            from .db import get_profile_ids
+            backend["paged"] = StudentQuery.database().count() > PAGED_TABLE_THRESHOLD
+            backend["profile_ids"] = get_profile_ids()
+        else:
+            backend["profile_ids"] = set()
+        storage.PAGED_ROSTER = bool(backend.get("paged"))
+        backend["status"] = status
+
+    def _poll_roster_load(self, job, backend: Dict[str, object], notify: bool) -> None:
+        """Apply the batches loaded so far, backing off while table refreshes are expensive."""
+        if job is not self.roster_job:
+            return
+        self._apply_backend(backend)
+        started = time.perf_counter()
+        # Show the first batch on its own so rows appear quickly, then catch up in bulk.
+        batches, done = job.drain(max_batches=ROSTER_PENDING_BATCHES if self.manager.count_students() else 1)
+        students = [student for batch in batches for student in batch.students]
+        if students:
+            self.manager.bulk_import(students)
+            if self._refresh_pending is not None:
+                self.after_cancel(self._refresh_pending)
+                self._flush_roster_changes()
+        if done:
+            # The worker may have probed the backend and finished after the check above.
+            self._apply_backend(backend)
+            self._finish_roster_load(job, notify)
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        delay = max(ROSTER_POLL_MS, int(elapsed_ms * ROSTER_REFRESH_BACKOFF))
+        self.after(delay, self._poll_roster_load, job, backend, notify)
+
+    def _apply_backend(self, backend: Dict[str, object]) -> None:
+        """Take over the loader's backend probe once it has reported."""
+        status = backend.pop("status", None)
+        if status is None:
+            return
+        self.db_status = status
+        self.profile_ids = backend.pop("profile_ids")
+        self.lbl_db_status.config(text=f"💾 Database: {status}",
+                                  fg='#27ae60' if status == 'MySQL' else '#3498db')
+        if backend.pop("paged", False):
+            self._enter_paged_mode()
+
+    def _finish_roster_load(self, job, notify: bool) -> None:
+        self.roster_job = None
+        self.roster_loaded = job.error is None
+        self._update_stats()
+        if job.error is not None:
+            messagebox.showerror("Error", f"Failed to load students: {str(job.error)}")
+        elif notify:
+            messagebox.showinfo("Reloaded", "Data reloaded from file.")
+
+    def _enter_paged_mode(self) -> None:
+        """Leave the roster in the database and let the table page through it with SQL."""
+        from .paging import PagedRoster
+        self.paged_rows = PagedRoster(StudentQuery.database())
+        self._paged_stats_stale = True
+        self._refresh_table()
+
+    def _cancel_roster_load(self) -> None:
+        if self.roster_job is not None:
+            self.roster_job.cancel()
+            self.roster_job = None
+
+    def _roster_ready(self, paged_ok: bool = False) -> bool:
+        """Whether the whole roster is in memory; saving a partial one would drop the missing students."""
+        if self.roster_job is not None:
+            messagebox.showinfo("Loading", "Students are still loading. Please try again in a moment.")
+            return False
+        if self.paged_rows is not None:
+            if not paged_ok:
+                messagebox.showinfo("Info", "The roster is too large to load into memory, "
+                                            "so this action is not available.")
+            return paged_ok
+        if not self.roster_loaded:
+            messagebox.showerror("Error", "The student list did not load completely. Reload before making changes.")
+            return False
+        return True
     
     def _toggle_fullscreen(self, event=None) -> None:
         self.is_fullscreen = not self.is_fullscreen
@@ -91,10 +250,16 @@ class GradeApp(tk.Tk):
             return 'break'
 
     def _on_closing(self) -> None:
-        try:
-            save_students(self.manager.list_students())
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save data: {e}")
+        if self.import_job is not None:
+            self.import_job.cancel()
+        self.photo_loader.shutdown()
+        if self.roster_job is not None:
+            self._cancel_roster_load()
+        elif self.roster_loaded and self.paged_rows is None:
+            try:
+                save_students(self.manager.list_students())
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to save data: {e}")
         self.destroy()
 
     def _build_widgets(self) -> None:
@@ -108,100 +273,25 @@ class GradeApp(tk.Tk):
         file_menu.add_separator()
         file_menu.add_command(label="📥 Import JSON", command=self._on_import_json)
         file_menu.add_command(label="📥 Import CSV", command=self._on_import_csv)
+        file_menu.add_command(label="📥 Import Long-format Marks", command=self._on_import_long)
         file_menu.add_separator()
         file_menu.add_command(label="📤 Export to CSV", command=self._on_export_csv)
+        file_menu.add_command(label="📤 Export to Parquet", command=self._on_export_parquet)
         file_menu.add_separator()
         file_menu.add_command(label="❌ Exit", command=self._on_closing)
         
         tools_menu = tk.Menu(menubar, tearoff=0, font=('Segoe UI', 9))
         menubar.add_cascade(label="🛠️ Tools", menu=tools_menu)
         tools_menu.add_command(label="📊 Statistics", command=self._show_statistics)
+        tools_menu.add_command(label="📝 Generate Report Cards", command=self._on_generate_reports)
+        tools_menu.add_command(label="🩺 Diagnostics", command=self._show_diagnostics)
         
         header = tk.Frame(self, bg='#2c3e50', height=60)
         header.pack(fill=tk.X, padx=0, pady=0)
         
         self.logo_photo = None
-                                                           
-        logo_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'sejong_logo.png')
-
-        if os.path.exists(logo_path):
-            try:
-                logo_img = Image.open(logo_path)
-                                                            
-                logo_img.thumbnail((150, 300), Image.Resampling.LANCZOS)
-
-                                                        
-                padding = 4
-                card_width = logo_img.width + padding * 2
-                card_height = logo_img.height + padding * 2
-
-                                 
-                card_bg = Image.new("RGBA", (card_width, card_height), (0, 0, 0, 0))
-
-                                             
-                from PIL import ImageDraw
-                radius = 8
-                mask = Image.new("L", (card_width, card_height), 0)
-                draw = ImageDraw.Draw(mask)
-                draw.rounded_rectangle(
-                    [(0, 0), (card_width, card_height)],
-                    radius=radius,
-                    fill=255,
-                )
-
-                                  
-                card_color = (245, 247, 250, 210)
-                card_color_img = Image.new("RGBA", (card_width, card_height), card_color)
-                card_bg = Image.composite(card_color_img, card_bg, mask)
-
-                offset = ((card_width - logo_img.width) // 2, (card_height - logo_img.height) // 2)
-                card_bg.paste(logo_img, offset, logo_img if logo_img.mode == 'RGBA' else None)
-
-                self.logo_photo = ImageTk.PhotoImage(card_bg)
+        self.after_idle(self._build_logo, header)
 
-                                                                                               
-                logo_container = tk.Frame(
-                    header,
-                    bg="#2c3e50",
-                    highlightthickness=0,
-                )
-                logo_container.pack(side=tk.RIGHT, padx=24, pady=6)
-
-                logo_label = tk.Label(
-                    logo_container,
-                    image=self.logo_photo,
-                    bg="#2c3e50",
-                    bd=0,
-                    relief=tk.FLAT,
-                )
-                logo_label.pack()
-            except Exception:
-                logo_label = tk.Label(
-                    header,
-                    text="SEJONG",
-                    font=('Segoe UI', 10, 'bold'),
-                    bg='#2c3e50',
-                    fg='white',
-                    padx=10,
-                    pady=5,
-                    relief=tk.RAISED,
-                    borderwidth=2,
-                )
-                logo_label.pack(side=tk.RIGHT, padx=20, pady=5)
-        else:
-            logo_label = tk.Label(
-                header,
-                text="SEJONG",
-                font=('Segoe UI', 10, 'bold'),
-                bg='#2c3e50',
-                fg='white',
-                padx=10,
-                pady=5,
-                relief=tk.RAISED,
-                borderwidth=2,
-            )
-            logo_label.pack(side=tk.RIGHT, padx=20, pady=5)
-        
         title_label = tk.Label(header, text="🎓 Student Grade Management", font=('Segoe UI', 18, 'bold'), 
                                bg='#2c3e50', fg='white', pady=15)
         title_label.pack(side=tk.LEFT, padx=20)
@@ -262,6 +352,7 @@ class GradeApp(tk.Tk):
         search_entry = ttk.Entry(search_frame, textvariable=self.var_search, width=30, font=('Segoe UI', 10))
         search_entry.pack(side=tk.LEFT, padx=5)
         search_entry.bind('<Return>', lambda e: self._on_search())
+        self.var_search.trace_add("write", self._on_search_typed)
         
         ttk.Button(search_frame, text="🔍 Search", command=self._on_search).pack(side=tk.LEFT, padx=5)
         ttk.Button(search_frame, text="✖️ Clear", command=self._on_clear_search).pack(side=tk.LEFT, padx=5)
@@ -277,19 +368,9 @@ class GradeApp(tk.Tk):
         tree_frame = ttk.LabelFrame(self, text="  📋 Student Records  ", padding=10)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=(0, 10))
         
-        columns = ("ID", "Name", "Profile", "Total", "Average", "Grade", *DEFAULT_SUBJECTS)
-        self.tree = ttk.Treeview(tree_frame, columns=columns, show="headings")
-        
-        for col in columns:
-            self.tree.heading(col, text=col)
-            if col == "Profile":
-                self.tree.column(col, width=100, anchor=tk.CENTER)
-            elif col == "Name":
-                self.tree.column(col, width=180)
-            elif col in DEFAULT_SUBJECTS or col in ["Total", "Average", "Grade"]:
-                self.tree.column(col, width=100, anchor=tk.CENTER)
-            else:
-                self.tree.column(col, width=100)
+        self.table_subjects: List[str] = list(DEFAULT_SUBJECTS)
+        self.tree = ttk.Treeview(tree_frame, show="headings")
+        self._configure_columns()
         
         self.scrollbar_y = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
         self.scrollbar_x = ttk.Scrollbar(tree_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
@@ -307,6 +388,8 @@ class GradeApp(tk.Tk):
         
         self.tree.bind("<<TreeviewSelect>>", self._on_select)
         self.tree.bind("<Button-1>", self._on_tree_click)
+        self.virtual_table = VirtualTable(self.tree, self.scrollbar_y, self._format_row,
+                                          key=lambda s: s.student_id, on_scroll=self._on_y_scroll)
 
         stats_frame = tk.Frame(self, bg='#ecf0f1', relief=tk.RAISED, bd=1)
         stats_frame.pack(fill=tk.X, padx=15, pady=(0, 15))
@@ -328,10 +411,113 @@ class GradeApp(tk.Tk):
         credit_label.pack(side=tk.RIGHT, padx=15, pady=10)
         
         self.lbl_db_status = tk.Label(stats_frame, text=f"💾 Database: {self.db_status}", 
-                                      font=('Segoe UI', 9, 'bold'), bg='#ecf0f1', 
-                                      fg='#27ae60' if self.db_status == 'MySQL' else '#3498db')
+                                      font=('Segoe UI', 9, 'bold'), bg='#ecf0f1', fg='#7f8c8d')
         self.lbl_db_status.pack(side=tk.RIGHT, padx=15, pady=10)
 
+    def _build_logo(self, header: tk.Frame) -> None:
+        """Render the header logo card once the window is up, so Pillow stays off the startup path."""
+        logo_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'sejong_logo.png')
+
+        if os.path.exists(logo_path):
+            try:
+                from PIL import Image, ImageDraw, ImageTk
+                logo_img = Image.open(logo_path)
+                                                            
+                logo_img.thumbnail((150, 300), Image.Resampling.LANCZOS)
+
+                                                        
+                padding = 4
+                card_width = logo_img.width + padding * 2
+                card_height = logo_img.height + padding * 2
+
+                                 
+                card_bg = Image.new("RGBA", (card_width, card_height), (0, 0, 0, 0))
+
+                                             
+                radius = 8
+                mask = Image.new("L", (card_width, card_height), 0)
+                draw = ImageDraw.Draw(mask)
+                draw.rounded_rectangle(
+                    [(0, 0), (card_width, card_height)],
+                    radius=radius,
+                    fill=255,
+                )
+
+                                  
+                card_color = (245, 247, 250, 210)
+                card_color_img = Image.new("RGBA", (card_width, card_height), card_color)
+                card_bg = Image.composite(card_color_img, card_bg, mask)
+
+                offset = ((card_width - logo_img.width) // 2, (card_height - logo_img.height) // 2)
+                card_bg.paste(logo_img, offset, logo_img if logo_img.mode == 'RGBA' else None)
+
+                self.logo_photo = ImageTk.PhotoImage(card_bg)
+
+                                                                                               
+                logo_container = tk.Frame(
+                    header,
+                    bg="#2c3e50",
+                    highlightthickness=0,
+                )
+                logo_container.pack(side=tk.RIGHT, padx=24, pady=6)
+
+                logo_label = tk.Label(
+                    logo_container,
+                    image=self.logo_photo,
+                    bg="#2c3e50",
+                    bd=0,
+                    relief=tk.FLAT,
+                )
+                logo_label.pack()
+            except Exception:
+                logo_label = tk.Label(
+                    header,
+                    text="SEJONG",
+                    font=('Segoe UI', 10, 'bold'),
+                    bg='#2c3e50',
+                    fg='white',
+                    padx=10,
+                    pady=5,
+                    relief=tk.RAISED,
+                    borderwidth=2,
+                )
+                logo_label.pack(side=tk.RIGHT, padx=20, pady=5)
+        else:
+            logo_label = tk.Label(
+                header,
+                text="SEJONG",
+                font=('Segoe UI', 10, 'bold'),
+                bg='#2c3e50',
+                fg='white',
+                padx=10,
+                pady=5,
+                relief=tk.RAISED,
+                borderwidth=2,
+            )
+            logo_label.pack(side=tk.RIGHT, padx=20, pady=5)
+
+    def _configure_columns(self) -> None:
+        """(Re)build the table columns for the current subject list."""
+        columns = ("ID", "Name", "Profile", "Total", "Average", "Grade", *self.table_subjects)
+        self.tree.configure(columns=columns)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            if col == "Profile":
+                self.tree.column(col, width=100, anchor=tk.CENTER)
+            elif col == "Name":
+                self.tree.column(col, width=180)
+            elif col in self.table_subjects or col in ["Total", "Average", "Grade"]:
+                self.tree.column(col, width=100, anchor=tk.CENTER)
+            else:
+                self.tree.column(col, width=100)
+
+    def _sync_subject_columns(self) -> None:
+        """Add columns for subjects registered by imports since the last refresh."""
+        subjects = self.manager.subjects()
+        if subjects != self.table_subjects:
+            self.table_subjects = subjects
+            self._configure_columns()
+
     def _focus_next(self) -> None:
         """Focus next field."""
         if DEFAULT_SUBJECTS:
@@ -358,6 +544,11 @@ class GradeApp(tk.Tk):
                 else:
                     marks[subj] = 0.0
             
+            existing = self._student(sid)
+            if existing:
+                for subj, mark in existing.marks_by_subject.items():
+                    marks.setdefault(subj, mark)
+            
                                 
             validate_marks(marks.values())
             
@@ -367,15 +558,23 @@ class GradeApp(tk.Tk):
             raise ValueError(f"Validation error: {str(e)}")
 
     def _on_add_update(self) -> None:
+        if not self._roster_ready(paged_ok=True):
+            return
         try:
             student = self._collect_student_from_form()
-            existing = self.manager.get(student.student_id)
-            self.manager.add_or_update(student)
-            self._refresh_table()
-            try:
-                save_students(self.manager.list_students())
-            except Exception:
-                pass
+            existing = self._student(student.student_id)
+            if self.paged_rows is not None:
+                from .db import insert_student
+                if not insert_student(student.student_id, student.name, student.marks_by_subject,
+                                      student.content_hash()):
+                    raise IOError("Failed to write the student to the database.")
+                self._paged_stats_stale = True
+                self._refresh_table()
+            elif self.manager.add_or_update(student):
+                try:
+                    save_students(self.manager.list_students())
+                except Exception:
+                    pass
             
             if existing:
                 messagebox.showinfo("✅ Success", f"Student '{student.name}' updated successfully!")
@@ -388,6 +587,8 @@ class GradeApp(tk.Tk):
 
     def _on_delete(self) -> None:
         """Handle delete button click."""
+        if not self._roster_ready(paged_ok=True):
+            return
         sid = self.var_id.get().strip()
         if not sid:
             messagebox.showwarning("Warning", "Enter an ID to delete.")
@@ -398,8 +599,16 @@ class GradeApp(tk.Tk):
             messagebox.showerror("Error", str(e))
             return
         
-        if self.manager.delete(sid):
-            self._refresh_table()
+        if self.paged_rows is not None:
+            from .db import delete_student
+            if self._student(sid) is not None and delete_student(sid):
+                self._clear_form()
+                self._paged_stats_stale = True
+                self._refresh_table()
+                messagebox.showinfo("Success", "Student deleted successfully.")
+            else:
+                messagebox.showinfo("Info", "Student not found.")
+        elif self.manager.delete(sid):
             self._clear_form()
                        
             try:
@@ -412,6 +621,11 @@ class GradeApp(tk.Tk):
 
     def _on_save(self) -> None:
         """Handle save button click."""
+        if not self._roster_ready(paged_ok=True):
+            return
+        if self.paged_rows is not None:
+            messagebox.showinfo("Saved", "Changes are written to the database as you make them.")
+            return
         try:
             save_students(self.manager.list_students())
             messagebox.showinfo("Saved", "Students saved successfully.")
@@ -420,164 +634,225 @@ class GradeApp(tk.Tk):
 
     def _on_reload(self) -> None:
         """Handle reload button click."""
-        try:
-            self.manager = StudentManager(load_students())
-            self._refresh_table()
-            self._clear_form()
-            messagebox.showinfo("Reloaded", "Data reloaded from file.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to reload: {str(e)}")
+        if self.import_job is not None:
+            messagebox.showinfo("Info", "An import is running. Please wait for it to finish.")
+            return
+        self._cancel_roster_load()
+        self._unsubscribe()
+        self.manager = StudentManager([])
+        self._unsubscribe = self.manager.subscribe(self._on_roster_change)
+        self._sorted_cache = None
+        self._search_results = None
+        self.paged_rows = None
+        self.photo_loader.forget()
+        self._refresh_table()
+        self._clear_form()
+        self._start_roster_load(notify=True)
 
     def _on_search(self) -> None:
         """Handle search button click."""
-        q = self.var_search.get().strip()
-        if not q:
-            self._refresh_table()
-            return
-        self._populate_table(self.manager.search(q))
-        self._update_stats()
+        self._cancel_search()
+        self._refresh_table()
 
     def _on_clear_search(self) -> None:
         """Handle clear search button click."""
         self.var_search.set("")
-        self._refresh_table()
+        self._on_search()
+
+    def _on_search_typed(self, *_args) -> None:
+        """Restart the debounce timer; any filtering still in flight becomes stale."""
+        self._cancel_search()
+        delay = SEARCH_DEBOUNCE_MS if self.paged_rows is None else PAGED_SEARCH_DEBOUNCE_MS
+        self._search_after = self.after(delay, self._start_search)
+
+    def _cancel_search(self) -> None:
+        self._search_generation += 1
+        if self._search_after is not None:
+            self.after_cancel(self._search_after)
+            self._search_after = None
+
+    def _start_search(self) -> None:
+        """Filter the previous results when the text was extended, otherwise the sorted roster."""
+        self._search_after = None
+        if self.paged_rows is not None:
+            self._refresh_table()
+            return
+        text = self.var_search.get().strip().lower()
+        previous = self._search_results
+        if (previous is not None and previous[0] == self.manager.version and previous[1] == self.var_sort.get()
+                and previous[2] and narrows(previous[2], text)):
+            rows, keys = previous[3], previous[4]
+        else:
+            rows, keys = self._sorted_roster()
+        if not text:
+            self._show_search_results(text, rows, keys)
+            return
+        self._filter_chunk(self._search_generation, text, rows, keys, 0, [], [])
+
+    def _filter_chunk(self, generation: int, text: str, rows: List[Student], keys: List[str], start: int,
+                      matched_rows: List[Student], matched_keys: List[str]) -> None:
+        """Filter a slice at a time so a newer keystroke can cancel the search."""
+        if generation != self._search_generation:
+            return
+        end = start + SEARCH_CHUNK_ROWS
+        match = text_matcher(text)
+        for student, key in zip(rows[start:end], keys[start:end]):
+            if match(key):
+                matched_rows.append(student)
+                matched_keys.append(key)
+        if end < len(rows):
+            self._search_after = self.after_idle(self._filter_chunk, generation, text, rows, keys, end,
+                                                 matched_rows, matched_keys)
+        else:
+            self._search_after = None
+            self._show_search_results(text, matched_rows, matched_keys)
+
+    def _show_search_results(self, text: str, rows: List[Student], keys: List[str]) -> None:
+        self._pending_events = []
+        self._sync_subject_columns()
+        self._table_view = self._table_query()
+        self._populate_table(rows)
+        self._search_results = (self.manager.version, self.var_sort.get(), text, rows, keys)
+        self._update_stats()
+
+    def _sorted_roster(self) -> Tuple[List[Student], List[str]]:
+        """The whole roster in table order with its search keys, re-sorted only after a change."""
+        cache_key = (self.manager.version, self.var_sort.get())
+        if self._sorted_cache is None or self._sorted_cache[0] != cache_key:
+            self._sorted_cache = (cache_key, list(self._table_query(search=False)), None)
+        if self._sorted_cache[2] is None:
+            rows = self._sorted_cache[1]
+            self._sorted_cache = (cache_key, rows, self.manager.search_keys(rows))
+        return self._sorted_cache[1], self._sorted_cache[2]
 
     def _on_import_json(self) -> None:
         """Import students from JSON file."""
-        try:
-            filename = filedialog.askopenfilename(
-                title="Select JSON File",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
-            )
-            if not filename:
-                return
-            
-                                  
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            if not isinstance(data, list):
-                messagebox.showerror("Error", "Invalid JSON format: File should contain a list of students.")
-                return
-            
-            imported_count = 0
-            skipped_count = 0
-            errors = []
-            
-            for idx, item in enumerate(data, 1):
-                try:
-                    student = Student.from_dict(item)
-                                           
-                    validate_student_id(student.student_id)
-                    validate_student_name(student.name)
-                    validate_marks(student.marks_by_subject.values())
-                    
-                                                          
-                    existing = self.manager.get(student.student_id)
-                    if existing:
-                                         
-                        self.manager.add_or_update(student)
-                        imported_count += 1
-                    else:
-                                 
-                        self.manager.add_or_update(student)
-                        imported_count += 1
-                        
-                except Exception as e:
-                    skipped_count += 1
-                    errors.append(f"Row {idx}: {str(e)}")
-            
-            if errors:
-                msg = f"Imported {imported_count} student(s).\nSkipped {skipped_count} record(s) with errors."
-                if len(errors) <= 5:
-                    msg += "\n\nErrors:\n" + "\n".join(errors)
-                else:
-                    msg += f"\n\n{len(errors)} errors occurred (showing first 5):\n" + "\n".join(errors[:5])
-                messagebox.showwarning("Partial Import", msg)
-            else:
-                messagebox.showinfo("Success", f"Successfully imported {imported_count} student(s).")
-            
-            self._refresh_table()
-            try:
-                save_students(self.manager.list_students())
-            except Exception:
-                pass
-                
-        except json.JSONDecodeError as e:
-            messagebox.showerror("Error", f"Invalid JSON file: {str(e)}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import: {str(e)}")
+        filename = filedialog.askopenfilename(
+            title="Select JSON File",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        from .importers import iter_json_batches
+        self._start_import(iter_json_batches(filename), filename, "Importing JSON")
 
     def _on_import_csv(self) -> None:
         """Import students from CSV file."""
+        filename = filedialog.askopenfilename(
+            title="Select CSV File",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        from .importers import iter_csv_batches
+        self._start_import(iter_csv_batches(filename, DEFAULT_SUBJECTS), filename, "Importing CSV")
+
+    def _on_import_long(self) -> None:
+        """Import one-mark-per-row (student, subject, mark) files with any set of subjects."""
+        filename = filedialog.askopenfilename(
+            title="Select Long-format Marks File",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines", "*.jsonl *.ndjson"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        from .importers import iter_long_batches
+        self._start_import(iter_long_batches(filename, existing=self.manager.get), filename, "Importing Marks")
+
+    def _start_import(self, batches: Iterator[ImportBatch], filename: str, title: str) -> None:
+        """Run an import pipeline on a worker thread and feed its batches into the manager."""
+        from .importers import ImportJob
+        from .windows import ImportProgressWindow
+
+        if not self._roster_ready():
+            return
+        if self.import_job is not None:
+            messagebox.showinfo("Info", "An import is already running.")
+            return
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        log_path = os.path.join(DEFAULT_DATA_DIR, "logs", f"import_{stamp}.log")
         try:
-            filename = filedialog.askopenfilename(
-                title="Select CSV File",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            total_bytes = os.path.getsize(filename)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to import: {str(e)}")
+            return
+        self.import_job = ImportJob(batches, total_bytes, log_path)
+        self.import_window = ImportProgressWindow(self, title, self._on_cancel_import)
+        self._import_stats = {"imported": 0, "unchanged": 0, "skipped": 0, "rows": 0, "bytes": 0, "started": time.perf_counter()}
+        self.import_job.start()
+        self.after(IMPORT_POLL_MS, self._poll_import)
+
+    def _on_cancel_import(self) -> None:
+        if self.import_job is not None:
+            self.import_job.cancel()
+            self.import_window.set_cancelling()
+
+    def _poll_import(self) -> None:
+        job = self.import_job
+        if job is None:
+            return
+        batches, done = job.drain()
+        stats = self._import_stats
+        for batch in batches:
+            if job.cancelled:
+                break
+            students = self._merge_marks(batch.students) if batch.merge_marks else batch.students
+            event = self.manager.bulk_import(students)
+            stats["imported"] += len(event)
+            stats["unchanged"] += event.unchanged
+            stats["skipped"] += batch.skipped
+            stats["rows"] += batch.rows
+            stats["bytes"] = batch.bytes_done
+        elapsed = max(time.perf_counter() - stats["started"], 1e-6)
+        self.import_window.update_progress(stats["bytes"] / job.total_bytes, stats["rows"],
+                                           stats["rows"] / elapsed, job.error_count)
+        if done:
+            self._finish_import()
+        else:
+            self.after(IMPORT_POLL_MS, self._poll_import)
+
+    def _merge_marks(self, students: List[Student]) -> List[Student]:
+        """Add imported subjects to the current records, keeping marks for subjects the file does not mention."""
+        merged = []
+        for student in students:
+            current = self.manager.get(student.student_id)
+            if current is not None:
+                student = Student(student_id=student.student_id, name=student.name,
+                                  marks_by_subject={**current.marks_by_subject, **student.marks_by_subject})
+            merged.append(student)
+        return merged
+
+    def _finish_import(self) -> None:
+        job = self.import_job
+        stats = self._import_stats
+        self.import_job = None
+        self.import_window.destroy()
+        self.import_window = None
+        
+        if job.error is not None:
+            messagebox.showerror("Error", f"Failed to import: {str(job.error)}")
+        elif job.cancelled:
+            messagebox.showwarning("Import Cancelled",
+                                   f"Import cancelled after {stats['imported']} student(s) were imported.")
+        elif job.error_count:
+            messagebox.showwarning(
+                "Partial Import",
+                f"Imported {stats['imported']} student(s).\nSkipped {stats['skipped']} record(s) with errors.\n\n"
+                f"{job.error_count} error(s) were written to:\n{job.error_log_path}"
             )
-            if not filename:
-                return
-            
-            imported_count = 0
-            skipped_count = 0
-            errors = []
-            
-            with open(filename, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                                 
-                expected_cols = ["ID", "Name"] + list(DEFAULT_SUBJECTS)
-                if not all(col in reader.fieldnames for col in expected_cols):
-                    missing = [col for col in expected_cols if col not in (reader.fieldnames or [])]
-                    messagebox.showerror("Error", f"Invalid CSV format. Missing columns: {', '.join(missing)}")
-                    return
-                
-                for idx, row in enumerate(reader, 1):
-                    try:
-                                             
-                        sid = row.get("ID", "").strip()
-                        name = row.get("Name", "").strip()
-                        
-                        validate_student_id(sid)
-                        validate_student_name(name)
-                        
-                                       
-                        marks = {}
-                        for subj in DEFAULT_SUBJECTS:
-                            mark_str = row.get(subj, "0").strip()
-                            marks[subj] = validate_float_input(mark_str, f"{subj} marks") if mark_str else 0.0
-                        
-                        validate_marks(marks.values())
-                        
-                        student = Student(student_id=sid, name=name, marks_by_subject=marks)
-                        self.manager.add_or_update(student)
-                        imported_count += 1
-                        
-                    except Exception as e:
-                        skipped_count += 1
-                        errors.append(f"Row {idx}: {str(e)}")
-            
-            if errors:
-                msg = f"Imported {imported_count} student(s).\nSkipped {skipped_count} record(s) with errors."
-                if len(errors) <= 5:
-                    msg += "\n\nErrors:\n" + "\n".join(errors)
-                else:
-                    msg += f"\n\n{len(errors)} errors occurred (showing first 5):\n" + "\n".join(errors[:5])
-                messagebox.showwarning("Partial Import", msg)
-            else:
-                messagebox.showinfo("Success", f"Successfully imported {imported_count} student(s).")
-            
-            self._refresh_table()
+        else:
+            messagebox.showinfo("Success", f"Successfully imported {stats['imported']} student(s).\n"
+                                           f"{stats['unchanged']} unchanged record(s) were skipped.")
+        
+        if stats["imported"]:
             try:
                 save_students(self.manager.list_students())
             except Exception:
                 pass
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import CSV: {str(e)}")
 
     def _on_export_csv(self) -> None:
         """Export data to CSV file."""
+        if not self._roster_ready():
+            return
         try:
             filename = filedialog.asksaveasfilename(
                 defaultextension=".csv",
@@ -589,7 +864,8 @@ class GradeApp(tk.Tk):
             with open(filename, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                               
-                writer.writerow(["ID", "Name", "Total", "Average", "Grade"] + list(DEFAULT_SUBJECTS))
+                subjects = self.manager.subjects()
+                writer.writerow(["ID", "Name", "Total", "Average", "Grade"] + subjects)
                             
                 for student in self.manager.list_students():
                     avg = student.average()
@@ -601,30 +877,106 @@ class GradeApp(tk.Tk):
                         f"{avg:.2f}",
                         grade
                     ]
-                    row.extend(str(student.marks_by_subject.get(subj, 0)) for subj in DEFAULT_SUBJECTS)
+                    row.extend(str(student.marks_by_subject.get(subj, 0)) for subj in subjects)
                     writer.writerow(row)
             
             messagebox.showinfo("Success", f"Data exported to {filename}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export: {str(e)}")
 
+    def _on_export_parquet(self) -> None:
+        """Export the roster and long-format marks as Parquet files."""
+        from .columnar import export_roster
+
+        if not self._roster_ready():
+            return
+        try:
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".parquet",
+                filetypes=[("Parquet files", "*.parquet"), ("All files", "*.*")]
+            )
+            if not filename:
+                return
+            
+            long_path = os.path.splitext(filename)[0] + "_marks.parquet"
+            counts = export_roster(self.manager.list_students(), filename, self.manager.subjects(),
+                                   long_path=long_path)
+            messagebox.showinfo("Success", f"Exported {counts['students']} student(s) to {filename}\n"
+                                           f"and {counts['marks']} mark(s) to {long_path}")
+        except ImportError as e:
+            messagebox.showerror("Error", str(e))
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export: {str(e)}")
+
+    def _on_generate_reports(self) -> None:
+        """Render report cards and cohort summaries in the background."""
+        from .db import get_profiles
+        from .reports import generate_reports
+        
+        if not self._roster_ready():
+            return
+        if self.manager.count_students() == 0:
+            messagebox.showinfo("Info", "No students to generate reports for.")
+            return
+        output_dir = filedialog.askdirectory(title="Select report output folder")
+        if not output_dir:
+            return
+        
+        students = self.manager.list_students()
+        outcome: Dict[str, object] = {}
+        
+        def run() -> None:
+            try:
+                outcome["summary"] = generate_reports(students, output_dir, get_profiles())
+            except Exception as e:
+                outcome["error"] = e
+        
+        worker = threading.Thread(target=run, name="report-generator", daemon=True)
+        worker.start()
+        self.config(cursor="watch")
+        self.after(200, self._poll_reports, worker, outcome)
+
+    def _poll_reports(self, worker: threading.Thread, outcome: Dict[str, object]) -> None:
+        """Report the result of a background report run once it finishes."""
+        if worker.is_alive():
+            self.after(200, self._poll_reports, worker, outcome)
+            return
+        self.config(cursor="")
+        if "error" in outcome:
+            messagebox.showerror("Error", f"Failed to generate reports: {outcome['error']}")
+            return
+        summary = outcome["summary"]
+        messagebox.showinfo("Reports Generated",
+                            f"Rendered {summary.rendered} report card(s) and {summary.cohorts} cohort summary(ies).\n"
+                            f"Skipped {summary.skipped} unchanged student(s).\n\nOutput: {summary.output_dir}")
+
     def _show_statistics(self) -> None:
         """Show detailed statistics window."""
+        from .windows import StatisticsWindow
+
+        if not self._roster_ready():
+            return
         if self.manager.count_students() == 0:
             messagebox.showinfo("Info", "No students to display statistics.")
             return
         StatisticsWindow(self, self.manager)
     
+    def _show_diagnostics(self) -> None:
+        """Show query, storage and cache metrics for this session."""
+        from .windows import DiagnosticsWindow
+        DiagnosticsWindow(self)
+    
     def _show_profile(self, student_id: str) -> None:
         """Show student profile window."""
         from .db import get_profile
+        from .windows import ProfileWindow
         
         if self.profile_window and self.profile_window.winfo_exists():
             self.profile_window.lift()
             messagebox.showinfo("Info", "A profile window is already open. Please close it first.")
             return
         
-        student = self.manager.get(student_id)
+        student = self._student(student_id)
         if not student:
             messagebox.showerror("Error", f"Student {student_id} not found.")
             return
@@ -652,9 +1004,12 @@ class GradeApp(tk.Tk):
         if not values:
             return
         sid = values[0]
-        student = self.manager.get(sid)
+        if sid == self._selected_sid:
+            return
+        student = self._student(sid)
         if not student:
             return
+        self._selected_sid = sid
         self.var_id.set(student.student_id)
         self.var_name.set(student.name)
         for subj in DEFAULT_SUBJECTS:
@@ -662,29 +1017,58 @@ class GradeApp(tk.Tk):
         self._update_profile_photo(sid)
     
     def _update_profile_photo(self, student_id: str) -> None:
-        """Update the profile photo display."""
-        from .db import get_profile
-        profile_data = get_profile(student_id)
+        """Show the student's photo, loading it and its table neighbours' in the background."""
+        self._photo_sid = student_id
+        wanted = [sid for sid in [student_id, *self._neighbor_ids(student_id)] if sid in self.profile_ids]
+        self.photo_loader.cancel_all(keep=[(sid, MAIN_PHOTO_SIZE) for sid in wanted])
+        if student_id not in self.profile_ids:
+            self._show_profile_photo(None)
+            return
         
-        if profile_data and profile_data.get('photo_path'):
-            photo_path = profile_data.get('photo_path')
-            if os.path.exists(photo_path):
-                try:
-                    img = Image.open(photo_path)
-                    img = img.resize((100, 100), Image.Resampling.LANCZOS)
-                    self.current_profile_photo = ImageTk.PhotoImage(img)
-                    
-                    if not self.profile_photo_label:
-                        photo_frame = tk.Frame(self.photo_container, bg='white', relief=tk.SOLID, bd=1)
-                        photo_frame.pack(pady=5)
-                        
-                        self.profile_photo_label = tk.Label(photo_frame, bg='white')
-                        self.profile_photo_label.pack(padx=5, pady=5)
-                    
-                    self.profile_photo_label.config(image=self.current_profile_photo)
-                    return
-                except Exception:
-                    pass
+        photo = self.photo_loader.cached(student_id, MAIN_PHOTO_SIZE)
+        if photo is not None:
+            self._show_profile_photo(photo)
+        else:
+            self.photo_loader.request(student_id, MAIN_PHOTO_SIZE,
+                                      lambda p, sid=student_id: self._on_photo_loaded(sid, p))
+        for sid in wanted[1:]:
+            self.photo_loader.request(sid, MAIN_PHOTO_SIZE)
+
+    def _neighbor_ids(self, student_id: str) -> List[str]:
+        """IDs of the rows just above and below a student in the table, nearest first."""
+        if self.paged_rows is not None:
+            rows = self.paged_rows
+            index = rows.index_of(student_id)
+        else:
+            student = self.manager.get(student_id)
+            rows = self._table_rows
+            index = self._table_position(student) if student is not None and self._table_view is not None else None
+        if index is None:
+            return []
+        ids = []
+        for distance in range(1, PHOTO_PREFETCH_ROWS + 1):
+            for i in (index + distance, index - distance):
+                if 0 <= i < len(rows):
+                    ids.append(rows[i].student_id)
+        return ids
+
+    def _on_photo_loaded(self, student_id: str, photo) -> None:
+        if student_id == self._photo_sid:
+            self._show_profile_photo(photo)
+
+    def _show_profile_photo(self, photo) -> None:
+        """Update the profile photo display."""
+        if photo is not None:
+            self.current_profile_photo = photo
+            if not self.profile_photo_label:
+                photo_frame = tk.Frame(self.photo_container, bg='white', relief=tk.SOLID, bd=1)
+                photo_frame.pack(pady=5)
+                
+                self.profile_photo_label = tk.Label(photo_frame, bg='white')
+                self.profile_photo_label.pack(padx=5, pady=5)
+            
+            self.profile_photo_label.config(image=self.current_profile_photo)
+            return
         
         if self.profile_photo_label:
             self.profile_photo_label.master.pack_forget()
@@ -730,6 +1114,8 @@ class GradeApp(tk.Tk):
 
     def _clear_form(self) -> None:
         """Clear all form fields."""
+        self._selected_sid = None
+        self._photo_sid = None
         self.var_id.set("")
         self.var_name.set("")
         for var in self.subject_vars.values():
@@ -739,49 +1125,231 @@ class GradeApp(tk.Tk):
             self.profile_photo_label = None
         self.current_profile_photo = None
 
+    def _on_roster_change(self, event: ChangeEvent) -> None:
+        """Coalesce manager change events into one table update per idle cycle."""
+        self._pending_events.append(event)
+        if self._refresh_pending is None:
+            self._refresh_pending = self.after_idle(self._flush_roster_changes)
+
+    def _flush_roster_changes(self) -> None:
+        self._refresh_pending = None
+        events, self._pending_events = self._pending_events, []
+        changes = sum(len(e) if isinstance(e, StudentsImported) else 1 for e in events)
+        if (self._table_view is None or changes > INCREMENTAL_REFRESH_LIMIT
+                or self.manager.subjects() != self.table_subjects):
+            self._refresh_table()
+            return
+        for event in events:
+            if isinstance(event, StudentAdded):
+                self._table_upsert(None, event.student)
+            elif isinstance(event, StudentUpdated):
+                self._table_upsert(event.old, event.new)
+            elif isinstance(event, StudentDeleted):
+                self._table_remove(event.student)
+            elif isinstance(event, StudentsImported):
+                for student in event.added:
+                    self._table_upsert(None, student)
+                for old, new in event.updated:
+                    self._table_upsert(old, new)
+        if (len(self._table_rows) > VIRTUAL_TABLE_THRESHOLD) != self.virtual_table.active:
+            self._refresh_table()
+            return
+        if self._search_results is not None and not self._search_results[2]:
+            self._sorted_cache = ((self.manager.version, self.var_sort.get()), list(self._table_rows), None)
+        self.virtual_table.render()
+        self._update_stats()
+
     def _refresh_table(self) -> None:
         """Refresh table with current data."""
-        self._populate_table(self.manager.list_students())
+        if self.paged_rows is not None:
+            self._refresh_paged_table()
+            return
+        text = self.var_search.get().strip().lower()
+        rows, keys = self._sorted_roster()
+        if text:
+            match = text_matcher(text)
+            matched = [i for i, key in enumerate(keys) if match(key)]
+            rows, keys = [rows[i] for i in matched], [keys[i] for i in matched]
+        self._show_search_results(text, rows, keys)
+
+    def _refresh_paged_table(self) -> None:
+        """Point the virtual table at a fresh database query for the current sort and search."""
+        from .paging import PagedRoster
+        self._pending_events = []
+        self._sync_subject_columns()
+        self._table_view = None
+        self._table_rows = []
+        self._table_cells = {}
+        self.paged_rows = PagedRoster(self._table_query())
+        self.virtual_table.activate()
+        self.virtual_table.set_rows(self.paged_rows)
         self._update_stats()
 
-    def _populate_table(self, students: List[Student]) -> None:
-        """Populate table with student data."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-                       
+    def _student(self, student_id: str) -> Optional[Student]:
+        """Look a student up in memory or, in paged mode, on the cached pages and then in the database."""
+        student = self.manager.get(student_id)
+        if student is None and self.paged_rows is not None:
+            student = self.paged_rows.get(student_id)
+            if student is None:
+                from .db import get_student
+                item = get_student(student_id)
+                student = Student.from_dict(item) if item else None
+        return student
+
+    def _table_position(self, student: Student) -> Optional[int]:
+        """Index of ``student`` (as last displayed) in the table rows, or None."""
+        rows = self._table_rows
+        index = bisect_left(rows, self._table_view.sort_key()(student), key=self._table_view.sort_key())
+        if index < len(rows) and rows[index].student_id == student.student_id:
+            return index
+        for index, row in enumerate(rows):
+            if row.student_id == student.student_id:
+                return index
+        return None
+
+    def _table_remove(self, student: Student) -> Optional[int]:
+        index = self._table_position(student)
+        if index is None:
+            return None
+        del self._table_rows[index]
+        if not self.virtual_table.active:
+            self.tree.delete(student.student_id)
+            self._table_cells.pop(student.student_id, None)
+        return index
+
+    def _table_upsert(self, old: Optional[Student], new: Student) -> None:
+        """Move, update, insert or drop one row so the table matches the query order."""
+        if not self._table_view.matches(new):
+            if old is not None:
+                self._table_remove(old)
+            return
+        old_index = self._table_position(old) if old is not None else None
+        if old_index is not None:
+            del self._table_rows[old_index]
+        sort_key = self._table_view.sort_key()
+        index = bisect_left(self._table_rows, sort_key(new), key=sort_key)
+        self._table_rows.insert(index, new)
+        if self.virtual_table.active:
+            return
+        sid = new.student_id
+        cells = self._format_row(new)
+        if old_index is None:
+            self.tree.insert("", index, iid=sid, values=cells[0], tags=cells[1])
+        else:
+            if index != old_index:
+                self.tree.move(sid, "", index)
+            if self._table_cells.get(sid) != cells:
+                self.tree.item(sid, values=cells[0], tags=cells[1])
+        self._table_cells[sid] = cells
+
+    def _table_query(self, search: bool = True) -> StudentQuery:
+        """Build the query behind the table from the sort and search controls."""
+        query = self.manager.query() if self.paged_rows is None else StudentQuery.database()
+        q = self.var_search.get().strip() if search else ""
+        if q:
+            query = query.search(q)
         sort_by = self.var_sort.get()
         if sort_by == "Name":
-            students.sort(key=lambda s: s.name)
+            query = query.order_by("name")
         elif sort_by == "ID":
-            students.sort(key=lambda s: s.student_id)
+            query = query.order_by("student_id")
         elif sort_by == "Average":
-            students.sort(key=lambda s: s.average(), reverse=True)
+            query = query.order_by("average", descending=True)
         elif sort_by == "Total":
-            students.sort(key=lambda s: s.total(), reverse=True)
+            query = query.order_by("total", descending=True)
+        return query
+
+    def _populate_table(self, students: Iterable[Student]) -> None:
+        """Populate table with student data, touching only rows that changed."""
+        rows = list(students)
+        self._table_rows = rows
+        if len(rows) > VIRTUAL_TABLE_THRESHOLD:
+            self._table_cells = {}
+            self.virtual_table.activate()
+            self.virtual_table.set_rows(rows)
+            return
         
-        for s in students:
-            avg = s.average()
-            grade = compute_grade(avg, DEFAULT_GRADE_SCALE)
-            
-            total_str = f"{s.total():.1f}"
-            avg_str = f"{avg:.1f}"
-            
-            from .db import get_profile
-            profile_exists = get_profile(s.student_id) is not None
-            profile_text = "View" if profile_exists else ""
-            
-            row = [s.student_id, s.name, profile_text, total_str, avg_str, grade]
-            row.extend(str(int(s.marks_by_subject.get(subj, 0))) for subj in DEFAULT_SUBJECTS)
-            
-            item = self.tree.insert("", tk.END, values=row, tags=(f"grade_{grade}",))
-            
-            self.tree.set(item, "Grade", grade)
+        self.virtual_table.deactivate()
+        cells = self._table_cells
+        wanted = [s.student_id for s in rows]
+        keep = set(wanted)
+        stale = [iid for iid in self.tree.get_children() if iid not in keep]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                cells.pop(iid, None)
+        
+        for s in rows:
+            sid = s.student_id
+            row = self._format_row(s)
+            if sid not in cells:
+                self.tree.insert("", tk.END, iid=sid, values=row[0], tags=row[1])
+            elif cells[sid] != row:
+                self.tree.item(sid, values=row[0], tags=row[1])
+            cells[sid] = row
+        
+        current = self.tree.get_children()
+        if list(current) != wanted:
+            self._reorder_table(current, wanted)
+
+    def _reorder_table(self, current: Sequence[str], wanted: List[str]) -> None:
+        """Move only rows outside the longest already-ordered run; a full re-sort is one ``set_children``."""
+        position = {iid: i for i, iid in enumerate(current)}
+        sequence = [position[iid] for iid in wanted]
+        tails: List[int] = []
+        tail_index: List[int] = []
+        previous = [-1] * len(sequence)
+        for i, value in enumerate(sequence):
+            j = bisect_left(tails, value)
+            if j == len(tails):
+                tails.append(value)
+                tail_index.append(i)
+            else:
+                tails[j] = value
+                tail_index[j] = i
+            previous[i] = tail_index[j - 1] if j else -1
+        in_order = set()
+        i = tail_index[-1] if tail_index else -1
+        while i >= 0:
+            in_order.add(i)
+            i = previous[i]
+        moved = [i for i in range(len(wanted)) if i not in in_order]
+        if len(moved) > REORDER_MOVE_LIMIT:
+            self.tree.set_children("", *wanted)
+        elif moved:
+            self.tree.detach(*(wanted[i] for i in moved))
+            for i in moved:
+                self.tree.move(wanted[i], "", i)
+
+    def _format_row(self, s: Student) -> Tuple[Sequence[str], Tuple[str, ...]]:
+        """Table cells and tags for one student."""
+        avg = s.average()
+        grade = compute_grade(avg, DEFAULT_GRADE_SCALE)
+        profile_text = "View" if s.student_id in self.profile_ids else ""
+        row = [s.student_id, s.name, profile_text, f"{s.total():.1f}", f"{avg:.1f}", grade]
+        row.extend(str(int(s.marks_by_subject.get(subj, 0))) for subj in self.table_subjects)
+        return row, (f"grade_{grade}",)
 
     def _update_stats(self) -> None:
+        if self.paged_rows is not None:
+            self._update_paged_stats()
+            return
         avg = self.manager.class_average()
         self.lbl_class_avg.config(text=f"📈 Class Average: {avg:.2f}%")
         top = self.manager.top_performers(3)
         top_txt = ", ".join(f"{s.name} ({s.average():.1f}%)" for s in top) if top else "-"
         self.lbl_top.config(text=f"🏆 Top Performers: {top_txt}")
-        self.lbl_total.config(text=f"👥 Total Students: {self.manager.count_students()}")
+        loading = " (loading...)" if self.roster_job is not None else ""
+        self.lbl_total.config(text=f"👥 Total Students: {self.manager.count_students()}{loading}")
+
+    def _update_paged_stats(self) -> None:
+        """Summary labels from SQL aggregates, recomputed only after the database was written to."""
+        if not self._paged_stats_stale:
+            return
+        from .db import class_average
+        self._paged_stats_stale = False
+        self.lbl_class_avg.config(text=f"📈 Class Average: {class_average():.2f}%")
+        top = list(StudentQuery.database().order_by("average", descending=True).limit(3))
+        top_txt = ", ".join(f"{s.name} ({s.average():.1f}%)" for s in top) if top else "-"
+        self.lbl_top.config(text=f"🏆 Top Performers: {top_txt}")
+        self.lbl_total.config(text=f"👥 Total Students: {StudentQuery.database().count()}")
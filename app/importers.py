@@ -0,0 +1,527 @@
+from __future__ import annotations
+import csv
+import io
+import json
+import os
+import queue
+import tempfile
+import threading
+import zlib
+from collections import deque
+from itertools import islice
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from . import DEFAULT_SUBJECTS
+from .grading import ValidationIssue, validate_columns, validate_long_columns, validate_records
+from .manager import StudentManager
+from .models import Student
+
+CHUNK_BYTES = 4 * 1024 * 1024
+PARALLEL_THRESHOLD_BYTES = 2 * CHUNK_BYTES
+JSON_BATCH_ROWS = 5000
+# Read-ahead, in chunks, allowed for one JSON record before it is treated as malformed.
+JSON_RECORD_CHUNKS = 4
+LONG_BUFFER_ROWS = 2_000_000
+LONG_PARTITIONS = 16
+LONG_FORMAT_COLUMNS = {
+    "student_id": ("id", "student_id", "student id"),
+    "name": ("name", "student_name"),
+    "subject": ("subject",),
+    "marks": ("marks", "mark", "score"),
+}
+
+Record = Tuple[int, str, str, Dict[str, float]]
+_MALFORMED = object()
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    skipped: int = 0
+    unchanged: int = 0
+    issues: List[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> List[str]:
+        return [str(issue) for issue in self.issues]
+
+def read_csv_header(path: str) -> Tuple[List[str], int]:
+    with open(path, "rb") as f:
+        line = f.readline()
+        offset = f.tell()
+    header = next(csv.reader([line.decode("utf-8-sig")]), [])
+    return [col.strip() for col in header], offset
+
+def column_positions(header: Sequence[str], subjects: Sequence[str]) -> Dict[str, int]:
+    expected = ["ID", "Name"] + list(subjects)
+    missing = [col for col in expected if col not in header]
+    if missing:
+        raise ValueError(f"Invalid CSV format. Missing columns: {', '.join(missing)}")
+    return {col: list(header).index(col) for col in expected}
+
+def chunk_ranges(path: str, start: int, chunk_bytes: int = CHUNK_BYTES) -> List[Tuple[int, int]]:
+    """Split ``path`` from ``start`` into byte ranges that each end on a line boundary."""
+    size = os.path.getsize(path)
+    ranges: List[Tuple[int, int]] = []
+    with open(path, "rb") as f:
+        begin = start
+        while begin < size:
+            f.seek(min(begin + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = min(f.tell(), size)
+            ranges.append((begin, end))
+            begin = end
+    return ranges
+
+def parse_rows(rows: Sequence[Sequence[str]], positions: Dict[str, int], subjects: Sequence[str],
+               start_row: int = 1) -> Tuple[List[Record], List[ValidationIssue]]:
+    columns = {col: [row[pos] if pos < len(row) else "" for row in rows] for col, pos in positions.items()}
+    report = validate_columns(columns["ID"], columns["Name"], {subj: columns[subj] for subj in subjects}, start_row)
+    return report.records, report.issues
+
+def _parse_range(args: Tuple[str, int, int, Dict[str, int], Sequence[str]]) -> Tuple[int, List[Record], List[ValidationIssue]]:
+    path, begin, end, positions, subjects = args
+    with open(path, "rb") as f:
+        f.seek(begin)
+        data = f.read(end - begin)
+    rows = [row for row in csv.reader(io.StringIO(data.decode("utf-8"), newline="")) if row]
+    records, issues = parse_rows(rows, positions, subjects)
+    return len(rows), records, issues
+
+@dataclass
+class ImportBatch:
+    students: List[Student]
+    issues: List[ValidationIssue]
+    rows: int
+    bytes_done: int
+    # Students carry only the subjects in the file; merge them into existing records instead of replacing.
+    merge_marks: bool = False
+
+    @property
+    def skipped(self) -> int:
+        rows = {issue.row for issue in self.issues if issue.row > 0}
+        return len(rows) + sum(1 for issue in self.issues if issue.row <= 0)
+
+def _to_students(records: List[Record]) -> List[Student]:
+    return [Student(student_id=sid, name=name, marks_by_subject=marks) for _, sid, name, marks in records]
+
+def iter_csv_batches(path: str, subjects: Sequence[str] = DEFAULT_SUBJECTS, workers: Optional[int] = None,
+                     chunk_bytes: int = CHUNK_BYTES) -> Iterator[ImportBatch]:
+    """Yield validated batches of a wide CSV in file order.
+
+    Large files are parsed in a process pool with a bounded number of chunks in flight.
+    Chunks are cut on raw line boundaries, so quoted fields must not contain newlines.
+    """
+    header, data_start = read_csv_header(path)
+    positions = column_positions(header, subjects)
+    ranges = chunk_ranges(path, data_start, chunk_bytes)
+    jobs = [(path, begin, end, positions, list(subjects)) for begin, end in ranges]
+
+    executor = None
+    if len(jobs) > 1 and os.path.getsize(path) >= PARALLEL_THRESHOLD_BYTES:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        if executor is None:
+            outputs: Iterator = map(_parse_range, jobs)
+        else:
+            outputs = _bounded_map(executor, _parse_range, jobs, 2 * (workers or os.cpu_count() or 1))
+        row_offset = 0
+        for (_, end), (row_count, records, issues) in zip(ranges, outputs):
+            yield ImportBatch(
+                students=_to_students(records),
+                issues=[ValidationIssue(issue.row + row_offset, issue.field, issue.reason) for issue in issues],
+                rows=row_count,
+                bytes_done=end,
+            )
+            row_offset += row_count
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+def _bounded_map(executor: ProcessPoolExecutor, fn, jobs: Sequence, window: int) -> Iterator:
+    pending: Deque[Future] = deque()
+    for job in jobs:
+        pending.append(executor.submit(fn, job))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def iter_json_batches(path: str, batch_rows: int = JSON_BATCH_ROWS,
+                      read_chars: int = 1024 * 1024) -> Iterator[ImportBatch]:
+    """Yield validated batches from a JSON array of students without loading the whole file.
+
+    A record that still does not parse after ``JSON_RECORD_CHUNKS`` chunks of lookahead is
+    reported as an issue with its character offset, and the import stops there.
+    """
+    decoder = json.JSONDecoder()
+    max_record_chars = JSON_RECORD_CHUNKS * read_chars
+    buffer = ""
+    pos = 0
+    consumed = 0
+    eof = False
+    pending: List[object] = []
+    row = 1
+    with open(path, "r", encoding="utf-8-sig") as f:
+
+        def fill() -> bool:
+            nonlocal buffer, pos, consumed, eof
+            chunk = f.read(read_chars)
+            if not chunk:
+                eof = True
+                return False
+            consumed += pos
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_ws() -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        def flush() -> ImportBatch:
+            nonlocal pending, row
+            report = validate_records(pending, start_row=row)
+            batch = ImportBatch(_to_students(report.records), report.issues, len(pending), f.buffer.tell())
+            row += len(pending)
+            pending = []
+            return batch
+
+        skip_ws()
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise ValueError("Invalid JSON format: File should contain a list of students.")
+        pos += 1
+        while True:
+            skip_ws()
+            if pos >= len(buffer):
+                raise ValueError("Invalid JSON file: unexpected end of file.")
+            if buffer[pos] == "]":
+                break
+            if pending or row > 1:
+                if buffer[pos] != ",":
+                    raise ValueError(f"Invalid JSON file: expected ',' near record {row + len(pending)}.")
+                pos += 1
+                skip_ws()
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    break
+                except json.JSONDecodeError as e:
+                    if len(buffer) - pos > max_record_chars:
+                        end = -1
+                        break
+                    if eof or not fill():
+                        raise ValueError(f"Invalid JSON file: {e}")
+            if end < 0:
+                if pending:
+                    yield flush()
+                issue = ValidationIssue(row, "record", f"Malformed or oversized record at character offset "
+                                                       f"{consumed + pos}; import stopped.")
+                yield ImportBatch([], [issue], 0, f.buffer.tell())
+                return
+            pos = end
+            pending.append(item)
+            if len(pending) >= batch_rows:
+                yield flush()
+        if pending:
+            yield flush()
+
+def _long_row_source(path: str) -> Iterator[Tuple[object, object, object, object, int]]:
+    """Yield (student_id, name, subject, mark, byte_position) from a long-format CSV or JSONL file."""
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        decoder = json.JSONDecoder()
+        with open(path, "rb") as f:
+            for line in f:
+                text = line.decode("utf-8-sig").strip()
+                if not text:
+                    continue
+                item = _decode_line(decoder, text)
+                if not isinstance(item, dict):
+                    yield _MALFORMED, None, None, None, f.tell()
+                    continue
+                yield (item.get("student_id"), item.get("name", ""), item.get("subject"),
+                       item.get("marks", item.get("mark")), f.tell())
+        return
+    header, data_start = read_csv_header(path)
+    lowered = [col.lower() for col in header]
+    positions: Dict[str, int] = {}
+    for key, aliases in LONG_FORMAT_COLUMNS.items():
+        for alias in aliases:
+            if alias in lowered:
+                positions[key] = lowered.index(alias)
+                break
+    missing = [key for key in ("student_id", "subject", "marks") if key not in positions]
+    if missing:
+        raise ValueError(f"Invalid long-format CSV. Missing columns: {', '.join(missing)}")
+    name_pos = positions.get("name")
+    with open(path, "rb") as raw:
+        raw.seek(data_start)
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        for row in csv.reader(text):
+            if not row:
+                continue
+            get = lambda pos: row[pos] if pos is not None and pos < len(row) else ""
+            yield (get(positions["student_id"]), get(name_pos), get(positions["subject"]),
+                   get(positions["marks"]), raw.tell())
+
+def _decode_line(decoder: json.JSONDecoder, text: str) -> object:
+    if not text.startswith("{"):
+        return None
+    try:
+        item, end = decoder.raw_decode(text)
+    except json.JSONDecodeError:
+        return None
+    return item if end == len(text) else None
+
+def _group_long_records(records: Iterator[Tuple[str, str, str, float]]) -> Dict[str, Tuple[str, Dict[str, float]]]:
+    groups: Dict[str, Tuple[str, Dict[str, float]]] = {}
+    for sid, name, subject, mark in records:
+        group = groups.get(sid)
+        if group is None:
+            groups[sid] = (name, {subject: mark})
+        else:
+            if name and not group[0]:
+                groups[sid] = group = (name, group[1])
+            group[1][subject] = mark
+    return groups
+
+def _groups_to_batches(groups: Dict[str, Tuple[str, Dict[str, float]]], batch_rows: int, bytes_done: int,
+                       existing: Optional[Callable[[str], Optional[Student]]] = None) -> Iterator[ImportBatch]:
+    students: List[Student] = []
+    issues: List[ValidationIssue] = []
+    for sid, (name, marks) in groups.items():
+        if not name:
+            known = existing(sid) if existing is not None else None
+            if known is None:
+                issues.append(ValidationIssue(0, "name", f"Student name missing for {sid}."))
+                continue
+            name = known.name
+        students.append(Student(student_id=sid, name=name, marks_by_subject=marks))
+        if len(students) >= batch_rows:
+            yield ImportBatch(students, issues, 0, bytes_done, merge_marks=True)
+            students, issues = [], []
+    if students or issues:
+        yield ImportBatch(students, issues, 0, bytes_done, merge_marks=True)
+
+def iter_long_records(path: str, chunk_rows: int = JSON_BATCH_ROWS
+                      ) -> Iterator[Tuple[List[Tuple[str, str, str, float]], List[ValidationIssue], int, int]]:
+    """Yield validated long-format rows in chunks as (rows, issues, line_count, byte_position)."""
+    source = _long_row_source(path)
+    start_row = 1
+    while True:
+        chunk = list(islice(source, chunk_rows))
+        if not chunk:
+            return
+        ids, names, subjects, marks, positions = zip(*chunk)
+        malformed = {start_row + i for i, sid in enumerate(ids) if sid is _MALFORMED}
+        if malformed:
+            ids = tuple(None if sid is _MALFORMED else sid for sid in ids)
+        report = validate_long_columns(ids, names, subjects, marks, start_row)
+        issues = report.issues
+        if malformed:
+            issues = [issue for issue in issues if issue.row not in malformed]
+            issues.extend(ValidationIssue(row, "record", "Malformed JSON record.") for row in malformed)
+            issues.sort(key=lambda issue: issue.row)
+        rows = [(sid, name, next(iter(m)), next(iter(m.values()))) for _, sid, name, m in report.records]
+        yield rows, issues, len(chunk), positions[-1]
+        start_row += len(chunk)
+
+def iter_long_batches(path: str, batch_rows: int = JSON_BATCH_ROWS, max_buffered_rows: int = LONG_BUFFER_ROWS,
+                      partitions: int = LONG_PARTITIONS,
+                      existing: Optional[Callable[[str], Optional[Student]]] = None) -> Iterator[ImportBatch]:
+    """Group a long-format (student, subject, mark) file into students with bounded memory.
+
+    The students hold only the subjects found in the file and come in ``merge_marks`` batches,
+    like ``db.insert_long_marks``. A student without a name in the file takes the name from
+    ``existing(student_id)``; it is rejected only if that finds nobody.
+
+    Rows are grouped in memory until ``max_buffered_rows`` is exceeded; after that every row is
+    hash-partitioned by student ID into temporary files and each partition is grouped on its own.
+    Within a student, later rows win for the same subject.
+    """
+    total = max(1, os.path.getsize(path))
+    buffered: List[Tuple[str, str, str, float]] = []
+    spill_dir: Optional[tempfile.TemporaryDirectory] = None
+    writers: List = []
+    files: List = []
+    try:
+        for rows, issues, line_count, position in iter_long_records(path, batch_rows):
+            if spill_dir is None:
+                buffered.extend(rows)
+                if len(buffered) > max_buffered_rows:
+                    spill_dir = tempfile.TemporaryDirectory(prefix="sgm_import_")
+                    files = [open(os.path.join(spill_dir.name, f"part_{i}.csv"), "w", encoding="utf-8", newline="")
+                             for i in range(partitions)]
+                    writers = [csv.writer(f) for f in files]
+                    rows, buffered = buffered, []
+            if spill_dir is not None:
+                for row in rows:
+                    writers[zlib.crc32(row[0].encode("utf-8")) % partitions].writerow(row)
+            progress = position if spill_dir is None else position // 2
+            yield ImportBatch([], issues, line_count, progress)
+
+        if spill_dir is None:
+            yield from _groups_to_batches(_group_long_records(iter(buffered)), batch_rows, total, existing)
+            return
+
+        for f in files:
+            f.close()
+        for i in range(partitions):
+            with open(os.path.join(spill_dir.name, f"part_{i}.csv"), "r", encoding="utf-8", newline="") as f:
+                groups = _group_long_records((sid, name, subject, float(mark))
+                                             for sid, name, subject, mark in csv.reader(f))
+            done = total // 2 + (total - total // 2) * (i + 1) // partitions
+            yield from _groups_to_batches(groups, batch_rows, done, existing)
+    finally:
+        for f in files:
+            if not f.closed:
+                f.close()
+        if spill_dir is not None:
+            spill_dir.cleanup()
+
+def load_long_format_into_db(path: str, batch_rows: int = 1000) -> ImportResult:
+    """Stream a long-format file straight into ``student_marks`` without building ``Student`` objects.
+
+    Rows for IDs that are neither in the database nor named anywhere in the file are
+    reported as missing a name, as in ``iter_long_batches``. Database errors propagate.
+    """
+    from . import db
+    result = ImportResult()
+    written: Set[str] = set()
+    unnamed: Dict[str, List[Tuple[str, str, str, float]]] = {}
+
+    def flush(rows: List[Tuple[str, str, str, float]]) -> None:
+        named = {sid for sid, name, _, _ in rows if name}
+        missing = {sid for sid, _, _, _ in rows} - named - written
+        if missing:
+            missing -= db.get_existing_ids(list(missing))
+        earlier = [row for sid in named if sid in unnamed for row in unnamed.pop(sid)]
+        keep = []
+        for row in rows:
+            if row[0] in missing:
+                # Held back: a later row may still name the student.
+                unnamed.setdefault(row[0], []).append(row)
+            else:
+                keep.append(row)
+        rows = earlier + keep
+        if rows:
+            db.insert_long_marks(rows)
+            written.update(row[0] for row in rows)
+
+    pending: List[Tuple[str, str, str, float]] = []
+    for rows, issues, _, _ in iter_long_records(path, batch_rows):
+        result.issues.extend(issues)
+        result.skipped += len({issue.row for issue in issues})
+        pending.extend(rows)
+        if len(pending) >= batch_rows:
+            flush(pending)
+            pending = []
+    if pending:
+        flush(pending)
+    for sid in unnamed:
+        result.issues.append(ValidationIssue(0, "name", f"Student name missing for {sid}."))
+        result.skipped += 1
+    result.imported = len(written)
+    return result
+
+def parallel_import_csv(path: str, manager: StudentManager, subjects: Sequence[str] = DEFAULT_SUBJECTS,
+                        workers: Optional[int] = None, chunk_bytes: int = CHUNK_BYTES) -> ImportResult:
+    """Parse and validate a wide CSV in a process pool and merge it into ``manager`` in file order.
+
+    Later rows win over earlier rows with the same student ID.
+    """
+    result = ImportResult()
+    for batch in iter_csv_batches(path, subjects, workers, chunk_bytes):
+        event = manager.bulk_import(batch.students)
+        result.imported += len(event)
+        result.unchanged += event.unchanged
+        result.skipped += batch.skipped
+        result.issues.extend(batch.issues)
+    return result
+
+_DONE = object()
+
+class ImportJob:
+    """Run reader and validator stages on a worker thread, handing batches to the caller via a bounded queue."""
+
+    def __init__(self, batches: Iterator[ImportBatch], total_bytes: int, error_log_path: str,
+                 max_pending: int = 4) -> None:
+        self._batches = batches
+        self.total_bytes = max(1, total_bytes)
+        self.error_log_path = error_log_path
+        self.error_count = 0
+        self.error: Optional[Exception] = None
+        self.queue: "queue.Queue[object]" = queue.Queue(maxsize=max_pending)
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="import-job", daemon=True)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def _put(self, item: object) -> bool:
+        while not self._cancel.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self) -> None:
+        log = None
+        try:
+            for batch in self._batches:
+                if self._cancel.is_set():
+                    break
+                if batch.issues:
+                    if log is None:
+                        os.makedirs(os.path.dirname(self.error_log_path) or ".", exist_ok=True)
+                        log = open(self.error_log_path, "w", encoding="utf-8")
+                    log.writelines(f"{issue}\n" for issue in batch.issues)
+                    self.error_count += len(batch.issues)
+                if not self._put(batch):
+                    break
+        except Exception as e:
+            self.error = e
+        finally:
+            close = getattr(self._batches, "close", None)
+            if close:
+                close()
+            if log is not None:
+                log.close()
+            while True:
+                try:
+                    self.queue.put(_DONE, timeout=0.1)
+                    break
+                except queue.Full:
+                    if self._cancel.is_set():
+                        try:
+                            self.queue.get_nowait()
+                        except queue.Empty:
+                            pass
+
+    def drain(self, max_batches: int = 2) -> Tuple[List[ImportBatch], bool]:
+        """Return ready batches and whether the job has finished; call from the consumer thread."""
+        batches: List[ImportBatch] = []
+        while len(batches) < max_batches:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return batches, False
+            if item is _DONE:
+                return batches, True
+            batches.append(item)
+        return batches, False
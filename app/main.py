@@ -1,9 +1,31 @@
 from __future__ import annotations
+import argparse
+from typing import List, Optional
+
+from . import profiling
 from .gui import GradeApp
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="student-grade-manager", description="Student Grade Management System")
+    parser.add_argument("--profile", action="store_true", default=None,
+                        help="time every Tk event handler and report slow ones (or set SGM_PROFILE=1)")
+    parser.add_argument("--profile-budget", type=float, metavar="MS",
+                        help=f"frame budget for --profile (default {profiling.FRAME_BUDGET_MS:g} ms, "
+                             "or SGM_PROFILE_BUDGET_MS)")
+    parser.add_argument("--profile-cprofile", type=int, nargs="?", const=profiling.KEEP_SLOWEST, metavar="N",
+                        help=f"with --profile, keep cProfile stats of the N slowest handler calls "
+                             f"(default {profiling.KEEP_SLOWEST}, or SGM_PROFILE_CPROFILE=N)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    profiler = profiling.configure(args.profile, args.profile_budget, args.profile_cprofile)
     app = GradeApp()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        if profiler is not None:
+            profiler.report()
 
 if __name__ == "__main__":
     main()
@@ -1,13 +1,89 @@
 from __future__ import annotations
-from typing import Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from . import DEFAULT_SUBJECTS, metrics
+from .events import (ChangeEvent, StudentAdded, StudentDeleted, StudentsImported, StudentUpdated,
+                     Subscriber)
 from .models import Student
+from .query import StudentQuery, text_matcher
+
+CALL_SECONDS = metrics.histogram("sgm_manager_call_seconds", "Duration of StudentManager calls, by function")
+WRITES = metrics.counter("sgm_manager_writes_total", "Students passed to add_or_update/bulk_import, by result")
+timed = metrics.timed(CALL_SECONDS)
+
+TOP_KEPT = 3
+
+
+def _rank_key(student: Student) -> Tuple[float, str]:
+    return (student.average(), student.student_id)
 
 class StudentManager:
     def __init__(self, students: Optional[Iterable[Student]] = None) -> None:
         self._students: Dict[str, Student] = {}
+        self._subscribers: List[Subscriber] = []
+        self._average_sum = 0.0
+        self._hashes: Dict[str, str] = {}
+        self._search_keys: Dict[str, str] = {}
+        self._subjects: Dict[str, None] = dict.fromkeys(DEFAULT_SUBJECTS)
+        # The TOP_KEPT best students, best first, or all of them when there are fewer; None until asked for.
+        self._top: Optional[List[Student]] = None
+        self.version = 0
         if students:
             for s in students:
-                self._students[s.student_id] = s
+                self._store(s)
+
+    def subscribe(self, callback: Subscriber) -> Callable[[], None]:
+        self._subscribers.append(callback)
+
+        def unsubscribe() -> None:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _publish(self, event: ChangeEvent) -> None:
+        self.version += 1
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Warning: change subscriber failed: {e}")
+
+    def _store(self, student: Student, digest: Optional[str] = None) -> Optional[Student]:
+        old = self._students.get(student.student_id)
+        if old is not None:
+            self._average_sum -= old.average()
+        self._students[student.student_id] = student
+        self._hashes[student.student_id] = digest or student.content_hash()
+        self._search_keys[student.student_id] = f"{student.student_id.lower()}\x00{student.name.lower()}"
+        self._average_sum += student.average()
+        for subject in student.marks_by_subject:
+            if subject not in self._subjects:
+                self._subjects[subject] = None
+        if self._top is not None:
+            self._update_top(old, student)
+        return old
+
+    def _update_top(self, old: Optional[Student], new: Optional[Student]) -> None:
+        top = self._top
+        complete = len(top) < TOP_KEPT
+        if old is not None and any(s is old for s in top):
+            top.remove(old)
+            if new is None or _rank_key(new) < _rank_key(old):
+                if not complete:
+                    # The student may have dropped below someone outside the list; rescan on demand.
+                    self._top = None
+                    return
+        elif new is None or (not complete and _rank_key(new) <= _rank_key(top[-1])):
+            return
+        if new is not None:
+            top.append(new)
+            top.sort(key=_rank_key, reverse=True)
+            del top[TOP_KEPT:]
+
+    def subjects(self) -> List[str]:
+        return list(self._subjects)
+
+    def register_subject(self, subject: str) -> None:
+        self._subjects.setdefault(subject, None)
 
     def list_students(self) -> List[Student]:
         return list(self._students.values())
@@ -15,27 +91,88 @@ class StudentManager:
     def get(self, student_id: str) -> Optional[Student]:
         return self._students.get(student_id)
 
-    def add_or_update(self, student: Student) -> None:
-        self._students[student.student_id] = student
-
+    def content_hash(self, student_id: str) -> Optional[str]:
+        return self._hashes.get(student_id)
+
+    @timed
+    def add_or_update(self, student: Student) -> bool:
+        digest = student.content_hash()
+        if self._hashes.get(student.student_id) == digest:
+            WRITES.inc(result="unchanged")
+            return False
+        WRITES.inc(result="changed")
+        old = self._store(student, digest)
+        self._publish(StudentAdded(student) if old is None else StudentUpdated(old, student))
+        return True
+
+    @timed
+    def bulk_import(self, students: Iterable[Student]) -> StudentsImported:
+        added: List[Student] = []
+        updated: List[Tuple[Student, Student]] = []
+        unchanged = 0
+        for student in students:
+            digest = student.content_hash()
+            if self._hashes.get(student.student_id) == digest:
+                unchanged += 1
+                continue
+            old = self._store(student, digest)
+            if old is None:
+                added.append(student)
+            else:
+                updated.append((old, student))
+        event = StudentsImported(added, updated, unchanged)
+        WRITES.inc(len(added) + len(updated), result="changed")
+        WRITES.inc(unchanged, result="unchanged")
+        if len(event):
+            self._publish(event)
+        return event
+
+    @timed
     def delete(self, student_id: str) -> bool:
-        return self._students.pop(student_id, None) is not None
-
-    def search(self, query: str) -> List[Student]:
-        q = query.strip().lower()
-        return [s for s in self._students.values() if q in s.student_id.lower() or q in s.name.lower()]
+        student = self._students.pop(student_id, None)
+        if student is None:
+            return False
+        self._hashes.pop(student_id, None)
+        self._search_keys.pop(student_id, None)
+        self._average_sum -= student.average()
+        if self._top is not None:
+            self._update_top(student, None)
+        if not self._students:
+            self._average_sum = 0.0
+        self._publish(StudentDeleted(student))
+        return True
+
+    @timed
+    def search(self, query: str, within: Optional[Iterable[Student]] = None) -> List[Student]:
+        """Students matching ``query`` as in ``StudentQuery.search``; ``within`` narrows an earlier result,
+        keeping its order."""
+        match = text_matcher(query)
+        keys = self._search_keys
+        candidates = self._students.values() if within is None else within
+        return [s for s in candidates if match(keys.get(s.student_id, ""))]
+
+    def search_keys(self, students: Iterable[Student]) -> List[str]:
+        """Lower-cased ``"id\\0name"`` index entries for ``students``, for repeated ``text_matcher`` filtering."""
+        keys = self._search_keys
+        return [keys.get(s.student_id, "") for s in students]
+
+    def query(self) -> StudentQuery:
+        return StudentQuery(self)
 
     def class_average(self) -> float:
-        students = self.list_students()
-        if not students:
+        if not self._students:
             return 0.0
-        return sum(s.average() for s in students) / len(students)
+        return self._average_sum / len(self._students)
 
     def top_performers(self, n: int = 3) -> List[Student]:
-        return sorted(self.list_students(), key=lambda s: s.average(), reverse=True)[:n]
+        if n > TOP_KEPT:
+            return list(self.query().order_by("average", descending=True).limit(n))
+        if self._top is None:
+            self._top = list(self.query().order_by("average", descending=True).limit(TOP_KEPT))
+        return self._top[:n]
 
     def bottom_performers(self, n: int = 3) -> List[Student]:
-        return sorted(self.list_students(), key=lambda s: s.average())[:n]
+        return list(self.query().order_by("average").limit(n))
 
     def count_students(self) -> int:
         return len(self._students)
@@ -71,8 +208,9 @@ class StudentManager:
         return {subject: total / subject_counts[subject] for subject, total in subject_totals.items() if subject_counts[subject] > 0}
 
     def get_students_in_range(self, min_avg: float, max_avg: float) -> List[Student]:
-        return [s for s in self.list_students() if min_avg <= s.average() <= max_avg]
+        return list(self.query().where("average", "between", (min_avg, max_avg)))
 
+    @timed
     def statistics(self) -> Dict[str, object]:
         return {
             "total_students": self.count_students(),
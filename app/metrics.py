@@ -0,0 +1,273 @@
+from __future__ import annotations
+import bisect
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from types import GeneratorType
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+# Seconds; wide enough to cover an in-memory lookup and a multi-second bulk load.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _label_key(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> Dict[Labels, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class _Series:
+    __slots__ = ("buckets", "total", "count")
+
+    def __init__(self, size: int) -> None:
+        self.buckets = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram:
+    """Observations per label set, counted into fixed buckets plus a running sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.bounds = tuple(sorted(buckets))
+        self._series: Dict[Labels, _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.bounds) + 1)
+            series.buckets[index] += 1
+            series.total += value
+            series.count += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Dict[Labels, Tuple[List[int], float, int]]:
+        """``{labels: (per-bucket counts, sum, count)}``; the last bucket is ``+Inf``."""
+        with self._lock:
+            return {key: (list(s.buckets), s.total, s.count) for key, s in self._series.items()}
+
+    def quantile(self, q: float, buckets: Sequence[int]) -> float:
+        """Upper bound of the bucket holding quantile ``q`` of ``buckets`` (the largest bound for ``+Inf``)."""
+        count = sum(buckets)
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for bound, n in zip(self.bounds, buckets):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+Metric = Union[Counter, Histogram]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls: type, name: str, *args: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter, name, help)
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help, buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def collect(self) -> List[Metric]:
+        with self._lock:
+            return sorted(self._metrics.values(), key=lambda m: m.name)
+
+    def reset(self) -> None:
+        for metric in self.collect():
+            metric.reset()
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Counter):
+                for key, value in sorted(metric.samples().items()):
+                    lines.append(f"{metric.name}{_format_labels(key)} {_format_number(value)}")
+                continue
+            for key, (buckets, total, count) in sorted(metric.samples().items()):
+                cumulative = 0
+                for bound, n in zip(metric.bounds + (float("inf"),), buckets):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else _format_number(bound)
+                    lines.append(f"{metric.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                lines.append(f"{metric.name}_sum{_format_labels(key)} {_format_number(total)}")
+                lines.append(f"{metric.name}_count{_format_labels(key)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All metrics as plain data, with mean and bucket-estimated p50/p95 for histograms."""
+        result: Dict[str, Any] = {"timestamp": time.time(), "metrics": {}}
+        for metric in self.collect():
+            series = []
+            if isinstance(metric, Counter):
+                for key, value in sorted(metric.samples().items()):
+                    series.append({"labels": dict(key), "value": value})
+            else:
+                for key, (buckets, total, count) in sorted(metric.samples().items()):
+                    series.append({
+                        "labels": dict(key),
+                        "count": count,
+                        "sum": total,
+                        "mean": total / count if count else 0.0,
+                        "p50": metric.quantile(0.5, buckets),
+                        "p95": metric.quantile(0.95, buckets),
+                        "buckets": dict(zip([str(b) for b in metric.bounds] + ["+Inf"], buckets)),
+                    })
+            result["metrics"][metric.name] = {"type": metric.kind, "help": metric.help, "series": series}
+        return result
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(key: Labels) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in key) + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str) -> Counter:
+    return REGISTRY.counter(name, help)
+
+
+def histogram(name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return REGISTRY.histogram(name, help, buckets)
+
+
+def timed(metric: Histogram, **labels: str) -> Callable[[F], F]:
+    """Record each call of the decorated function in ``metric``, labelled ``function=<name>``.
+
+    When the call returns a generator, only the time spent inside the generator is
+    recorded, once it is exhausted or closed, so a slow consumer does not inflate it.
+    """
+    def decorate(func: F) -> F:
+        call_labels = {"function": func.__name__, **labels}
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                metric.observe(time.perf_counter() - start, **call_labels)
+                raise
+            if isinstance(result, GeneratorType):
+                return _timed_generator(result, metric, call_labels)
+            metric.observe(time.perf_counter() - start, **call_labels)
+            return result
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+
+def _timed_generator(gen: Generator[Any, None, Any], metric: Histogram, labels: Dict[str, str]) -> Iterator[Any]:
+    elapsed = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(gen)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - start
+            yield item
+    finally:
+        gen.close()
+        metric.observe(elapsed, **labels)
+
+
+CACHE_REQUESTS = counter("sgm_cache_requests_total", "Cache lookups by cache and result (hit or miss)")
+
+
+def cache_hit_rate(cache: str) -> Optional[float]:
+    """Fraction of lookups of ``cache`` that hit, or None before the first lookup."""
+    hits = CACHE_REQUESTS.value(cache=cache, result="hit")
+    total = hits + CACHE_REQUESTS.value(cache=cache, result="miss")
+    return hits / total if total else None
+
+
+def write_snapshot(path: str) -> None:
+    """Write the metrics to ``path``: Prometheus text for ``.prom``/``.txt``, otherwise JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        if path.lower().endswith((".prom", ".txt")):
+            f.write(REGISTRY.to_prometheus())
+        else:
+            json.dump(REGISTRY.snapshot(), f, indent=2)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import hashlib
 from dataclasses import dataclass, field
 from typing import Dict
 
@@ -16,6 +17,12 @@ class Student:
             return 0.0
         return self.total() / len(self.marks_by_subject)
 
+    def content_hash(self) -> str:
+        """Stable digest of ID, name and marks; marks are rounded to the two decimals the database keeps."""
+        parts = [self.student_id, self.name]
+        parts.extend(f"{subject}={mark:.2f}" for subject, mark in sorted(self.marks_by_subject.items()))
+        return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
     def to_dict(self) -> Dict[str, object]:
         return {
             "student_id": self.student_id,
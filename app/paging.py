@@ -0,0 +1,101 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union, overload
+
+from .metrics import CACHE_REQUESTS
+from .models import Student
+from .query import Cursor, StudentQuery
+
+PAGE_ROWS = 200
+MAX_CACHED_PAGES = 8
+
+
+class PagedRoster:
+    """Read-only sequence over a database ``StudentQuery``, fetched a page at a time.
+
+    A page whose predecessor is cached is read with keyset pagination from that
+    page's last row. Only jumps (dragging the scrollbar) fall back to ``OFFSET``.
+    At most ``max_pages`` pages are kept, so memory does not grow with the roster.
+    The length is counted once; call ``invalidate`` after the data changes.
+    """
+
+    def __init__(self, query: StudentQuery, page_rows: int = PAGE_ROWS, max_pages: int = MAX_CACHED_PAGES) -> None:
+        self.query = query
+        self.page_rows = page_rows
+        self.max_pages = max_pages
+        self._count: Optional[int] = None
+        self._pages: "OrderedDict[int, Tuple[List[Student], Optional[Cursor]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = self.query.count()
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> Student: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Student]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Student, List[Student]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("PagedRoster only supports contiguous slices")
+            rows: List[Student] = []
+            number = start // self.page_rows
+            while start + len(rows) < stop:
+                page = self.page(number)
+                if not page:
+                    break
+                begin = max(0, start - number * self.page_rows)
+                rows.extend(page[begin:stop - number * self.page_rows])
+                number += 1
+            return rows
+        if index < 0:
+            index += len(self)
+        page = self.page(index // self.page_rows)
+        try:
+            return page[index % self.page_rows]
+        except IndexError:
+            raise IndexError("PagedRoster index out of range") from None
+
+    def page(self, number: int) -> List[Student]:
+        """Rows of page ``number``, from the cache or the database."""
+        cached = self._pages.get(number)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="roster_pages", result="hit")
+            self._pages.move_to_end(number)
+            return cached[0]
+        CACHE_REQUESTS.inc(cache="roster_pages", result="miss")
+        previous = self._pages.get(number - 1) if number else None
+        if number == 0:
+            rows, cursor = self.query.page(self.page_rows)
+        elif previous is not None and previous[1] is not None:
+            rows, cursor = self.query.page(self.page_rows, previous[1])
+        else:
+            rows, cursor = self.query.offset(number * self.page_rows).page(self.page_rows)
+        self._pages[number] = (rows, cursor)
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+        return rows
+
+    def get(self, student_id: str) -> Optional[Student]:
+        """A student on one of the cached pages, without touching the database."""
+        for rows, _ in self._pages.values():
+            for student in rows:
+                if student.student_id == student_id:
+                    return student
+        return None
+
+    def index_of(self, student_id: str) -> Optional[int]:
+        """Position of a student among the cached pages, or None if it is not cached."""
+        for number, (rows, _) in self._pages.items():
+            for i, student in enumerate(rows):
+                if student.student_id == student_id:
+                    return number * self.page_rows + i
+        return None
+
+    def invalidate(self) -> None:
+        self._count = None
+        self._pages.clear()
@@ -0,0 +1,184 @@
+from __future__ import annotations
+import heapq
+import itertools
+import os
+import time
+import tkinter
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import metrics
+from .storage import DEFAULT_DATA_DIR
+
+FRAME_BUDGET_MS = 16.0
+KEEP_SLOWEST = 10
+PROFILE_DIR = os.path.join(DEFAULT_DATA_DIR, "logs", "profile")
+_TRUE = {"1", "true", "yes", "on"}
+
+HANDLER_SECONDS = metrics.histogram("sgm_ui_handler_seconds", "Time spent in Tk event handlers, by handler")
+
+
+@dataclass
+class HandlerStats:
+    calls: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+    over_budget: int = 0
+
+
+def handler_name(func: Callable[..., Any]) -> str:
+    """A readable name for a Tk callback: ``Class.method``, ``after:<name>`` or a lambda's location."""
+    owner = getattr(func, "__self__", None)
+    name = getattr(func, "__name__", None) or type(func).__name__
+    qualname = getattr(func, "__qualname__", name)
+    if owner is not None and not isinstance(owner, ModuleType):
+        return f"{type(owner).__name__}.{name}"
+    if qualname.endswith("after.<locals>.callit"):
+        # Misc.after wraps the callback in a closure that copies its name; name the callback itself.
+        for cell in func.__closure__ or ():
+            try:
+                inner = cell.cell_contents
+            except ValueError:
+                continue
+            if callable(inner) and getattr(inner, "__name__", None) == name:
+                return f"after:{handler_name(inner)}"
+        return f"after:{name}"
+    code = getattr(func, "__code__", None)
+    if name == "<lambda>" and code is not None:
+        called = ",".join(code.co_names[-2:])
+        return f"<lambda {called}> {os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+    return qualname
+
+
+class UIProfiler:
+    """Times every Tk callback and reports the ones that overrun the frame budget.
+
+    ``install`` swaps ``tkinter.CallWrapper`` (which Tk uses for ``command=``,
+    ``bind``, ``after`` and protocol handlers) for a timing subclass, so it must
+    run before the widgets are created. With ``keep_slowest`` set, the outermost
+    handler calls also run under cProfile and the stats of the slowest ones are
+    kept for ``report``.
+    """
+
+    def __init__(self, budget_ms: float = FRAME_BUDGET_MS, keep_slowest: int = 0,
+                 output_dir: str = PROFILE_DIR) -> None:
+        self.budget = budget_ms / 1000
+        self.keep_slowest = keep_slowest
+        self.output_dir = output_dir
+        self.stats: Dict[str, HandlerStats] = {}
+        self._slowest: List[Tuple[float, int, str, Any]] = []
+        self._sequence = itertools.count()
+        self._depth = 0
+        self._original: Optional[type] = None
+
+    def install(self) -> None:
+        if self._original is not None:
+            return
+        profiler = self
+        original = self._original = tkinter.CallWrapper
+
+        class ProfiledCallWrapper(original):  # type: ignore[misc, valid-type]
+            def __call__(self, *args: Any) -> Any:
+                return profiler.call(self, super().__call__, args)
+
+        tkinter.CallWrapper = ProfiledCallWrapper  # type: ignore[misc]
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            tkinter.CallWrapper = self._original  # type: ignore[misc]
+            self._original = None
+
+    def call(self, wrapper: Any, invoke: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+        name = wrapper.__dict__.get("_profile_name")
+        if name is None:
+            name = wrapper._profile_name = handler_name(wrapper.func)
+        profile = None
+        if self.keep_slowest and self._depth == 0:
+            import cProfile
+            profile = cProfile.Profile()
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            if profile is None:
+                return invoke(*args)
+            return profile.runcall(invoke, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            self._record(name, elapsed, profile)
+
+    def _record(self, name: str, elapsed: float, profile: Any) -> None:
+        HANDLER_SECONDS.observe(elapsed, handler=name)
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = HandlerStats()
+        stats.calls += 1
+        stats.total += elapsed
+        stats.worst = max(stats.worst, elapsed)
+        if elapsed <= self.budget:
+            return
+        stats.over_budget += 1
+        print(f"Slow handler: {name} took {elapsed * 1000:.1f} ms (budget {self.budget * 1000:.0f} ms)")
+        if profile is not None:
+            entry = (elapsed, next(self._sequence), name, profile)
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif elapsed > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def summary(self) -> str:
+        """Per-handler table, slowest total first."""
+        lines = [f"{'handler':60} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'slow':>6}"]
+        for name, s in sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True):
+            lines.append(f"{name[:60]:60} {s.calls:7d} {s.total * 1000:10.1f} {s.total / s.calls * 1000:9.2f} "
+                         f"{s.worst * 1000:9.1f} {s.over_budget:6d}")
+        return "\n".join(lines)
+
+    def report(self) -> Optional[str]:
+        """Write the summary and the kept cProfile dumps under ``output_dir``; returns the summary path."""
+        if not self.stats:
+            return None
+        run_dir = os.path.join(self.output_dir, time.strftime("%Y%m%d-%H%M%S"))
+        try:
+            os.makedirs(run_dir, exist_ok=True)
+            summary_path = os.path.join(run_dir, "handlers.txt")
+            with open(summary_path, "w", encoding="utf-8") as f:
+                f.write(f"Frame budget: {self.budget * 1000:.0f} ms\n\n{self.summary()}\n")
+                if self._slowest:
+                    self._write_profiles(f, run_dir)
+        except OSError as e:
+            print(f"Warning: could not write profiling report: {e}")
+            return None
+        print(f"Profiling report written to {summary_path}")
+        return summary_path
+
+    def _write_profiles(self, f: Any, run_dir: str) -> None:
+        import pstats
+        for rank, (elapsed, _, name, profile) in enumerate(sorted(self._slowest, reverse=True), 1):
+            safe = "".join(c if c.isalnum() or c in "._-" else "_" for c in name)[:60]
+            dump = os.path.join(run_dir, f"{rank:02d}-{safe}-{elapsed * 1000:.0f}ms.pstats")
+            profile.dump_stats(dump)
+            f.write(f"\n{'=' * 80}\n#{rank} {name}: {elapsed * 1000:.1f} ms ({os.path.basename(dump)})\n")
+            pstats.Stats(profile, stream=f).strip_dirs().sort_stats("cumulative").print_stats(25)
+
+
+def configure(enabled: Optional[bool] = None, budget_ms: Optional[float] = None,
+              keep_slowest: Optional[int] = None) -> Optional[UIProfiler]:
+    """Install a ``UIProfiler`` if profiling is enabled by the arguments or the environment.
+
+    Arguments override ``SGM_PROFILE``, ``SGM_PROFILE_BUDGET_MS`` and ``SGM_PROFILE_CPROFILE``.
+    """
+    if enabled is None:
+        enabled = os.getenv("SGM_PROFILE", "").strip().lower() in _TRUE
+    if not enabled:
+        return None
+    if budget_ms is None:
+        budget_ms = float(os.getenv("SGM_PROFILE_BUDGET_MS") or FRAME_BUDGET_MS)
+    if keep_slowest is None:
+        keep_slowest = int(os.getenv("SGM_PROFILE_CPROFILE") or 0)
+    profiler = UIProfiler(budget_ms, keep_slowest)
+    profiler.install()
+    print(f"Profiling Tk handlers (frame budget {budget_ms:g} ms"
+          + (f", keeping cProfile stats of the {keep_slowest} slowest calls)" if keep_slowest else ")"))
+    return profiler
@@ -0,0 +1,358 @@
+from __future__ import annotations
+import heapq
+import re
+from itertools import islice
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from . import DEFAULT_GRADE_SCALE
+from .models import Student
+
+if TYPE_CHECKING:
+    from .manager import StudentManager
+
+FIELDS = ("student_id", "name", "average", "total")
+OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "between", "contains", "startswith")
+TEXT_FIELDS = ("student_id", "name")
+TEXT_OPERATORS = ("contains", "startswith")
+
+Cursor = Tuple[Any, str]
+
+# Words shorter than this are not in the MySQL FULLTEXT index (innodb_ft_min_token_size).
+FULLTEXT_MIN_TOKEN = 3
+_WORD_SPLIT = re.compile(r"\W+")
+
+
+def _field_value(student: Student, field: str) -> Any:
+    if field == "average":
+        return student.average()
+    if field == "total":
+        return student.total()
+    return getattr(student, field)
+
+
+def search_tokens(text: str) -> List[str]:
+    """The words of ``text`` long enough to be looked up in the name FULLTEXT index."""
+    return [t for t in _WORD_SPLIT.split(text) if len(t) >= FULLTEXT_MIN_TOKEN]
+
+
+def text_matcher(text: str) -> Callable[[str], bool]:
+    """Predicate over lower-cased ``"id\\0name"`` search keys with the database search semantics.
+
+    A key matches when the ID or name starts with ``text``, or when every word of ``text``
+    long enough to be indexed starts a word of the name (``db.search_condition``).
+    """
+    text = text.strip().lower()
+    tokens = search_tokens(text)
+
+    def match(key: str) -> bool:
+        sid, _, name = key.partition("\x00")
+        if sid.startswith(text) or name.startswith(text):
+            return True
+        if not tokens:
+            return False
+        words = _WORD_SPLIT.split(name)
+        return all(any(word.startswith(token) for word in words) for token in tokens)
+    return match
+
+
+def narrows(previous: str, text: str) -> bool:
+    """Whether every match of ``text`` is also a match of ``previous``, so earlier results can be filtered."""
+    return text.startswith(previous) and (bool(search_tokens(previous)) or not search_tokens(text))
+
+
+def grade_bounds(grade: str, grade_scale: Sequence[Tuple[float, str]] = DEFAULT_GRADE_SCALE) -> Tuple[float, Optional[float]]:
+    upper: Optional[float] = None
+    for threshold, label in grade_scale:
+        if label == grade:
+            return float(threshold), upper
+        upper = float(threshold)
+    raise ValueError(f"Unknown grade: {grade}")
+
+
+def _matches(value: Any, op: str, operand: Any) -> bool:
+    if op == "==":
+        return value == operand
+    if op == "!=":
+        return value != operand
+    if op == "<":
+        return value < operand
+    if op == "<=":
+        return value <= operand
+    if op == ">":
+        return value > operand
+    if op == ">=":
+        return value >= operand
+    if op == "between":
+        low, high = operand
+        return low <= value <= high
+    if op == "contains":
+        return operand.lower() in value.lower()
+    if op == "startswith":
+        return value.lower().startswith(operand.lower())
+    if op == "grade":
+        low, high = operand
+        return value >= low and (high is None or value < high)
+    raise ValueError(f"Unsupported operator: {op}")
+
+
+class _Descending:
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.key == other.key
+
+
+class StudentQuery:
+    """Immutable, lazily evaluated query over the in-memory roster or the database."""
+
+    def __init__(self, manager: Optional["StudentManager"] = None) -> None:
+        self._manager = manager
+        self._filters: List[Tuple[str, str, Any]] = []
+        self._text: Optional[str] = None
+        self._text_match: Optional[Callable[[str], bool]] = None
+        self._order: Optional[Tuple[str, bool]] = None
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._after: Optional[Cursor] = None
+
+    @classmethod
+    def database(cls) -> "StudentQuery":
+        return cls(None)
+
+    def _copy(self) -> "StudentQuery":
+        clone = StudentQuery(self._manager)
+        clone._filters = list(self._filters)
+        clone._text = self._text
+        clone._text_match = self._text_match
+        clone._order = self._order
+        clone._limit = self._limit
+        clone._offset = self._offset
+        clone._after = self._after
+        return clone
+
+    def where(self, field: str, op: str, value: Any) -> "StudentQuery":
+        if field not in FIELDS and not (field == "grade" and op == "=="):
+            raise ValueError(f"Unknown field: {field}")
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported operator: {op}")
+        if op in TEXT_OPERATORS and field not in TEXT_FIELDS:
+            raise ValueError(f"Operator {op} only applies to {' and '.join(TEXT_FIELDS)}, not {field}")
+        clone = self._copy()
+        if field == "grade":
+            clone._filters.append(("average", "grade", grade_bounds(value)))
+        else:
+            clone._filters.append((field, op, value))
+        return clone
+
+    def search(self, text: str) -> "StudentQuery":
+        """Match students whose ID or name starts with ``text``, or whose name has a word starting
+        with each word of ``text`` of at least ``FULLTEXT_MIN_TOKEN`` characters.
+
+        Both the in-memory and the database paths use these semantics; a substring in the
+        middle of a word does not match.
+        """
+        clone = self._copy()
+        clone._text = text.strip().lower() or None
+        clone._text_match = text_matcher(clone._text) if clone._text else None
+        return clone
+
+    def order_by(self, field: str, descending: bool = False) -> "StudentQuery":
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        clone = self._copy()
+        clone._order = (field, descending)
+        return clone
+
+    def limit(self, n: Optional[int]) -> "StudentQuery":
+        clone = self._copy()
+        clone._limit = n
+        return clone
+
+    def offset(self, n: int) -> "StudentQuery":
+        clone = self._copy()
+        clone._offset = max(0, n)
+        return clone
+
+    def after(self, cursor: Cursor) -> "StudentQuery":
+        """Keyset pagination: continue strictly after the given cursor."""
+        clone = self._copy()
+        clone._after = cursor
+        return clone
+
+    def cursor_for(self, student: Student) -> Cursor:
+        field = self._order[0] if self._order else "student_id"
+        return (_field_value(student, field), student.student_id)
+
+    def page(self, size: int, cursor: Optional[Cursor] = None) -> Tuple[List[Student], Optional[Cursor]]:
+        query = self.limit(size)
+        if query._order is None:
+            # The cursor is an (id, id) key, so every page, the first included, must be in ID order.
+            query = query.order_by("student_id")
+        if cursor is not None:
+            query = query.after(cursor)
+        if self._manager is None:
+            # Take the cursor from the value the database sorted on, so rounding cannot skip or repeat rows.
+            from . import db
+            sql, params = query._compile()
+            items = db.fetch_students_query(sql, params)
+            next_cursor = None
+            if len(items) == size:
+                last = items[-1]
+                next_cursor = (last.get("sort_value", last["student_id"]), last["student_id"])
+            return [Student.from_dict(item) for item in items], next_cursor
+        rows = list(query)
+        next_cursor = self.cursor_for(rows[-1]) if len(rows) == size else None
+        return rows, next_cursor
+
+    def first(self) -> Optional[Student]:
+        return next(iter(self.limit(1)), None)
+
+    def sort_key(self) -> Callable[[Student], Any]:
+        """Key whose ascending order is this query's order, for ``bisect`` into materialized results."""
+        key = self._sort_key()
+        if self._order and self._order[1]:
+            return lambda s: _Descending(key(s))
+        return key
+
+    def matches(self, student: Student) -> bool:
+        """Whether ``student`` passes the search text and filters, ignoring paging."""
+        if self._text_match and not self._text_match(f"{student.student_id.lower()}\x00{student.name.lower()}"):
+            return False
+        return all(_matches(_field_value(student, f), op, v) for f, op, v in self._filters)
+
+    def count(self) -> int:
+        if self._manager is None:
+            from . import db
+            sql, params = self._compile(count=True)
+            return db.count_students_query(sql, params)
+        return sum(1 for _ in self._iter_memory(ignore_window=True))
+
+    def __iter__(self) -> Iterator[Student]:
+        if self._manager is None:
+            yield from self._iter_database()
+        else:
+            yield from self._iter_memory()
+
+    def _sort_key(self):
+        field = self._order[0] if self._order else "student_id"
+        return lambda s: (_field_value(s, field), s.student_id)
+
+    def _passes_cursor(self, student: Student) -> bool:
+        key = self._sort_key()(student)
+        descending = bool(self._order and self._order[1])
+        return key < self._after if descending else key > self._after
+
+    def _candidates(self) -> Iterator[Student]:
+        if self._text:
+            return iter(self._manager.search(self._text))
+        return iter(self._manager.list_students())
+
+    def _iter_memory(self, ignore_window: bool = False) -> Iterator[Student]:
+        rows: Iterator[Student] = (
+            s for s in self._candidates()
+            if all(_matches(_field_value(s, f), op, v) for f, op, v in self._filters)
+        )
+        if ignore_window:
+            return rows
+        if self._after is not None:
+            rows = (s for s in rows if self._passes_cursor(s))
+        if self._order is None and self._after is None:
+            return self._window(rows)
+        key = self._sort_key()
+        descending = bool(self._order and self._order[1])
+        if self._limit is not None:
+            k = self._offset + self._limit
+            top = heapq.nlargest(k, rows, key=key) if descending else heapq.nsmallest(k, rows, key=key)
+            return iter(top[self._offset:])
+        return self._window(iter(sorted(rows, key=key, reverse=descending)))
+
+    def _window(self, rows: Iterator[Student]) -> Iterator[Student]:
+        stop = None if self._limit is None else self._offset + self._limit
+        return islice(rows, self._offset, stop)
+
+    def _compile(self, count: bool = False) -> Tuple[str, List[Any]]:
+        from .config import STUDENTS_TABLE, SUMMARY_TABLE
+        aggregate = bool(self._order and self._order[0] in ("average", "total")) or any(
+            f in ("average", "total") for f, _, _ in self._filters
+        )
+        if aggregate:
+            # student_summary keeps (average, student_id) and (total, student_id) indexed, so
+            # ordering, ranges and keyset seeks on them are index scans.
+            source = f"""(
+                SELECT ss.student_id, s.name, ss.total, ss.average
+                FROM {SUMMARY_TABLE} ss
+                JOIN {STUDENTS_TABLE} s ON s.student_id = ss.student_id
+            ) AS q"""
+        else:
+            source = f"{STUDENTS_TABLE} AS q"
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        for field, op, value in self._filters:
+            column = f"q.{field}"
+            if op == "between":
+                clauses.append(f"{column} BETWEEN %s AND %s")
+                params.extend(value)
+            elif op == "grade":
+                low, high = value
+                clauses.append(f"{column} >= %s" + ("" if high is None else f" AND {column} < %s"))
+                params.extend([low] if high is None else [low, high])
+            elif op == "contains":
+                clauses.append(f"{column} LIKE %s")
+                params.append(f"%{value}%")
+            elif op == "startswith":
+                clauses.append(f"{column} LIKE %s")
+                params.append(f"{value}%")
+            else:
+                clauses.append(f"{column} {'<>' if op == '!=' else '=' if op == '==' else op} %s")
+                params.append(value)
+        if self._text:
+            # Prefixes and name words go through the indexes; substrings would need a full scan.
+            from .db import search_condition
+            clause, clause_params = search_condition("q.student_id", "q.name", self._text)
+            clauses.append(clause)
+            params.extend(clause_params)
+
+        if count:
+            sql = f"SELECT COUNT(*) FROM {source}"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            return sql, params
+
+        field, descending = self._order if self._order else ("student_id", False)
+        direction = "DESC" if descending else "ASC"
+        if self._after is not None:
+            cmp = "<" if descending else ">"
+            if field == "student_id":
+                clauses.append(f"q.student_id {cmp} %s")
+                params.append(self._after[1])
+            else:
+                clauses.append(f"(q.{field} {cmp} %s OR (q.{field} = %s AND q.student_id {cmp} %s))")
+                params.extend([self._after[0], self._after[0], self._after[1]])
+
+        columns = "q.student_id, q.name" if field == "student_id" else f"q.student_id, q.name, q.{field} AS sort_value"
+        sql = f"SELECT {columns} FROM {source}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY q.{field} {direction}"
+        if field != "student_id":
+            sql += f", q.student_id {direction}"
+        if self._limit is not None:
+            sql += " LIMIT %s OFFSET %s"
+            params.extend([self._limit, self._offset])
+        elif self._offset:
+            sql += " LIMIT 18446744073709551615 OFFSET %s"
+            params.append(self._offset)
+        return sql, params
+
+    def _iter_database(self) -> Iterator[Student]:
+        from . import db
+        sql, params = self._compile()
+        for item in db.fetch_students_query(sql, params):
+            yield Student.from_dict(item)
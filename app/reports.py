@@ -0,0 +1,331 @@
+from __future__ import annotations
+import base64
+import hashlib
+import html
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from string import Template
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import DEFAULT_GRADE_SCALE
+from .grading import compute_grade
+from .models import Student
+
+TEMPLATE_VERSION = "1"
+MANIFEST_NAME = "manifest.json"
+CHUNK_SIZE = 100
+UNASSIGNED_COHORT = "Unassigned"
+
+STUDENT_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Report Card - $name</title>
+<style>
+body { font-family: 'Segoe UI', sans-serif; background: #f0f0f0; color: #2c3e50; margin: 0; }
+header { background: #2c3e50; color: white; padding: 18px 30px; }
+main { background: white; margin: 20px auto; max-width: 820px; padding: 24px 30px; border: 1px solid #d5d8dc; }
+table { border-collapse: collapse; width: 100%; margin: 12px 0; }
+th, td { border: 1px solid #d5d8dc; padding: 6px 10px; text-align: left; }
+th { background: #34495e; color: white; }
+.summary span { display: inline-block; margin-right: 24px; font-weight: bold; }
+</style></head>
+<body>
+<header><h1>Report Card</h1><div>$name &middot; $student_id</div></header>
+<main>
+<section><h2>Student</h2><table>$profile_rows</table></section>
+<section class="summary"><h2>Results</h2>
+<span>Total: $total</span><span>Average: $average%</span><span>Grade: $grade</span></section>
+<table><tr><th>Subject</th><th>Marks</th><th>Grade</th></tr>$mark_rows</table>
+<img alt="Marks chart" src="data:image/png;base64,$chart">
+<footer><small>Generated $generated</small></footer>
+</main></body></html>
+"""
+
+COHORT_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Cohort Summary - $cohort</title>
+<style>
+body { font-family: 'Segoe UI', sans-serif; background: #f0f0f0; color: #2c3e50; margin: 0; }
+header { background: #2c3e50; color: white; padding: 18px 30px; }
+main { background: white; margin: 20px auto; max-width: 960px; padding: 24px 30px; border: 1px solid #d5d8dc; }
+table { border-collapse: collapse; width: 100%; margin: 12px 0; }
+th, td { border: 1px solid #d5d8dc; padding: 6px 10px; text-align: left; }
+th { background: #34495e; color: white; }
+</style></head>
+<body>
+<header><h1>Cohort Summary</h1><div>$cohort &middot; $count student(s)</div></header>
+<main>
+<p><b>Class Average:</b> $average% &nbsp; <b>Pass Rate:</b> $pass_rate%</p>
+<img alt="Grade distribution" src="data:image/png;base64,$chart">
+<h2>Subject Averages</h2><table><tr><th>Subject</th><th>Average</th></tr>$subject_rows</table>
+<h2>Students</h2><table><tr><th>ID</th><th>Name</th><th>Average</th><th>Grade</th></tr>$student_rows</table>
+<footer><small>Generated $generated</small></footer>
+</main></body></html>
+"""
+
+PROFILE_LABELS = [
+    ("department", "Department"), ("session", "Session"), ("semester", "Semester"),
+    ("date_of_birth", "Date of Birth"), ("email", "Email"), ("phone", "Phone"),
+]
+
+_TEMPLATES: Dict[str, Template] = {}
+
+
+@dataclass
+class ReportSummary:
+    rendered: int = 0
+    skipped: int = 0
+    cohorts: int = 0
+    output_dir: str = ""
+    files: List[str] = field(default_factory=list)
+
+
+def _init_worker(use_agg: bool = True) -> None:
+    """Compile templates once per worker process and pin matplotlib to the Agg backend."""
+    if use_agg:
+        import matplotlib
+        matplotlib.use("Agg")
+    _TEMPLATES["student"] = Template(STUDENT_TEMPLATE)
+    _TEMPLATES["cohort"] = Template(COHORT_TEMPLATE)
+
+
+def _png(fig) -> str:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    FigureCanvasAgg(fig)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=96)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _marks_chart(marks: Dict[str, float]) -> str:
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(7, 3), facecolor="white")
+    ax = fig.add_subplot(1, 1, 1)
+    subjects = list(marks)
+    ax.barh(subjects, [marks[s] for s in subjects], color="#3498db")
+    ax.set_xlim(0, 100)
+    ax.set_xlabel("Marks")
+    fig.tight_layout()
+    return _png(fig)
+
+
+def _grade_chart(grade_counts: Dict[str, int]) -> str:
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(7, 3), facecolor="white")
+    ax = fig.add_subplot(1, 1, 1)
+    grades = [grade for _, grade in DEFAULT_GRADE_SCALE]
+    ax.bar(grades, [grade_counts.get(g, 0) for g in grades],
+           color=["#27ae60", "#3498db", "#f39c12", "#e67e22", "#e74c3c"][:len(grades)])
+    ax.set_ylabel("Students")
+    ax.set_title("Grade Distribution")
+    fig.tight_layout()
+    return _png(fig)
+
+
+def _write_pdf(path: str, title: str, lines: Sequence[str], chart_marks: Optional[Dict[str, float]]) -> None:
+    from matplotlib.backends.backend_pdf import FigureCanvasPdf
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(8.27, 11.69))
+    FigureCanvasPdf(fig)
+    fig.text(0.08, 0.95, title, fontsize=18, fontweight="bold")
+    for i, line in enumerate(lines):
+        fig.text(0.08, 0.90 - i * 0.025, line, fontsize=10)
+    if chart_marks:
+        ax = fig.add_axes([0.15, 0.08, 0.75, 0.35])
+        subjects = list(chart_marks)
+        ax.barh(subjects, [chart_marks[s] for s in subjects], color="#3498db")
+        ax.set_xlim(0, 100)
+    fig.savefig(path, format="pdf")
+
+
+def _student_payload(student: Student, profile: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "student": student.to_dict(),
+        "profile": {k: (None if v is None else str(v)) for k, v in (profile or {}).items()},
+    }
+
+
+def student_digest(student: Student, profile: Optional[Dict[str, Any]]) -> str:
+    content = json.dumps([TEMPLATE_VERSION, student.content_hash(), sorted((profile or {}).items())],
+                         separators=(",", ":"))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _safe_name(value: str) -> str:
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in value) or "_"
+
+
+def _render_student(payload: Dict[str, Any], output_dir: str, formats: Sequence[str], generated: str) -> List[str]:
+    student = Student.from_dict(payload["student"])
+    profile = payload.get("profile") or {}
+    avg = student.average()
+    grade = compute_grade(avg, DEFAULT_GRADE_SCALE)
+    base = os.path.join(output_dir, "students", _safe_name(student.student_id))
+    files = []
+    if "html" in formats:
+        mark_rows = "".join(
+            f"<tr><td>{html.escape(subject)}</td><td>{mark:.1f}</td>"
+            f"<td>{compute_grade(mark, DEFAULT_GRADE_SCALE)}</td></tr>"
+            for subject, mark in student.marks_by_subject.items()
+        )
+        profile_rows = "".join(
+            f"<tr><th>{label}</th><td>{html.escape(profile.get(key) or 'N/A')}</td></tr>"
+            for key, label in PROFILE_LABELS
+        )
+        page = _TEMPLATES["student"].substitute(
+            name=html.escape(student.name), student_id=html.escape(student.student_id),
+            total=f"{student.total():.1f}", average=f"{avg:.2f}", grade=grade,
+            mark_rows=mark_rows, profile_rows=profile_rows,
+            chart=_marks_chart(student.marks_by_subject) if student.marks_by_subject else "",
+            generated=generated,
+        )
+        with open(base + ".html", "w", encoding="utf-8") as f:
+            f.write(page)
+        files.append(base + ".html")
+    if "pdf" in formats:
+        lines = [f"Student ID: {student.student_id}"]
+        lines += [f"{label}: {profile.get(key) or 'N/A'}" for key, label in PROFILE_LABELS]
+        lines += ["", f"Total: {student.total():.1f}   Average: {avg:.2f}%   Grade: {grade}", ""]
+        lines += [f"{subject}: {mark:.1f}" for subject, mark in student.marks_by_subject.items()]
+        _write_pdf(base + ".pdf", f"Report Card - {student.name}", lines, student.marks_by_subject)
+        files.append(base + ".pdf")
+    return files
+
+
+def _render_students_chunk(args: Tuple[List[Dict[str, Any]], str, str]) -> List[str]:
+    payloads, output_dir, generated = args
+    files: List[str] = []
+    for payload in payloads:
+        files.extend(_render_student(payload, output_dir, payload["formats"], generated))
+    return files
+
+
+def _render_cohort(args: Tuple[str, List[Dict[str, Any]], str, str]) -> str:
+    cohort, payloads, output_dir, generated = args
+    students = [Student.from_dict(p["student"]) for p in payloads]
+    averages = [s.average() for s in students]
+    grades = [compute_grade(avg, DEFAULT_GRADE_SCALE) for avg in averages]
+    grade_counts: Dict[str, int] = {}
+    for grade in grades:
+        grade_counts[grade] = grade_counts.get(grade, 0) + 1
+    totals: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    for s in students:
+        for subject, mark in s.marks_by_subject.items():
+            totals[subject] = totals.get(subject, 0.0) + mark
+            counts[subject] = counts.get(subject, 0) + 1
+    ranked = sorted(zip(students, averages, grades), key=lambda item: item[1], reverse=True)
+    page = _TEMPLATES["cohort"].substitute(
+        cohort=html.escape(cohort), count=len(students),
+        average=f"{sum(averages) / len(averages):.2f}" if averages else "0.00",
+        pass_rate=f"{sum(1 for g in grades if g != 'F') / len(grades) * 100:.1f}" if grades else "0.0",
+        chart=_grade_chart(grade_counts),
+        subject_rows="".join(f"<tr><td>{html.escape(subject)}</td><td>{totals[subject] / counts[subject]:.2f}%</td></tr>"
+                             for subject in totals),
+        student_rows="".join(f"<tr><td>{html.escape(s.student_id)}</td><td>{html.escape(s.name)}</td>"
+                             f"<td>{avg:.2f}%</td><td>{grade}</td></tr>" for s, avg, grade in ranked),
+        generated=generated,
+    )
+    path = os.path.join(output_dir, "cohorts", f"{_safe_name(cohort)}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(page)
+    return path
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _load_manifest(output_dir: str) -> Dict[str, Any]:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"students": {}, "cohorts": {}}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest, dict):
+            manifest.setdefault("students", {})
+            manifest.setdefault("cohorts", {})
+            return manifest
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring unreadable report manifest: {e}")
+    return {"students": {}, "cohorts": {}}
+
+
+def generate_reports(students: Iterable[Student], output_dir: str,
+                     profiles: Optional[Dict[str, Dict[str, Any]]] = None, formats: Sequence[str] = ("html",),
+                     cohort_field: str = "department", workers: Optional[int] = None,
+                     incremental: bool = True, chunk_size: int = CHUNK_SIZE) -> ReportSummary:
+    """Render per-student report cards and per-cohort summaries into ``output_dir``.
+
+    With ``incremental`` only students whose marks, name or profile changed since the last run
+    (tracked per format in ``manifest.json``), or whose report file is missing, are re-rendered,
+    and only the cohorts that contain them.
+    """
+    os.makedirs(os.path.join(output_dir, "students"), exist_ok=True)
+    os.makedirs(os.path.join(output_dir, "cohorts"), exist_ok=True)
+    profiles = profiles or {}
+    manifest = _load_manifest(output_dir) if incremental else {"students": {}, "cohorts": {}}
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+    formats = sorted(set(formats))
+    digests: Dict[str, str] = {}
+    changed: List[Dict[str, Any]] = []
+    cohorts: Dict[str, List[Dict[str, Any]]] = {}
+    for student in students:
+        payload = _student_payload(student, profiles.get(student.student_id))
+        digest = student_digest(student, payload["profile"])
+        digests[student.student_id] = digest
+        rendered = manifest["students"].get(student.student_id)
+        if not isinstance(rendered, dict):
+            rendered = {}
+        base = os.path.join(output_dir, "students", _safe_name(student.student_id))
+        stale = [fmt for fmt in formats
+                 if rendered.get(fmt) != digest or not os.path.exists(f"{base}.{fmt}")]
+        if stale:
+            payload["formats"] = stale
+            changed.append(payload)
+        cohort = (payload["profile"].get(cohort_field) or UNASSIGNED_COHORT).strip() or UNASSIGNED_COHORT
+        cohorts.setdefault(cohort, []).append(payload)
+
+    cohort_digests = {
+        name: hashlib.sha1("".join(digests[p["student"]["student_id"]] for p in members).encode()).hexdigest()
+        for name, members in cohorts.items()
+    }
+    stale_cohorts = [name for name, digest in cohort_digests.items()
+                     if manifest["cohorts"].get(name) != digest
+                     or not os.path.exists(os.path.join(output_dir, "cohorts", f"{_safe_name(name)}.html"))]
+
+    summary = ReportSummary(skipped=len(digests) - len(changed), output_dir=output_dir)
+    student_jobs = [(chunk, output_dir, generated) for chunk in _chunks(changed, chunk_size)]
+    cohort_jobs = [(name, cohorts[name], output_dir, generated) for name in stale_cohorts]
+
+    if len(student_jobs) + len(cohort_jobs) <= 1 or workers == 0:
+        _init_worker(use_agg=False)
+        student_results = map(_render_students_chunk, student_jobs)
+        cohort_results = map(_render_cohort, cohort_jobs)
+        for files in student_results:
+            summary.files.extend(files)
+        summary.files.extend(cohort_results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            cohort_futures = [executor.submit(_render_cohort, job) for job in cohort_jobs]
+            for files in executor.map(_render_students_chunk, student_jobs):
+                summary.files.extend(files)
+            summary.files.extend(future.result() for future in cohort_futures)
+
+    summary.rendered = len(changed)
+    summary.cohorts = len(stale_cohorts)
+    manifest = {"template_version": TEMPLATE_VERSION,
+                "students": {sid: {fmt: digest for fmt in formats} for sid, digest in digests.items()},
+                "cohorts": cohort_digests}
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return summary
@@ -1,22 +1,37 @@
 from __future__ import annotations
+import gzip
+import io
 import json
 import os
 import csv
-from typing import Iterable, List
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+from . import metrics
 from .models import Student
-from . import db
 
 DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 DEFAULT_DATA_PATH = os.path.join(DEFAULT_DATA_DIR, "students.json")
 USE_DATABASE = True
+# Set when the database roster is too large to load; save_students then never deletes.
+PAGED_ROSTER = False
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+StudentRow = Union[Student, Dict[str, Any]]
+
+CALL_SECONDS = metrics.histogram("sgm_storage_call_seconds", "Duration of storage calls, by function")
+ROWS = metrics.counter("sgm_storage_rows_total", "Students loaded, saved or exported, by operation and backend")
+FALLBACKS = metrics.counter("sgm_storage_json_fallbacks_total", "Times storage fell back from MySQL to JSON")
+timed = metrics.timed(CALL_SECONDS)
 
 def ensure_data_dir(path: str = DEFAULT_DATA_DIR) -> None:
     os.makedirs(path, exist_ok=True)
 
+@timed
 def load_students(path: str = DEFAULT_DATA_PATH) -> List[Student]:
     global USE_DATABASE
     if USE_DATABASE:
         try:
+            from . import db
             db.init_database()
             raw = db.get_all_students()
             students = []
@@ -25,9 +40,11 @@ def load_students(path: str = DEFAULT_DATA_PATH) -> List[Student]:
                     students.append(Student.from_dict(item))
                 except Exception as e:
                     print(f"Warning: Skipping invalid entry: {e}")
+            ROWS.inc(len(students), operation="load", backend="mysql")
             return students
         except Exception as e:
             print(f"Database error, falling back to JSON: {e}")
+            FALLBACKS.inc()
             USE_DATABASE = False
     if not os.path.exists(path):
         return []
@@ -42,57 +59,221 @@ def load_students(path: str = DEFAULT_DATA_PATH) -> List[Student]:
                 students.append(Student.from_dict(item))
             except Exception as e:
                 print(f"Warning: Skipping invalid entry at index {idx}: {e}")
+        ROWS.inc(len(students), operation="load", backend="json")
         return students
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON format in file: {e}")
     except Exception as e:
         raise IOError(f"Failed to load students from file: {e}")
 
+@timed
+def iter_student_batches(path: str = DEFAULT_DATA_PATH, batch_size: int = 2000) -> Iterator[List[Student]]:
+    """Like ``load_students`` but yields the roster in batches, so callers can show rows as they arrive."""
+    global USE_DATABASE
+    if USE_DATABASE:
+        streamed = False
+        try:
+            from . import db
+            db.init_database()
+            batch: List[Student] = []
+            for item in db.iter_students(batch_size):
+                try:
+                    batch.append(Student.from_dict(item))
+                except Exception as e:
+                    print(f"Warning: Skipping invalid entry: {e}")
+                if len(batch) >= batch_size:
+                    streamed = True
+                    ROWS.inc(len(batch), operation="load", backend="mysql")
+                    yield batch
+                    batch = []
+            if batch:
+                ROWS.inc(len(batch), operation="load", backend="mysql")
+                yield batch
+            return
+        except Exception as e:
+            if streamed:
+                raise
+            print(f"Database error, falling back to JSON: {e}")
+            FALLBACKS.inc()
+            USE_DATABASE = False
+    students = load_students(path)
+    for start in range(0, len(students), batch_size):
+        yield students[start:start + batch_size]
+
+@timed
 def save_students(students: Iterable[Student], path: str = DEFAULT_DATA_PATH) -> None:
     if USE_DATABASE:
         try:
+            from . import db
             student_list = list(students)
-            existing_students = db.get_all_students()
-            existing_ids = {s['student_id'] for s in existing_students}
+            existing_hashes = db.get_content_hashes()
             current_ids = {s.student_id for s in student_list}
             
-            ids_to_delete = existing_ids - current_ids
-            for student_id in ids_to_delete:
-                db.delete_student(student_id)
+            ids_to_delete = existing_hashes.keys() - current_ids
+            if ids_to_delete and PAGED_ROSTER:
+                print(f"Warning: not deleting {len(ids_to_delete)} students missing from a partial roster")
+            elif ids_to_delete:
+                db.delete_students(sorted(ids_to_delete))
             
+            changed = []
             for student in student_list:
-                db.insert_student(student.student_id, student.name, student.marks_by_subject)
+                digest = student.content_hash()
+                if existing_hashes.get(student.student_id) != digest:
+                    changed.append((student.student_id, student.name, student.marks_by_subject, digest))
+            if changed:
+                db.upsert_students(changed)
+            ROWS.inc(len(changed), operation="save", backend="mysql")
             return
         except Exception as e:
             print(f"Database error, falling back to JSON: {e}")
+            FALLBACKS.inc()
     ensure_data_dir(os.path.dirname(path))
     try:
-        serializable = [s.to_dict() for s in students]
         with open(path, "w", encoding="utf-8") as f:
-            json.dump(serializable, f, indent=2)
+            ROWS.inc(_write_json_array(f, students, indent=2), operation="save", backend="json")
     except Exception as e:
         raise IOError(f"Failed to save students to file: {e}")
 
 def export_to_json(students: Iterable[Student], path: str) -> None:
-    ensure_data_dir(os.path.dirname(path))
+    stream_export_json(students, path, compression=None, indent=2)
+
+def export_to_csv(students: Iterable[Student], path: str, subjects: List[str]) -> None:
+    stream_export_csv(students, path, subjects, compression=None)
+
+def _as_dict(row: StudentRow) -> Dict[str, Any]:
+    return row.to_dict() if isinstance(row, Student) else Student.from_dict(row).to_dict()
+
+def _as_student(row: StudentRow) -> Student:
+    return row if isinstance(row, Student) else Student.from_dict(row)
+
+def _write_json_array(f: TextIO, rows: Iterable[StudentRow], indent: Optional[int] = None) -> int:
+    count = 0
+    for row in rows:
+        text = json.dumps(_as_dict(row), indent=indent)
+        if indent is not None:
+            text = text.replace("\n", "\n" + " " * indent)
+            f.write(("[\n" if count == 0 else ",\n") + " " * indent + text)
+        else:
+            f.write(("[\n" if count == 0 else ",\n") + text)
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
+
+def _resolve_compression(path: str, compression: Optional[str]) -> Optional[str]:
+    if compression != "auto":
+        return compression
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return None
+
+def _zstd_factory(level: Optional[int]):
     try:
-        serializable = [s.to_dict() for s in students]
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(serializable, f, indent=2)
+        from compression import zstd
+        return lambda raw: zstd.ZstdFile(raw, "wb", level=level)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires Python 3.14+ or the zstandard package") from e
+    return lambda raw: zstandard.ZstdCompressor(level=level or 3).stream_writer(raw, closefd=False)
+
+@contextmanager
+def open_export_stream(path: str, compression: Optional[str] = "auto", buffer_size: int = DEFAULT_BUFFER_SIZE,
+                       level: Optional[int] = None) -> Iterator[TextIO]:
+    """Open a buffered text stream for an export, optionally gzip- or zstd-compressed."""
+    ensure_data_dir(os.path.dirname(path) or ".")
+    compression = _resolve_compression(path, compression)
+    if compression not in (None, "gzip", "zstd"):
+        raise ValueError(f"Unsupported compression: {compression}")
+    zstd_writer = _zstd_factory(level) if compression == "zstd" else None
+    raw = open(path, "wb", buffering=buffer_size)
+    try:
+        if compression is None:
+            compressed = None
+            target = raw
+        elif compression == "gzip":
+            compressed = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6 if level is None else level)
+            target = compressed
+        else:
+            compressed = zstd_writer(raw)
+            target = compressed
+        text = io.TextIOWrapper(io.BufferedWriter(target, buffer_size) if compressed else target,
+                                encoding="utf-8", newline="", write_through=False)
+        try:
+            yield text
+        finally:
+            text.flush()
+            text.detach().flush()
+            if compressed is not None:
+                compressed.close()
+    finally:
+        raw.close()
+
+@timed
+def stream_export_json(students: Iterable[StudentRow], path: str, compression: Optional[str] = "auto",
+                       buffer_size: int = DEFAULT_BUFFER_SIZE, indent: Optional[int] = None) -> int:
+    try:
+        with open_export_stream(path, compression, buffer_size) as f:
+            count = _write_json_array(f, students, indent)
+        ROWS.inc(count, operation="export", backend="file")
+        return count
+    except (ImportError, ValueError):
+        raise
     except Exception as e:
         raise IOError(f"Failed to export to JSON: {e}")
 
-def export_to_csv(students: Iterable[Student], path: str, subjects: List[str]) -> None:
-    ensure_data_dir(os.path.dirname(path))
+@timed
+def stream_export_jsonl(students: Iterable[StudentRow], path: str, compression: Optional[str] = "auto",
+                        buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
     try:
-        with open(path, "w", newline="", encoding="utf-8") as f:
+        count = 0
+        with open_export_stream(path, compression, buffer_size) as f:
+            for row in students:
+                f.write(json.dumps(_as_dict(row)))
+                f.write("\n")
+                count += 1
+        ROWS.inc(count, operation="export", backend="file")
+        return count
+    except (ImportError, ValueError):
+        raise
+    except Exception as e:
+        raise IOError(f"Failed to export to JSONL: {e}")
+
+@timed
+def stream_export_csv(students: Iterable[StudentRow], path: str, subjects: List[str],
+                      compression: Optional[str] = "auto", buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    try:
+        count = 0
+        with open_export_stream(path, compression, buffer_size) as f:
             writer = csv.writer(f)
             writer.writerow(["ID", "Name"] + subjects)
-            for student in students:
-                row = [student.student_id, student.name]
-                row.extend(str(student.marks_by_subject.get(subj, 0)) for subj in subjects)
-                writer.writerow(row)
+            for row in students:
+                student = _as_student(row)
+                writer.writerow([student.student_id, student.name]
+                                + [str(student.marks_by_subject.get(subj, 0)) for subj in subjects])
+                count += 1
+        ROWS.inc(count, operation="export", backend="file")
+        return count
+    except (ImportError, ValueError):
+        raise
     except Exception as e:
         raise IOError(f"Failed to export to CSV: {e}")
 
-
+@timed
+def export_database(path: str, fmt: str = "jsonl", subjects: Optional[List[str]] = None,
+                    compression: Optional[str] = "auto", buffer_size: int = DEFAULT_BUFFER_SIZE,
+                    batch_size: int = 5000) -> int:
+    """Stream every student from the database straight into an export file."""
+    from . import db
+    rows = db.iter_students(batch_size)
+    if fmt == "json":
+        return stream_export_json(rows, path, compression, buffer_size)
+    if fmt == "jsonl":
+        return stream_export_jsonl(rows, path, compression, buffer_size)
+    if fmt == "csv":
+        from . import DEFAULT_SUBJECTS
+        return stream_export_csv(rows, path, subjects or list(DEFAULT_SUBJECTS), compression, buffer_size)
+    raise ValueError(f"Unsupported export format: {fmt}")
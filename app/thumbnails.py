@@ -0,0 +1,240 @@
+from __future__ import annotations
+import hashlib
+import os
+import queue
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
+
+from .metrics import CACHE_REQUESTS
+from .storage import DEFAULT_DATA_DIR
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageTk
+
+THUMBNAIL_DIR = os.path.join(DEFAULT_DATA_DIR, "cache", "thumbnails")
+MAIN_PHOTO_SIZE = (100, 100)
+PROFILE_PHOTO_SIZE = (180, 180)
+MAX_PHOTO_IMAGES = 256
+PHOTO_WORKERS = 2
+PHOTO_POLL_MS = 30
+
+Size = Tuple[int, int]
+PhotoCallback = Callable[[Optional["ImageTk.PhotoImage"]], None]
+
+
+class ThumbnailCache:
+    """Two-level cache of resized profile photos.
+
+    Thumbnails are keyed by source path, mtime, file size and target size. They are
+    kept as PNG files under ``cache_dir``, and the most recently used decoded
+    ``PhotoImage``s stay in memory. ``load_image`` is safe to call from worker
+    threads. ``photo`` must run on the Tk thread.
+    """
+
+    def __init__(self, cache_dir: str = THUMBNAIL_DIR, max_images: int = MAX_PHOTO_IMAGES) -> None:
+        self.cache_dir = cache_dir
+        self.max_images = max_images
+        self._photos: "OrderedDict[str, ImageTk.PhotoImage]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def cache_key(self, path: str, size: Size) -> Optional[str]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{size[0]}x{size[1]}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _thumbnail_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.png")
+
+    def load_image(self, path: str, size: Size, key: Optional[str] = None) -> Optional[Image.Image]:
+        """Return the resized image from disk, rendering and storing it on a miss."""
+        key = key or self.cache_key(path, size)
+        if key is None:
+            return None
+        from PIL import Image
+        cached = self._thumbnail_path(key)
+        if os.path.exists(cached):
+            try:
+                with Image.open(cached) as img:
+                    img.load()
+                    CACHE_REQUESTS.inc(cache="thumbnail_disk", result="hit")
+                    return img.copy()
+            except OSError:
+                pass
+        CACHE_REQUESTS.inc(cache="thumbnail_disk", result="miss")
+        img = self._render(path, size)
+        if img is not None:
+            self._store(cached, img)
+        return img
+
+    def _render(self, path: str, size: Size) -> Optional[Image.Image]:
+        from PIL import Image
+        try:
+            with Image.open(path) as img:
+                img.draft("RGB", size)
+                img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+                return img.resize(size, Image.Resampling.LANCZOS)
+        except (OSError, ValueError) as e:
+            print(f"Warning: could not load photo {path}: {e}")
+            return None
+
+    def _store(self, cached: str, img: Image.Image) -> None:
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            tmp = f"{cached}.{threading.get_ident()}.tmp"
+            img.save(tmp, format="PNG")
+            os.replace(tmp, cached)
+        except OSError as e:
+            print(f"Warning: could not write thumbnail cache: {e}")
+
+    def photo(self, path: str, size: Size) -> Optional[ImageTk.PhotoImage]:
+        """Return a ``PhotoImage`` for ``path`` at ``size``, or None when it cannot be loaded."""
+        key = self.cache_key(path, size)
+        if key is None:
+            return None
+        photo = self.cached_photo(key)
+        if photo is not None:
+            return photo
+        img = self.load_image(path, size, key)
+        return None if img is None else self.add_photo(key, img)
+
+    def cached_photo(self, key: str) -> Optional[ImageTk.PhotoImage]:
+        with self._lock:
+            photo = self._photos.get(key)
+            if photo is not None:
+                self._photos.move_to_end(key)
+        CACHE_REQUESTS.inc(cache="thumbnail_memory", result="miss" if photo is None else "hit")
+        return photo
+
+    def add_photo(self, key: str, img: Image.Image) -> ImageTk.PhotoImage:
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(img)
+        with self._lock:
+            self._photos[key] = photo
+            self._photos.move_to_end(key)
+            while len(self._photos) > self.max_images:
+                self._photos.popitem(last=False)
+        return photo
+
+    def clear(self) -> None:
+        with self._lock:
+            self._photos.clear()
+
+
+_default_cache: Optional[ThumbnailCache] = None
+
+
+def default_cache() -> ThumbnailCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ThumbnailCache()
+    return _default_cache
+
+
+class PhotoLoader:
+    """Look up and decode student photos on a thread pool, delivering them on the Tk thread.
+
+    Results are collected from a queue polled with ``after()``. Every decoded
+    photo goes into the cache's LRU. A callback only runs if its request was not
+    cancelled first, so ``cancel_all`` drops results that a newer selection made
+    stale.
+    """
+
+    def __init__(self, widget: tk.Misc, cache: Optional[ThumbnailCache] = None, workers: int = PHOTO_WORKERS,
+                 poll_ms: int = PHOTO_POLL_MS) -> None:
+        self.widget = widget
+        self.cache = cache or default_cache()
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="photo-loader")
+        self._results: "queue.Queue[Tuple[Tuple[str, Size], Future]]" = queue.Queue()
+        self._pending: Dict[Tuple[str, Size], Future] = {}
+        self._callbacks: Dict[Future, PhotoCallback] = {}
+        self._paths: Dict[str, Optional[str]] = {}
+        self._poll_id = None
+
+    def photo_path(self, student_id: str) -> Optional[str]:
+        if student_id not in self._paths:
+            from .db import get_profile
+            profile = get_profile(student_id)
+            self._paths[student_id] = (profile or {}).get("photo_path") or None
+        return self._paths[student_id]
+
+    def forget(self, student_id: Optional[str] = None) -> None:
+        """Drop the remembered photo path for one student, or for all of them."""
+        if student_id is None:
+            self._paths.clear()
+        else:
+            self._paths.pop(student_id, None)
+
+    def cached(self, student_id: str, size: Size) -> Optional[ImageTk.PhotoImage]:
+        """The in-memory photo if the path is already known and decoded, without any I/O beyond a stat."""
+        path = self._paths.get(student_id)
+        key = self.cache.cache_key(path, size) if path else None
+        return self.cache.cached_photo(key) if key else None
+
+    def request(self, student_id: str, size: Size, callback: Optional[PhotoCallback] = None) -> None:
+        key = (student_id, size)
+        future = self._pending.get(key)
+        if future is not None and not future.cancelled():
+            if callback is not None:
+                self._callbacks[future] = callback
+            return
+        future = self._executor.submit(self._load, student_id, size)
+        self._pending[key] = future
+        if callback is not None:
+            self._callbacks[future] = callback
+        future.add_done_callback(lambda f, key=key: self._results.put((key, f)))
+        if self._poll_id is None:
+            self._poll_id = self.widget.after(self.poll_ms, self._poll)
+
+    def cancel_all(self, keep: Iterable[Tuple[str, Size]] = ()) -> None:
+        keep = set(keep)
+        for key, future in list(self._pending.items()):
+            if key not in keep:
+                future.cancel()
+                self._callbacks.pop(future, None)
+
+    def _load(self, student_id: str, size: Size) -> Optional[Tuple[str, Optional[Image.Image]]]:
+        path = self.photo_path(student_id)
+        key = self.cache.cache_key(path, size) if path else None
+        if key is None:
+            return None
+        if self.cache.cached_photo(key) is not None:
+            return key, None
+        img = self.cache.load_image(path, size, key)
+        return None if img is None else (key, img)
+
+    def _poll(self) -> None:
+        while True:
+            try:
+                key, future = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self._pending.get(key) is future:
+                del self._pending[key]
+            callback = self._callbacks.pop(future, None)
+            if future.cancelled():
+                continue
+            photo = None
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Warning: photo loading failed: {e}")
+                result = None
+            if result is not None:
+                cache_key, img = result
+                photo = self.cache.cached_photo(cache_key) if img is None else self.cache.add_photo(cache_key, img)
+            if callback is not None:
+                callback(photo)
+        self._poll_id = self.widget.after(self.poll_ms, self._poll) if self._pending else None
+
+    def shutdown(self) -> None:
+        if self._poll_id is not None:
+            self.widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,5 @@
+from __future__ import annotations
+
+from .virtual_table import VirtualTable
+
+__all__ = ['VirtualTable']
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+RowFormatter = Callable[[Any], Tuple[Sequence[Any], Tuple[str, ...]]]
+KeyFunc = Callable[[Any], str]
+
+class VirtualTable:
+    """Drive an existing Treeview as a window over a large row sequence.
+
+    Only the visible rows (plus ``overscan``) exist as Treeview items. They are
+    reused across scrolls and refreshes, and the scrollbar is mapped to row
+    offsets in ``rows``. ``rows`` can be any sequence that supports ``len()``
+    and slicing.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar, format_row: RowFormatter,
+                 key: KeyFunc, on_scroll: Optional[Callable[[float, float], None]] = None,
+                 overscan: int = 10) -> None:
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.format_row = format_row
+        self.key = key
+        self.on_scroll = on_scroll or scrollbar.set
+        self.overscan = overscan
+        self.rows: Sequence[Any] = []
+        self.offset = 0
+        self.active = False
+        self.selected_key: Optional[str] = None
+        self._pool: List[str] = []
+        self._window: Sequence[Any] = []
+        self._bindings: List[Tuple[str, str]] = []
+        self._saved_yscroll = ""
+
+    def activate(self) -> None:
+        if self.active:
+            return
+        self.active = True
+        self.tree.delete(*self.tree.get_children())
+        self._saved_yscroll = self.tree.cget("yscrollcommand")
+        self.tree.configure(yscrollcommand="")
+        self.scrollbar.configure(command=self.yview)
+        for sequence, handler in [
+            ("<MouseWheel>", self._on_wheel), ("<Button-4>", self._on_wheel), ("<Button-5>", self._on_wheel),
+            ("<Up>", self._on_key), ("<Down>", self._on_key), ("<Prior>", self._on_key),
+            ("<Next>", self._on_key), ("<Home>", self._on_key), ("<End>", self._on_key),
+            ("<Configure>", lambda _e: self.render()), ("<<TreeviewSelect>>", self._on_select),
+        ]:
+            self._bindings.append((sequence, self.tree.bind(sequence, handler, add="+")))
+
+    def deactivate(self) -> None:
+        if not self.active:
+            return
+        self.active = False
+        for sequence, funcid in self._bindings:
+            self.tree.unbind(sequence, funcid)
+        self._bindings = []
+        self.tree.delete(*self._pool)
+        self._pool = []
+        self._window = []
+        self.rows = []
+        self.scrollbar.configure(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._saved_yscroll)
+
+    def set_rows(self, rows: Sequence[Any]) -> None:
+        """Swap in a new row sequence, keeping the scroll offset where possible."""
+        self.rows = rows
+        self.render()
+
+    def visible_count(self) -> int:
+        height = self.tree.winfo_height()
+        if height <= 1:
+            height = int(self.tree.cget("height") or 10) * self._row_height()
+        return max(1, (height - self._row_height()) // self._row_height())
+
+    def _row_height(self) -> int:
+        style = self.tree.cget("style") or "Treeview"
+        try:
+            return int(ttk.Style().lookup(style, "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            return 20
+
+    def render(self) -> None:
+        """Bind the pooled items to the rows at the current offset."""
+        if not self.active:
+            return
+        total = len(self.rows)
+        visible = self.visible_count()
+        self.offset = max(0, min(self.offset, total - visible))
+        window = self.rows[self.offset:self.offset + visible + self.overscan]
+        self._window = window
+
+        while len(self._pool) < len(window):
+            self._pool.append(self.tree.insert("", tk.END))
+        while len(self._pool) > len(window):
+            self.tree.delete(self._pool.pop())
+
+        selected = None
+        for iid, row in zip(self._pool, window):
+            values, tags = self.format_row(row)
+            self.tree.item(iid, values=values, tags=tags)
+            if self.selected_key is not None and self.key(row) == self.selected_key:
+                selected = iid
+        current = self.tree.selection()
+        if selected is None and current:
+            self.tree.selection_remove(*current)
+        elif selected is not None and current != (selected,):
+            self.tree.selection_set(selected)
+        if total:
+            self.on_scroll(self.offset / total, min(1.0, (self.offset + visible) / total))
+        else:
+            self.on_scroll(0.0, 1.0)
+
+    def scroll_to(self, offset: int) -> None:
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def yview(self, *args) -> None:
+        """Scrollbar command: ``moveto fraction`` or ``scroll n units|pages``."""
+        if not args:
+            return
+        total = len(self.rows)
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = self.visible_count() if args[2].startswith("page") else 1
+            self.scroll_to(max(0, self.offset + int(args[1]) * step))
+
+    def _on_wheel(self, event) -> str:
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.yview("scroll", -3, "units")
+        else:
+            self.yview("scroll", 3, "units")
+        return "break"
+
+    def _on_key(self, event) -> str:
+        visible = self.visible_count()
+        moves = {"Up": -1, "Down": 1, "Prior": -visible, "Next": visible}
+        if event.keysym == "Home":
+            self.scroll_to(0)
+        elif event.keysym == "End":
+            self.scroll_to(len(self.rows))
+        else:
+            self._move_selection(moves[event.keysym])
+        return "break"
+
+    def _move_selection(self, delta: int) -> None:
+        if not self.rows:
+            return
+        current = self.tree.selection()
+        index = self._pool.index(current[0]) + self.offset if current and current[0] in self._pool else self.offset - 1
+        index = max(0, min(len(self.rows) - 1, index + delta))
+        visible = self.visible_count()
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + visible:
+            self.offset = index - visible + 1
+        self.selected_key = self.key(self.rows[index])
+        self.render()
+
+    def _on_select(self, _event=None) -> None:
+        current = self.tree.selection()
+        if current and current[0] in self._pool:
+            index = self._pool.index(current[0])
+            if index < len(self._window):
+                self.selected_key = self.key(self._window[index])
@@ -1,6 +1,22 @@
 from __future__ import annotations
 
-from .statistics_window import StatisticsWindow
-from .profile_window import ProfileWindow
+from importlib import import_module
+from typing import Any
 
-__all__ = ['StatisticsWindow', 'ProfileWindow']
+_MODULES = {
+    'StatisticsWindow': '.statistics_window',
+    'ProfileWindow': '.profile_window',
+    'ImportProgressWindow': '.import_progress_window',
+    'DiagnosticsWindow': '.diagnostics_window',
+}
+
+__all__ = ['StatisticsWindow', 'ProfileWindow', 'ImportProgressWindow', 'DiagnosticsWindow']
+
+
+def __getattr__(name: str) -> Any:
+    # Each window pulls in its own heavy dependencies, so load it on first use.
+    if name in _MODULES:
+        value = getattr(import_module(_MODULES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from typing import Any, Dict
+
+from .. import metrics
+
+CACHES = ["thumbnail_memory", "thumbnail_disk", "statistics_chart", "roster_pages"]
+
+
+class DiagnosticsWindow(tk.Toplevel):
+
+    REFRESH_MS = 1000
+
+    def __init__(self, parent: tk.Tk) -> None:
+        super().__init__(parent)
+        self.title("Diagnostics")
+        self.geometry("900x560")
+        self.configure(bg='#f0f0f0')
+        self.minsize(700, 400)
+
+        container = ttk.Frame(self, padding=12)
+        container.pack(fill=tk.BOTH, expand=True)
+
+        self.lbl_caches = ttk.Label(container, text="", font=('Segoe UI', 10))
+        self.lbl_caches.pack(anchor=tk.W, pady=(0, 8))
+
+        columns = ("labels", "count", "mean", "p95", "total")
+        table = ttk.Frame(container)
+        table.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table, columns=columns, show="tree headings")
+        self.tree.heading("#0", text="Metric")
+        self.tree.heading("labels", text="Labels")
+        self.tree.heading("count", text="Count / Value")
+        self.tree.heading("mean", text="Mean")
+        self.tree.heading("p95", text="p95 ≤")
+        self.tree.heading("total", text="Total time")
+        self.tree.column("#0", width=230)
+        self.tree.column("labels", width=230)
+        for column in columns[1:]:
+            self.tree.column(column, width=95, anchor=tk.E)
+        scrollbar = ttk.Scrollbar(table, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        buttons = ttk.Frame(container)
+        buttons.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(buttons, text="💾 Export...", command=self._on_export).pack(side=tk.RIGHT)
+        ttk.Button(buttons, text="🧹 Reset", command=self._on_reset).pack(side=tk.RIGHT, padx=6)
+        ttk.Button(buttons, text="🔄 Refresh", command=self.refresh).pack(side=tk.RIGHT)
+
+        self._open: Dict[str, bool] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Redraw the table from the current metrics and schedule the next refresh."""
+        if not self.winfo_exists():
+            return
+        rates = []
+        for cache in CACHES:
+            rate = metrics.cache_hit_rate(cache)
+            if rate is not None:
+                rates.append(f"{cache} {rate * 100:.0f}%")
+        self.lbl_caches.config(text="Cache hit rates: " + (" · ".join(rates) if rates else "no lookups yet"))
+
+        for item in self.tree.get_children():
+            self._open[item] = bool(self.tree.item(item, "open"))
+        self.tree.delete(*self.tree.get_children())
+        for name, metric in metrics.REGISTRY.snapshot()["metrics"].items():
+            parent = self.tree.insert("", tk.END, iid=name, text=name, open=self._open.get(name, False))
+            for series in metric["series"]:
+                self.tree.insert(parent, tk.END, text="", values=self._row(metric["type"], series))
+        self.after(self.REFRESH_MS, self.refresh)
+
+    def _row(self, kind: str, series: Dict[str, Any]) -> tuple:
+        labels = ", ".join(f"{k}={v}" for k, v in series["labels"].items())
+        if kind == "counter":
+            return (labels, f"{series['value']:,.0f}", "", "", "")
+        return (labels, f"{series['count']:,}", _format_seconds(series["mean"]),
+                _format_seconds(series["p95"]), _format_seconds(series["sum"]))
+
+    def _on_reset(self) -> None:
+        metrics.REGISTRY.reset()
+        self.tree.delete(*self.tree.get_children())
+
+    def _on_export(self) -> None:
+        filename = filedialog.asksaveasfilename(
+            parent=self,
+            title="Export Metrics",
+            defaultextension=".json",
+            filetypes=[("JSON snapshot", "*.json"), ("Prometheus text", "*.prom"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        try:
+            metrics.write_snapshot(filename)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to export metrics:\n{e}", parent=self)
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.2f} s"
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable
+
+class ImportProgressWindow(tk.Toplevel):
+    
+    def __init__(self, parent: tk.Tk, title: str, on_cancel: Callable[[], None]) -> None:
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("460x170")
+        self.configure(bg='#f0f0f0')
+        self.resizable(False, False)
+        self.transient(parent)
+        self.protocol("WM_DELETE_WINDOW", on_cancel)
+        
+        container = ttk.Frame(self, padding=20)
+        container.pack(fill=tk.BOTH, expand=True)
+        
+        self.lbl_status = ttk.Label(container, text="Reading file...", font=('Segoe UI', 10, 'bold'))
+        self.lbl_status.pack(anchor=tk.W)
+        
+        self.progress = ttk.Progressbar(container, mode='determinate', maximum=100, length=420)
+        self.progress.pack(fill=tk.X, pady=10)
+        
+        self.lbl_rate = ttk.Label(container, text="0 rows · 0 rows/s · 0 errors")
+        self.lbl_rate.pack(anchor=tk.W)
+        
+        self.btn_cancel = ttk.Button(container, text="✖️ Cancel", command=on_cancel)
+        self.btn_cancel.pack(anchor=tk.E, pady=(10, 0))
+    
+    def update_progress(self, fraction: float, rows: int, rows_per_second: float, errors: int) -> None:
+        self.progress['value'] = max(0.0, min(1.0, fraction)) * 100
+        self.lbl_status.config(text=f"Importing... {fraction * 100:.0f}%")
+        self.lbl_rate.config(text=f"{rows:,} rows · {rows_per_second:,.0f} rows/s · {errors:,} errors")
+    
+    def set_cancelling(self) -> None:
+        self.lbl_status.config(text="Cancelling...")
+        self.btn_cancel.state(['disabled'])
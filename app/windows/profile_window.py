@@ -3,8 +3,8 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk
 from typing import Dict
-import os
-from PIL import Image, ImageTk
+
+from ..thumbnails import PROFILE_PHOTO_SIZE, default_cache
 
 class ProfileWindow(tk.Toplevel):
     
@@ -60,11 +60,9 @@ class ProfileWindow(tk.Toplevel):
         photo_frame.pack(pady=(0, 15))
         
         photo_path = profile_data.get('photo_path', '')
-        if photo_path and os.path.exists(photo_path):
+        photo = default_cache().photo(photo_path, PROFILE_PHOTO_SIZE) if photo_path else None
+        if photo is not None:
             try:
-                img = Image.open(photo_path)
-                img = img.resize((180, 180), Image.Resampling.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
                 photo_label = tk.Label(photo_frame, image=photo, bg='white')
                 photo_label.image = photo
                 photo_label.pack(padx=10, pady=10)
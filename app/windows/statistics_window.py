@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import threading
 import tkinter as tk
 from tkinter import ttk
-from typing import Dict
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from typing import Dict, Optional, Tuple
+
+from ..charts import chart_for
+from ..metrics import CACHE_REQUESTS
 
 class StatisticsWindow(tk.Toplevel):
     
+    POLL_MS = 50
+    RESIZE_DEBOUNCE_MS = 200
+    
     def __init__(self, parent: tk.Tk, manager) -> None:
         super().__init__(parent)
         self.title("Class Statistics")
@@ -18,143 +21,79 @@ class StatisticsWindow(tk.Toplevel):
         self.resizable(True, True)
         self.minsize(1000, 700)
         
-        stats = manager.statistics()
-        
         header = tk.Frame(self, bg='#2c3e50', height=50)
         header.pack(fill=tk.X)
         tk.Label(header, text="📊 Class Statistics", font=('Segoe UI', 16, 'bold'), 
                 bg='#2c3e50', fg='white', pady=12).pack()
         
-                                   
         main_container = ttk.Frame(self)
         main_container.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
-        
-                       
-        self._create_graphs(main_container, stats)
+        # No border or padding, so an image rendered at the label's size does not make it grow.
+        self.chart_label = tk.Label(main_container, text="⏳ Rendering charts...", font=('Segoe UI', 12),
+                                    bg='#f0f0f0', fg='#7f8c8d', bd=0, padx=0, pady=0, highlightthickness=0)
+        self.chart_label.pack(fill=tk.BOTH, expand=True)
+        self.chart_image = None
+        self.stats: Dict = {}
+        
+        # The chart is drawn from one snapshot; resizing re-lays it out at the new size.
+        self.chart = chart_for(manager)
+        self.version = manager.version
+        self.students = manager.list_students()
+        self._size: Optional[Tuple[int, int]] = None
+        self._resize_after: Optional[str] = None
+        self._worker: Optional[threading.Thread] = None
+        self.chart_label.bind("<Configure>", self._on_resize)
     
-    def _create_graphs(self, parent: ttk.Frame, stats: Dict) -> None:
-        """Create visualization graphs."""
-                                     
-        fig = Figure(figsize=(10, 9), facecolor='#f0f0f0')
-        
-                                                         
-        ax1 = fig.add_subplot(2, 2, (1, 2))
-        grade_counts = stats.get('students_by_grade', {})
-        if grade_counts:
-            grades = list(grade_counts.keys())
-            counts = list(grade_counts.values())
-            colors = ['#27ae60', '#3498db', '#f39c12', '#e67e22', '#e74c3c']
-            wedges, texts, autotexts = ax1.pie(counts, labels=grades, autopct='%1.1f%%', 
-                                                startangle=90, colors=colors, textprops={'fontsize': 13})
-                                                  
-            for autotext in autotexts:
-                autotext.set_color('white')
-                autotext.set_fontsize(12)
-                autotext.set_fontweight('bold')
-                                
-            for text in texts:
-                text.set_fontsize(14)
-                text.set_fontweight('bold')
-            ax1.set_title('Grade Distribution', fontsize=14, fontweight='bold', pad=15)
-        
-                                         
-        ax2 = fig.add_subplot(2, 2, 3)
-        subject_avgs = stats.get('subject_averages', {})
-        if subject_avgs:
-            subjects = list(subject_avgs.keys())
-            averages = list(subject_avgs.values())
-            bars = ax2.barh(subjects, averages, color='#3498db')
-            ax2.set_xlabel('Average (%)', fontsize=11)
-            ax2.set_title('Subject Averages', fontsize=13, fontweight='bold', pad=10)
-            ax2.set_xlim(0, 100)
-            ax2.tick_params(axis='both', labelsize=10)
-            
-                                      
-            for i, bar in enumerate(bars):
-                width = bar.get_width()
-                ax2.text(width + 1, bar.get_y() + bar.get_height()/2, 
-                        f'{averages[i]:.1f}%', va='center', fontsize=10, fontweight='bold')
-        
-                                                            
-        ax3 = fig.add_subplot(2, 2, 4)
-        top_performers = stats.get('top_performers', [])
-        bottom_performers = stats.get('bottom_performers', [])
-        
-        if top_performers or bottom_performers:
-            performers = []
-            scores = []
-            colors_perf = []
-            
-                                
-            for name, avg in top_performers[:5]:
-                performers.append(f"{name} (Top)")
-                scores.append(avg)
-                colors_perf.append('#27ae60')
-            
-                                   
-            for name, avg in bottom_performers[:5]:
-                performers.append(f"{name} (Low)")
-                scores.append(avg)
-                colors_perf.append('#e74c3c')
-            
-            if performers:
-                y_pos = range(len(performers))
-                bars = ax3.barh(y_pos, scores, color=colors_perf)
-                ax3.set_yticks(y_pos)
-                ax3.set_yticklabels(performers, fontsize=9)
-                ax3.set_xlabel('Average (%)', fontsize=11)
-                ax3.set_title('Top & Bottom Performers', fontsize=13, fontweight='bold', pad=10)
-                ax3.set_xlim(0, 100)
-                ax3.tick_params(axis='y', labelsize=9)
-                
-                                  
-                for i, bar in enumerate(bars):
-                    width = bar.get_width()
-                    ax3.text(width + 1, bar.get_y() + bar.get_height()/2, 
-                            f'{scores[i]:.1f}%', va='center', fontsize=9, fontweight='bold')
-        
-        fig.tight_layout(pad=2.5)
-        
-                                     
-        canvas = FigureCanvasTkAgg(fig, master=parent)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    def _on_resize(self, event) -> None:
+        size = (event.width, event.height)
+        if size == self._size:
+            return
+        self._size = size
+        if self._resize_after is not None:
+            self.after_cancel(self._resize_after)
+        delay = self.RESIZE_DEBOUNCE_MS if self.chart_image is not None else 0
+        self._resize_after = self.after(delay, self._render)
     
-    def _format_statistics(self, stats: Dict[str, object]) -> str:
-        lines = []
-        lines.append("=" * 60)
-        lines.append("CLASS STATISTICS")
-        lines.append("=" * 60)
-        lines.append("")
-        
-        lines.append(f"Total Students: {stats['total_students']}")
-        lines.append(f"Class Average: {stats['class_average']:.2f}%")
-        lines.append(f"Pass Rate: {stats['pass_rate']:.1f}%")
-        lines.append("")
-        
-        lines.append("Students by Grade:")
-        grade_counts = stats.get('students_by_grade', {})
-        for grade in sorted(grade_counts.keys(), reverse=True):
-            count = grade_counts[grade]
-            lines.append(f"  Grade {grade}: {count} student(s)")
-        lines.append("")
-        
-        lines.append("Subject Averages:")
-        subject_avgs = stats.get('subject_averages', {})
-        for subject, avg in sorted(subject_avgs.items()):
-            lines.append(f"  {subject}: {avg:.2f}%")
-        lines.append("")
-        
-        lines.append("Top 3 Performers:")
-        for i, (name, avg) in enumerate(stats.get('top_performers', []), 1):
-            lines.append(f"  {i}. {name}: {avg:.2f}%")
-        lines.append("")
-        
-        lines.append("Bottom 3 Performers:")
-        for i, (name, avg) in enumerate(stats.get('bottom_performers', []), 1):
-            lines.append(f"  {i}. {name}: {avg:.2f}%")
-        lines.append("")
-        
-        lines.append("=" * 60)
-        
-        return "\n".join(lines)
+    def _render(self) -> None:
+        """Show the chart at the current size, rendering it on a worker thread if it is not cached."""
+        self._resize_after = None
+        if self._worker is not None:
+            return
+        size = self._size
+        cached = self.chart.cached(self.version, size)
+        if cached is not None:
+            CACHE_REQUESTS.inc(cache="statistics_chart", result="hit")
+            self._show_chart(*cached)
+            return
+        outcome: Dict[str, object] = {}
+        
+        def run() -> None:
+            try:
+                outcome["result"] = self.chart.render(self.students, self.version, size)
+            except Exception as e:
+                outcome["error"] = e
+        
+        self._worker = threading.Thread(target=run, name="statistics-chart", daemon=True)
+        self._worker.start()
+        self.after(self.POLL_MS, self._poll_chart, outcome, size)
+    
+    def _poll_chart(self, outcome: Dict[str, object], size: Tuple[int, int]) -> None:
+        """Show the rendered chart once the worker finishes, then catch up with any resize since."""
+        if not self.winfo_exists():
+            return
+        if self._worker.is_alive():
+            self.after(self.POLL_MS, self._poll_chart, outcome, size)
+            return
+        self._worker = None
+        if "error" in outcome:
+            self.chart_label.config(text=f"Failed to render charts: {outcome['error']}")
+            return
+        self._show_chart(*outcome["result"])
+        if size != self._size and self._resize_after is None:
+            self._render()
+    
+    def _show_chart(self, stats: Dict, image: str) -> None:
+        """Display a pre-rendered chart image."""
+        self.stats = stats
+        self.chart_image = tk.PhotoImage(data=image)
+        self.chart_label.config(image=self.chart_image, text="")
@@ -0,0 +1,4 @@
+"""Benchmarks for the manager, grading, storage, import and database layers.
+
+Run ``python -m benchmarks --help``; see ``benchmarks/README.md``.
+"""
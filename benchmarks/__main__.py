@@ -0,0 +1,99 @@
+"""
+Run the benchmark suites and write the timings to a JSON file.
+
+Usage:
+    python -m benchmarks [--size 20000] [--seed 0] [--repeat N] [-k PATTERN] [--list] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from .harness import REGISTRY, Context, run_benchmark
+from . import suites  # noqa: F401  (registers the benchmarks)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+DEFAULT_SIZE = 20000
+
+
+def git_revision():
+    """Return ``(short commit, dirty)`` of the working tree, or ``("unknown", False)`` outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, bool(status)
+
+
+def format_time(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.2f} ms"
+    return f"{seconds:8.3f} s "
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="students in the synthetic roster")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, help="override the rounds of every benchmark")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains PATTERN")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<commit>-<size>.json)")
+    args = parser.parse_args()
+
+    selected = [b for b in REGISTRY if not args.pattern or args.pattern in b.name]
+    if args.list:
+        for bench in selected:
+            print(bench.name)
+        return 0
+
+    commit, dirty = git_revision()
+    context = Context(args.size, args.seed)
+    results = []
+    try:
+        for bench in selected:
+            result = run_benchmark(bench, context, args.repeat)
+            results.append(result)
+            if result.skipped:
+                print(f"{bench.name:40} skipped: {result.skipped}")
+            elif result.error:
+                print(f"{bench.name:40} ERROR: {result.error}")
+            else:
+                stats = result.stats
+                print(f"{bench.name:40} {format_time(stats['median'])}  (min {format_time(stats['min']).strip()}, "
+                      f"{len(result.times)} rounds)")
+    finally:
+        context.close()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}-{args.size}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "dirty": dirty,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "size": args.size,
+                "seed": args.seed,
+            },
+            "results": [r.to_dict() for r in results],
+        }, f, indent=2)
+    print(f"\nResults written to {output}")
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
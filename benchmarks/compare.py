@@ -0,0 +1,62 @@
+"""
+Compare two benchmark result files and fail on regressions.
+
+Usage:
+    python -m benchmarks.compare BASE.json HEAD.json [--threshold 1.10]
+
+A benchmark regresses when its median in HEAD is more than ``threshold`` times
+its median in BASE. Benchmarks missing, skipped or failed on either side are
+listed but never fail the comparison.
+"""
+
+import argparse
+import json
+import sys
+
+DEFAULT_THRESHOLD = 1.10
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("meta", {}), {r["name"]: r for r in data.get("results", [])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="head/base median ratio that counts as a regression")
+    args = parser.parse_args()
+
+    base_meta, base = load(args.base)
+    head_meta, head = load(args.head)
+    if base_meta.get("size") != head_meta.get("size"):
+        print(f"Warning: roster sizes differ ({base_meta.get('size')} vs {head_meta.get('size')})")
+
+    print(f"{'benchmark':40} {'base':>12} {'head':>12} {'ratio':>7}")
+    regressions = []
+    for name in sorted(set(base) | set(head)):
+        old, new = base.get(name), head.get(name)
+        if not old or not new or "median" not in old or "median" not in new:
+            print(f"{name:40} {'n/a':>12} {'n/a':>12}")
+            continue
+        ratio = new["median"] / old["median"] if old["median"] else float("inf")
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / args.threshold:
+            flag = "  faster"
+        print(f"{name:40} {old['median'] * 1e3:10.3f}ms {new['median'] * 1e3:10.3f}ms {ratio:7.2f}{flag}")
+
+    if regressions:
+        print(f"\n✗ {len(regressions)} benchmark(s) slower than {args.threshold:.2f}x: {', '.join(regressions)}")
+        return 1
+    print("\n✓ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
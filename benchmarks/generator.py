@@ -0,0 +1,89 @@
+"""Deterministic synthetic rosters for the benchmark suites."""
+
+from __future__ import annotations
+
+import csv
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from app import DEFAULT_SUBJECTS
+from app.models import Student
+
+FIRST_NAMES = ["Amina", "Ben", "Chen", "Dana", "Elif", "Farid", "Grace", "Hiro", "Ines", "Jonas",
+               "Kavya", "Liam", "Maya", "Noor", "Omar", "Priya", "Quinn", "Rosa", "Sami", "Tara"]
+LAST_NAMES = ["Ahmed", "Brown", "Costa", "Diaz", "Evans", "Fischer", "Garcia", "Hossain", "Ito", "Jensen",
+              "Khan", "Lopez", "Muller", "Nguyen", "O'Brien", "Patel", "Rahman", "Silva", "Tanaka", "Smith-Jones"]
+DEPARTMENTS = ["CSE", "EEE", "BBA", "Physics", "Mathematics", "English"]
+GENDERS = ["Female", "Male"]
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-"]
+
+
+@dataclass
+class Roster:
+    """A generated roster: students plus the profiles of the fraction that have one."""
+
+    students: List[Student]
+    profiles: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    subjects: List[str] = field(default_factory=list)
+
+
+def generate_roster(n: int, subjects: Sequence[str] = DEFAULT_SUBJECTS, profile_rate: float = 0.3,
+                    missing_mark_rate: float = 0.0, seed: int = 0) -> Roster:
+    """Build ``n`` students with the same content for the same arguments on every run and platform.
+
+    Marks follow a clipped normal distribution around 65 so every grade bucket is populated.
+    ``missing_mark_rate`` drops individual marks; ``profile_rate`` of students get a profile.
+    """
+    rng = random.Random(seed)
+    students: List[Student] = []
+    profiles: Dict[str, Dict[str, Any]] = {}
+    width = max(6, len(str(n)))
+    for i in range(n):
+        sid = f"S{i:0{width}d}"
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        marks = {}
+        for subject in subjects:
+            if missing_mark_rate and rng.random() < missing_mark_rate:
+                continue
+            marks[subject] = round(min(100.0, max(0.0, rng.gauss(65, 15))), 2)
+        students.append(Student(student_id=sid, name=name, marks_by_subject=marks))
+        if rng.random() < profile_rate:
+            profiles[sid] = {
+                "student_id": sid,
+                "photo_path": None,
+                "date_of_birth": f"{rng.randint(1998, 2006)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "gender": rng.choice(GENDERS),
+                "blood_group": rng.choice(BLOOD_GROUPS),
+                "department": rng.choice(DEPARTMENTS),
+                "session": f"{rng.randint(2019, 2024)}-{rng.randint(20, 25)}",
+                "semester": str(rng.randint(1, 8)),
+                "email": f"{sid.lower()}@example.edu",
+            }
+    return Roster(students, profiles, list(subjects))
+
+
+def write_json(roster: Roster, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([s.to_dict() for s in roster.students], f)
+
+
+def write_csv(roster: Roster, path: str, subjects: Optional[Sequence[str]] = None) -> None:
+    """Wide CSV in the import format: ``ID, Name, <subject>...``."""
+    subjects = list(subjects or roster.subjects)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["ID", "Name", *subjects])
+        for s in roster.students:
+            writer.writerow([s.student_id, s.name, *(s.marks_by_subject.get(subj, "") for subj in subjects)])
+
+
+def write_long_csv(roster: Roster, path: str) -> None:
+    """Long CSV in the import format: one ``student_id, name, subject, marks`` row per mark."""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["student_id", "name", "subject", "marks"])
+        for s in roster.students:
+            for subject, mark in s.marks_by_subject.items():
+                writer.writerow([s.student_id, s.name, subject, mark])
@@ -0,0 +1,125 @@
+"""Minimal asv-style benchmark registry and timer.
+
+A benchmark is a function registered with ``@benchmark``. Its optional ``setup``
+receives the shared ``Context`` and returns the argument the benchmark is
+called with; setup time is never measured. Each benchmark runs ``repeat``
+rounds of ``number`` calls, and the per-call time of every round is recorded.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .generator import Roster, generate_roster
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup when the benchmark cannot run here (e.g. no database)."""
+
+
+@dataclass
+class Context:
+    """Parameters and lazily generated data shared by every benchmark in a run."""
+
+    size: int
+    seed: int = 0
+    profile_rate: float = 0.3
+    _roster: Optional[Roster] = None
+    _workdir: Optional[str] = None
+
+    @property
+    def roster(self) -> Roster:
+        if self._roster is None:
+            self._roster = generate_roster(self.size, profile_rate=self.profile_rate, seed=self.seed)
+        return self._roster
+
+    def path(self, name: str) -> str:
+        """A path for ``name`` inside this run's scratch directory."""
+        if self._workdir is None:
+            self._workdir = tempfile.mkdtemp(prefix="sgm-bench-")
+        return os.path.join(self._workdir, name)
+
+    def close(self) -> None:
+        if self._workdir is not None:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[Any], Any]
+    setup: Optional[Callable[[Context], Any]] = None
+    number: int = 1
+    repeat: int = 5
+
+
+@dataclass
+class Result:
+    name: str
+    times: List[float] = field(default_factory=list)
+    skipped: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        if not self.times:
+            return {}
+        return {
+            "min": min(self.times),
+            "median": statistics.median(self.times),
+            "mean": statistics.fmean(self.times),
+            "stdev": statistics.stdev(self.times) if len(self.times) > 1 else 0.0,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(self.stats)
+        return data
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(name: Optional[str] = None, setup: Optional[Callable[[Context], Any]] = None,
+              number: int = 1, repeat: int = 5) -> Callable[[Callable[[Any], Any]], Callable[[Any], Any]]:
+    """Register ``func`` as ``<module suffix>.<name>``, e.g. ``manager.statistics``."""
+    def decorate(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        suite = func.__module__.rsplit(".", 1)[-1].removeprefix("bench_")
+        REGISTRY.append(Benchmark(f"{suite}.{name or func.__name__.removeprefix('bench_')}",
+                                  func, setup, number, repeat))
+        return func
+    return decorate
+
+
+def run_benchmark(bench: Benchmark, context: Context, repeat: Optional[int] = None) -> Result:
+    result = Result(bench.name)
+    try:
+        arg = bench.setup(context) if bench.setup else context
+    except SkipBenchmark as e:
+        result.skipped = str(e)
+        return result
+    except Exception as e:
+        result.error = f"setup failed: {e!r}"
+        return result
+    try:
+        for _ in range(repeat or bench.repeat):
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                for _ in range(bench.number):
+                    bench.func(arg)
+                result.times.append((time.perf_counter() - start) / bench.number)
+            finally:
+                gc.enable()
+    except Exception as e:
+        result.error = repr(e)
+    return result
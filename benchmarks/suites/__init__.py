@@ -0,0 +1,5 @@
+"""Benchmark suites; importing this package registers every benchmark."""
+
+from . import bench_db, bench_grading, bench_importers, bench_manager, bench_storage
+
+__all__ = ["bench_db", "bench_grading", "bench_importers", "bench_manager", "bench_storage"]
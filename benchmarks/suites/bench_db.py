@@ -0,0 +1,102 @@
+"""Database benchmarks against a dedicated MySQL schema named by ``SGM_BENCH_DB``.
+
+The schema is wiped and refilled with the synthetic roster, so never point it at
+real data. Without ``SGM_BENCH_DB`` (or without a reachable server) these are skipped.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, List, Tuple
+
+from ..generator import write_csv
+from ..harness import Context, SkipBenchmark, benchmark
+
+_prepared: List[Tuple[int, int]] = []
+
+
+def _database(ctx: Context) -> Any:
+    name = os.getenv("SGM_BENCH_DB")
+    if not name:
+        raise SkipBenchmark("set SGM_BENCH_DB to a scratch MySQL database to run database benchmarks")
+    try:
+        from app import db
+        from app.config import DB_CONFIG
+    except ImportError as e:
+        raise SkipBenchmark(f"MySQL driver not available: {e}")
+    DB_CONFIG["database"] = name
+    if (ctx.size, ctx.seed) not in _prepared:
+        try:
+            db.init_database()
+        except Exception as e:
+            raise SkipBenchmark(f"MySQL not reachable: {e}")
+        db.clear_all_data()
+        db.upsert_students([(s.student_id, s.name, s.marks_by_subject, s.content_hash())
+                            for s in ctx.roster.students])
+        _prepared[:] = [(ctx.size, ctx.seed)]
+    return db
+
+
+def _rows(ctx: Context) -> Tuple[Any, list]:
+    return _database(ctx), [(s.student_id, s.name, s.marks_by_subject, s.content_hash())
+                            for s in ctx.roster.students]
+
+
+def _csv(ctx: Context) -> Tuple[Any, str]:
+    db = _database(ctx)
+    path = ctx.path("bulk.csv")
+    write_csv(ctx.roster, path)
+    return db, path
+
+
+@benchmark(setup=_rows, repeat=3)
+def bench_upsert_students(args: Tuple[Any, list]) -> None:
+    db, rows = args
+    db.upsert_students(rows)
+
+
+@benchmark(setup=_csv, repeat=3)
+def bench_bulk_load_csv_unchanged(args: Tuple[Any, str]) -> None:
+    db, path = args
+    db.bulk_load_csv(path, use_local_infile=False)
+
+
+@benchmark(setup=_database, repeat=3)
+def bench_get_all_students(db: Any) -> None:
+    db.get_all_students()
+
+
+@benchmark(setup=_database, repeat=3)
+def bench_iter_students(db: Any) -> None:
+    for _ in db.iter_students():
+        pass
+
+
+@benchmark(setup=_database)
+def bench_content_hashes(db: Any) -> None:
+    db.get_content_hashes()
+
+
+@benchmark(setup=_database, number=10)
+def bench_search_students(db: Any) -> None:
+    db.search_students("smith")
+
+
+@benchmark(setup=_database, number=10)
+def bench_top_100_by_average(db: Any) -> None:
+    from app.query import StudentQuery
+    StudentQuery.database().order_by("average", descending=True).page(100)
+
+
+@benchmark(setup=_database, number=10)
+def bench_keyset_page_by_name(db: Any) -> None:
+    from app.query import StudentQuery
+    query = StudentQuery.database().order_by("name")
+    rows, cursor = query.page(200)
+    if cursor is not None:
+        query.page(200, cursor)
+
+
+@benchmark(setup=_database, number=10)
+def bench_class_average(db: Any) -> None:
+    db.class_average()
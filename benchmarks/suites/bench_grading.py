@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from app import DEFAULT_GRADE_SCALE
+from app.grading import compute_grade, validate_columns, validate_records
+
+from ..harness import Context, benchmark
+
+
+def _averages(ctx: Context) -> List[float]:
+    return [s.average() for s in ctx.roster.students]
+
+
+def _records(ctx: Context) -> List[Dict[str, Any]]:
+    return [s.to_dict() for s in ctx.roster.students]
+
+
+def _columns(ctx: Context) -> Dict[str, Any]:
+    students = ctx.roster.students
+    return {
+        "ids": [s.student_id for s in students],
+        "names": [s.name for s in students],
+        "marks": {subject: [s.marks_by_subject.get(subject) for s in students] for subject in ctx.roster.subjects},
+    }
+
+
+@benchmark(setup=_averages)
+def bench_compute_grade(averages: List[float]) -> None:
+    for avg in averages:
+        compute_grade(avg, DEFAULT_GRADE_SCALE)
+
+
+@benchmark(setup=_records)
+def bench_validate_records(records: List[Dict[str, Any]]) -> None:
+    validate_records(records)
+
+
+@benchmark(setup=_columns)
+def bench_validate_columns(columns: Dict[str, Any]) -> None:
+    validate_columns(columns["ids"], columns["names"], columns["marks"])
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import List
+
+from app.importers import iter_csv_batches, iter_json_batches, iter_long_batches, parallel_import_csv
+from app.manager import StudentManager
+
+from ..generator import write_csv, write_json, write_long_csv
+from ..harness import Context, benchmark
+
+
+def _csv(ctx: Context) -> str:
+    path = ctx.path("import.csv")
+    write_csv(ctx.roster, path)
+    return path
+
+
+def _json(ctx: Context) -> str:
+    path = ctx.path("import.json")
+    write_json(ctx.roster, path)
+    return path
+
+
+def _long_csv(ctx: Context) -> str:
+    path = ctx.path("import_long.csv")
+    write_long_csv(ctx.roster, path)
+    return path
+
+
+def _drain(batches) -> int:
+    rows = 0
+    for batch in batches:
+        rows += len(batch.students)
+    return rows
+
+
+@benchmark(setup=_csv, repeat=3)
+def bench_csv_batches(path: str) -> None:
+    _drain(iter_csv_batches(path))
+
+
+@benchmark(setup=_csv, repeat=3)
+def bench_parallel_import_csv(path: str) -> None:
+    parallel_import_csv(path, StudentManager())
+
+
+@benchmark(setup=_json, repeat=3)
+def bench_json_batches(path: str) -> None:
+    _drain(iter_json_batches(path))
+
+
+@benchmark(setup=_long_csv, repeat=3)
+def bench_long_batches(path: str) -> None:
+    _drain(iter_long_batches(path))
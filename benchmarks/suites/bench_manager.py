@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+from app.manager import StudentManager
+from app.models import Student
+
+from ..harness import Context, benchmark
+
+
+def _students(ctx: Context) -> List[Student]:
+    return ctx.roster.students
+
+
+def _manager(ctx: Context) -> StudentManager:
+    return StudentManager(ctx.roster.students)
+
+
+def _manager_and_students(ctx: Context) -> Tuple[StudentManager, List[Student]]:
+    return StudentManager(ctx.roster.students), ctx.roster.students
+
+
+@benchmark(setup=_students)
+def bench_build(students: List[Student]) -> None:
+    StudentManager(students)
+
+
+@benchmark(setup=_students)
+def bench_bulk_import_new(students: List[Student]) -> None:
+    StudentManager().bulk_import(students)
+
+
+@benchmark(setup=_manager_and_students)
+def bench_bulk_import_unchanged(args: Tuple[StudentManager, List[Student]]) -> None:
+    manager, students = args
+    manager.bulk_import(students)
+
+
+@benchmark(setup=_manager)
+def bench_statistics(manager: StudentManager) -> None:
+    manager.statistics()
+
+
+@benchmark(setup=_manager, number=10)
+def bench_search(manager: StudentManager) -> None:
+    manager.search("smith")
+
+
+@benchmark(setup=_manager)
+def bench_sort_by_average(manager: StudentManager) -> None:
+    list(manager.query().order_by("average", descending=True))
+
+
+@benchmark(setup=_manager, number=10)
+def bench_top_100_by_average(manager: StudentManager) -> None:
+    list(manager.query().order_by("average", descending=True).limit(100))
+
+
+@benchmark(setup=_manager, number=10)
+def bench_grade_range(manager: StudentManager) -> None:
+    manager.query().where("average", "between", (60, 70)).count()
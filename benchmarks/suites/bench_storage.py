@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import List, Tuple
+
+from app import storage
+from app.models import Student
+
+from ..generator import write_json
+from ..harness import Context, benchmark
+
+
+def _json_storage(ctx: Context) -> Tuple[List[Student], str]:
+    # Keep storage on its JSON path; the database is covered by bench_db.
+    storage.USE_DATABASE = False
+    path = ctx.path("storage.json")
+    write_json(ctx.roster, path)
+    return ctx.roster.students, path
+
+
+@benchmark(setup=_json_storage)
+def bench_load_json(args: Tuple[List[Student], str]) -> None:
+    storage.load_students(args[1])
+
+
+@benchmark(setup=_json_storage)
+def bench_save_json(args: Tuple[List[Student], str]) -> None:
+    storage.save_students(args[0], args[1])
+
+
+@benchmark(setup=_json_storage)
+def bench_iter_batches_json(args: Tuple[List[Student], str]) -> None:
+    for _ in storage.iter_student_batches(args[1]):
+        pass
+
+
+@benchmark(setup=lambda ctx: (ctx.roster.students, ctx.path("export.jsonl")))
+def bench_export_jsonl(args: Tuple[List[Student], str]) -> None:
+    storage.stream_export_jsonl(args[0], args[1], compression=None)
+
+
+@benchmark(setup=lambda ctx: (ctx.roster.students, ctx.path("export.jsonl.gz")))
+def bench_export_jsonl_gzip(args: Tuple[List[Student], str]) -> None:
+    storage.stream_export_jsonl(args[0], args[1], compression="gzip")
+
+
+@benchmark(setup=lambda ctx: (ctx.roster.students, ctx.path("export.csv"), ctx.roster.subjects))
+def bench_export_csv(args: Tuple[List[Student], str, List[str]]) -> None:
+    storage.stream_export_csv(args[0], args[1], args[2], compression=None)
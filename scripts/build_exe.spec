@@ -25,6 +25,11 @@ hiddenimports = [
     'tkinter.ttk',
     'matplotlib',
     'matplotlib.backends.backend_tkagg',
+    # Loaded lazily on first use, so the analysis cannot see them
+    'app.windows.statistics_window',
+    'app.windows.profile_window',
+    'app.windows.import_progress_window',
+    'app.windows.diagnostics_window',
 ]
 
 # Collect all submodules
@@ -0,0 +1,83 @@
+"""
+Check the cold-start import cost of the GUI entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter for
+each entry point, reports the slowest imports and fails if the total is over
+budget or if a heavy optional dependency is imported eagerly.
+
+Usage:
+    python scripts/check_import_time.py [--budget-ms 250] [--top 10] [module ...]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ["app.main", "app.gui"]
+DEFAULT_BUDGET_MS = 250.0
+DEFAULT_RUNS = 3
+# Only loaded on first use: statistics charts, photos, the MySQL backend and columnar export.
+LAZY_MODULES = ["matplotlib", "PIL", "mysql", "pyarrow", "app.db", "app.charts", "app.reports",
+                "app.columnar", "app.importers", "app.windows.statistics_window",
+                "app.windows.profile_window", "app.windows.import_progress_window",
+                "app.windows.diagnostics_window"]
+
+
+def measure(module):
+    """Return ``{imported module: cumulative microseconds}`` for one cold import of ``module``."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip()[-2000:]}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def check(module, budget_ms, runs, top):
+    """Print the import profile of ``module`` and return a list of problems."""
+    samples = [measure(module) for _ in range(runs)]
+    timings = min(samples, key=lambda t: t.get(module, 0))
+    total_ms = timings.get(module, 0) / 1000
+    print(f"\n{module}: {total_ms:.1f} ms (best of {runs}, budget {budget_ms:.0f} ms)")
+    for name, us in sorted(timings.items(), key=lambda item: item[1], reverse=True)[1:top + 1]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    problems = []
+    if total_ms > budget_ms:
+        problems.append(f"{module} took {total_ms:.1f} ms to import (budget {budget_ms:.0f} ms)")
+    for name in LAZY_MODULES:
+        if name in timings:
+            problems.append(f"{module} imports {name} eagerly")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    problems = []
+    for module in args.modules:
+        problems.extend(check(module, args.budget_ms, args.runs, args.top))
+
+    if problems:
+        print("\n✗ Import-time check failed:")
+        for problem in problems:
+            print(f"  - {problem}")
+        return 1
+    print("\n✓ Import-time check passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
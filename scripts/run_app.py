@@ -4,6 +4,7 @@ This file is used by PyInstaller to create the executable.
 """
 import sys
 import os
+import multiprocessing
 
                                          
 if getattr(sys, 'frozen', False):
@@ -16,11 +17,8 @@ else:
 sys.path.insert(0, application_path)
 
                                     
-from app.gui import GradeApp
-
-def main():
-    app = GradeApp()
-    app.mainloop()
+from app.main import main
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()